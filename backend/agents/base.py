@@ -3,70 +3,421 @@ Base agent utilities — system prompt + LLM call wrapper with retries.
 
 Uses the Anthropic Python SDK directly via agents/llm.py.
 Every agent node in the pipeline calls call_llm() from this module.
+Byte-identical requests are served from the persistent response cache
+(agents/cache.py) when LLM_CACHE_ENABLED is set. Everything else is
+admitted through the process-wide dispatcher (agents/dispatcher.py),
+which enforces RPM/TPM limits and adapts concurrency to 429/529s.
+Passing on_delta switches to the SDK's streaming API and forwards text
+deltas as they arrive; the return value is the same full text.
+Inside a batch_mode() context (headless bulk runs) requests are queued
+into Message Batches instead — callers see the same contract.
+Concurrent identical requests are coalesced onto one in-flight call.
+With LLM_HEDGING_ENABLED, slow blocking calls get a hedged duplicate
+(agents/hedging.py); the first response wins.
+Errors are classified before retrying: fatal ones (400/401/403/404/422,
+an open circuit) raise at once; transient ones retry with full-jitter
+backoff. Upstream failures feed a shared circuit breaker
+(agents/circuit_breaker.py) so a degraded API is not hammered.
+The model and default max_tokens come from the caller's role
+(agents/routing.py); a ``validate`` callback escalates to a stronger
+model when the output is unusable.
+Every call emits a telemetry record (agents/telemetry.py) tagged with
+the caller's llm_tags() context — latency, tokens and estimated cost.
+
+Prompt layout (for Anthropic prompt caching, LLM_PROMPT_CACHING):
+  system   = [shared_prefix*, system_prompt*]
+  messages = [user: user_prefix blocks..., user_prompt]
+Blocks marked * and the last user_prefix block carry a cache_control
+breakpoint, so stable documents are cached across personas and the
+growing transcript is cached across rounds.
 
 See: docs/architecture/LLD_pipeline.md § 9
 """
 
 import asyncio
 import logging
+import random
 import time
+from typing import Awaitable, Callable, Protocol
+from anthropic import APIConnectionError, APIStatusError
+from agents.batch import BatchRequestError, get_batch_collector
+from agents.cache import get_response_cache, request_fingerprint
+from agents.circuit_breaker import get_circuit_breaker
+from agents.dispatcher import estimate_request_tokens, get_dispatcher
+from agents.hedging import get_hedger, hedge_key
 from agents.llm import get_anthropic_client
+from agents.routing import current_role, escalation_model, max_tokens_for, model_for
+from agents.telemetry import telemetry
 from config.settings import settings
 
 log = logging.getLogger("llm")
 
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _text_block(text: str, cache: bool) -> dict:
+    """Builds a text content block, optionally marked as a cache breakpoint."""
+    block = {"type": "text", "text": text}
+    if cache and settings.llm_prompt_caching:
+        block["cache_control"] = _CACHE_CONTROL
+    return block
+
+
+def build_request(
+    system_prompt: str,
+    user_prompt: str,
+    max_tokens: int,
+    temperature: float,
+    shared_prefix: str | None = None,
+    user_prefix: str | list[str] | None = None,
+    model: str | None = None,
+) -> dict:
+    """
+    Assembles the kwargs for client.messages.create().
+
+    Stable content goes first so it forms a cacheable prefix:
+    shared_prefix (identical across personas) → system_prompt (persona)
+    → user_prefix blocks (e.g. transcript so far) → user_prompt (per call).
+    """
+    system = []
+    if shared_prefix:
+        system.append(_text_block(shared_prefix, cache=True))
+    system.append(_text_block(system_prompt, cache=True))
+
+    if isinstance(user_prefix, str):
+        user_prefix = [user_prefix]
+    prefix_blocks = [b for b in (user_prefix or []) if b]
+    content = [
+        _text_block(block, cache=(i == len(prefix_blocks) - 1))
+        for i, block in enumerate(prefix_blocks)
+    ]
+    content.append(_text_block(user_prompt, cache=False))
+
+    return {
+        "model": model or settings.llm_model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "system": system,
+        "messages": [{"role": "user", "content": content}],
+    }
+
+
+OVERLOAD_STATUS_CODES = (429, 529)
+# Anything else in 4xx is a problem with the request itself — never retried
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Transient errors worth another attempt (timeouts, 5xx, 429/529, ...)."""
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    if isinstance(error, BatchRequestError):
+        return error.retryable  # expired, overloaded or api_error — not invalid_request
+    return isinstance(error, (APIConnectionError, TimeoutError))
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Failures that say the API itself is unhealthy (counted by the circuit breaker)."""
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return isinstance(error, (APIConnectionError, TimeoutError))
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))."""
+    ceiling = min(settings.llm_retry_max_backoff_seconds,
+                  settings.llm_retry_base_seconds * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def _retry_after_seconds(error: APIStatusError) -> float | None:
+    """Parses the retry-after header (seconds) from an API error, if present."""
+    value = error.response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class DeltaCallback(Protocol):
+    """
+    Receives streamed text. A retried call re-streams from the start, so
+    each retry first calls it with ``reset=True`` (and empty text): the
+    text received so far belongs to a failed attempt and must be dropped.
+    """
+
+    def __call__(self, text: str, *, reset: bool = False) -> Awaitable[None]: ...
+
+
+async def _send(client, request: dict, on_delta: DeltaCallback | None):
+    """Sends one request — blocking create(), or streaming if on_delta is given."""
+    if on_delta is None:
+        return await client.messages.create(**request)
+    async with client.messages.stream(**request) as stream:
+        async for text in stream.text_stream:
+            await on_delta(text)
+        return await stream.get_final_message()
+
+
+async def _dispatch(client, request: dict, on_delta: DeltaCallback | None,
+                    estimated_tokens: int):
+    """
+    Routes one attempt: into the active message batch (headless bulk mode,
+    see agents/batch.py), or live through the shared dispatcher — hedged
+    when enabled and the call is not streamed.
+    """
+    collector = get_batch_collector()
+    if collector is not None:
+        message = await collector.submit(request)
+        if on_delta is not None:
+            await on_delta(message.content[0].text)
+        return message
+
+    dispatcher = get_dispatcher()
+    breaker = get_circuit_breaker()
+    timeout = settings.llm_request_timeout_seconds or None
+
+    async def _live():
+        probe = await breaker.before_call()
+        try:
+            async with dispatcher.slot(estimated_tokens, request["max_tokens"]) as charge:
+                async with asyncio.timeout(timeout):
+                    message = await _send(client, request, on_delta)
+                charge["input"] = message.usage.input_tokens + _cache_usage(message.usage)[1]
+                charge["output"] = message.usage.output_tokens
+        except Exception as e:
+            if _is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release_probe(probe)
+            raise
+        except asyncio.CancelledError:
+            breaker.release_probe(probe)
+            raise
+        breaker.record_success()
+        dispatcher.on_success()
+        return message
+
+    def _record_cancelled(message, seconds: float, winner_seconds: float) -> None:
+        # No usage comes back for a cancelled request; assume it read the
+        # same input and wrote output in proportion to how long it ran.
+        usage = message.usage
+        cache_read, cache_write = _cache_usage(usage)
+        share = min(1.0, seconds / winner_seconds) if winner_seconds > 0 else 1.0
+        telemetry.record(
+            request["model"], "hedge_cancelled", seconds,
+            input_tokens=usage.input_tokens,
+            output_tokens=round(usage.output_tokens * share),
+            cache_read=cache_read, cache_write=cache_write,
+        )
+
+    if settings.llm_hedging_enabled and on_delta is None:
+        return await get_hedger().run(hedge_key(request), _live, _record_cancelled)
+    return await _live()
+
+
+class _Flight:
+    """One in-flight request shared by every caller with the same fingerprint."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+_inflight: dict[str, _Flight] = {}
+
+
+async def _singleflight(fingerprint: str, call: Callable[[], Awaitable[str]]) -> str:
+    """
+    Coalesces concurrent identical requests: the first caller starts the
+    call, later callers with the same fingerprint await the same task.
+
+    - Success and exceptions propagate to every waiter.
+    - A cancelled waiter only detaches (the task is shielded); the shared
+      call is cancelled once its last waiter has gone away.
+    """
+    flight = _inflight.get(fingerprint)
+    if flight is None:
+        flight = _Flight(asyncio.ensure_future(call()))
+        _inflight[fingerprint] = flight
+
+        def _forget(_task, key=fingerprint, this=flight):
+            if _inflight.get(key) is this:
+                del _inflight[key]
+
+        flight.task.add_done_callback(_forget)
+    else:
+        log.info("LLM coalesced key=%s onto in-flight request (%d waiting)",
+                 fingerprint[:12], flight.waiters + 1)
+
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            flight.task.cancel()
+
+
+def _cache_usage(usage) -> tuple[int, int]:
+    """Returns (cache_read, cache_write) input tokens from message.usage."""
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return cache_read, cache_write
+
 
 async def call_llm(
     system_prompt: str,
     user_prompt: str,
-    max_tokens: int = 4096,
+    max_tokens: int | None = None,
     temperature: float | None = None,
     retries: int | None = None,
+    use_cache: bool = True,
+    shared_prefix: str | None = None,
+    user_prefix: str | list[str] | None = None,
+    on_delta: DeltaCallback | None = None,
+    model: str | None = None,
+    validate: Callable[[str], bool] | None = None,
 ) -> str:
     """
     Makes a single LLM call with system + user prompt via the Anthropic API.
     Returns the text response.
-    Retries on failure with exponential backoff.
+    Retries transient failures with full-jitter backoff; fatal errors
+    (bad request, auth, open circuit) raise immediately.
 
     Args:
         system_prompt: The system-level instruction (passed as top-level `system` param).
         user_prompt: The user message content.
-        max_tokens: Maximum tokens in the response (required by Anthropic API).
+        max_tokens: Maximum tokens in the response (defaults to the role's
+            limit from agents/routing.py).
         temperature: Sampling temperature (defaults to settings.llm_temperature).
         retries: Number of retry attempts (defaults to settings.llm_max_retries).
+        use_cache: Set False to bypass the response cache for this call
+            (neither read nor written) and never share an in-flight request.
+        shared_prefix: Stable reference text placed ahead of the system prompt
+            (e.g. F1+F2, a move document) so its cache entry is shared by
+            every persona that reads it.
+        user_prefix: Stable leading block(s) of the user message (e.g. the
+            transcript so far, one block per entry) cached across rounds.
+        on_delta: Async callback for incremental text. When set the call is
+            streamed; a cache hit is delivered as a single delta. If a
+            streamed attempt fails mid-way, the retry streams from the start
+            after a ``reset=True`` call (see DeltaCallback).
+        model: Explicit model, bypassing role routing.
+        validate: Returns False for unusable output (e.g. unparseable JSON).
+            Invalid text is not cached; the call is repeated once on the
+            escalation model and that answer is returned (and cached only
+            if it validates). Not applied to streamed calls.
     """
     retries = retries or settings.llm_max_retries
     temperature = temperature if temperature is not None else settings.llm_temperature
     client = get_anthropic_client()
+    role = current_role()
+
+    request = build_request(
+        system_prompt, user_prompt, max_tokens or max_tokens_for(role), temperature,
+        shared_prefix=shared_prefix, user_prefix=user_prefix,
+        model=model or model_for(role),
+    )
 
     # Truncate prompt for log display
     prompt_preview = user_prompt[:80].replace("\n", " ") + "..." if len(user_prompt) > 80 else user_prompt.replace("\n", " ")
 
+    fingerprint = request_fingerprint(request)
+    cache = get_response_cache() if use_cache else None
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, fingerprint)
+        if cached is not None:
+            log.info("LLM cache HIT key=%s — %d chars, prompt=\"%s\"",
+                     fingerprint[:12], len(cached), prompt_preview)
+            telemetry.record(request["model"], "cache_hit", 0.0)
+            if on_delta is not None:
+                await on_delta(cached)
+            return cached
+
+    async def _call() -> str:
+        text = await _call_with_retries(client, request, on_delta, retries, prompt_preview)
+        if validate is not None and on_delta is None and not validate(text):
+            stronger = escalation_model(request["model"])
+            if stronger is None:
+                return text  # nothing to escalate to; the caller's fallback applies
+            log.warning("LLM output failed validation on %s (role=%s) — escalating to %s",
+                        request["model"], role, stronger)
+            text = await _call_with_retries(
+                client, {**request, "model": stronger}, None, retries, prompt_preview,
+            )
+            if not validate(text):
+                log.warning("Escalated output from %s also failed validation — not caching it",
+                            stronger)
+                return text
+        if cache is not None:
+            await asyncio.to_thread(cache.put, fingerprint, text)
+        return text
+
+    # Streaming callers each need their own deltas, and use_cache=False
+    # asks for a fresh response — neither joins an in-flight request.
+    if settings.llm_coalesce_inflight and use_cache and on_delta is None:
+        return await _singleflight(fingerprint, _call)
+    return await _call()
+
+
+async def _call_with_retries(
+    client,
+    request: dict,
+    on_delta: DeltaCallback | None,
+    retries: int,
+    prompt_preview: str,
+) -> str:
+    """Sends a request with retries; returns the response text."""
+    max_tokens = request["max_tokens"]
+    estimated_tokens = estimate_request_tokens(request)
+    call_start = time.time()
+
     for attempt in range(retries):
         try:
-            log.info("LLM call (attempt %d/%d) model=%s max_tokens=%d prompt=\"%s\"",
-                     attempt + 1, retries, settings.llm_model, max_tokens, prompt_preview)
+            log.info("LLM call (attempt %d/%d) model=%s max_tokens=%d%s prompt=\"%s\"",
+                     attempt + 1, retries, request["model"], max_tokens,
+                     " stream" if on_delta else "", prompt_preview)
             start = time.time()
+            if attempt > 0 and on_delta is not None:
+                await on_delta("", reset=True)
 
-            message = await client.messages.create(
-                model=settings.llm_model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
-            )
+            message = await _dispatch(client, request, on_delta, estimated_tokens)
 
             elapsed = time.time() - start
             text = message.content[0].text
             usage = message.usage
-            log.info("LLM done in %.1fs — %d chars, usage: in=%d out=%d",
-                     elapsed, len(text), usage.input_tokens, usage.output_tokens)
+            cache_read, cache_write = _cache_usage(usage)
+            log.info("LLM done in %.1fs — %d chars, usage: in=%d out=%d cache_read=%d cache_write=%d",
+                     elapsed, len(text), usage.input_tokens, usage.output_tokens,
+                     cache_read, cache_write)
+            telemetry.record(
+                request["model"], "ok", time.time() - call_start,
+                input_tokens=usage.input_tokens, output_tokens=usage.output_tokens,
+                cache_read=cache_read, cache_write=cache_write,
+                batch=get_batch_collector() is not None, attempts=attempt + 1,
+            )
             return text
         except Exception as e:
-            log.warning("LLM call FAILED (attempt %d/%d): %s", attempt + 1, retries, e)
-            if attempt == retries - 1:
-                log.error("LLM call exhausted all %d retries, raising", retries)
+            log.warning("LLM call FAILED (attempt %d/%d): %s: %s",
+                        attempt + 1, retries, type(e).__name__, e)
+            retryable = _is_retryable(e)
+            if not retryable or attempt == retries - 1:
+                if retryable:
+                    log.error("LLM call exhausted all %d retries, raising", retries)
+                else:
+                    log.error("LLM call failed with a non-retryable error, raising")
+                telemetry.record(request["model"], "error", time.time() - call_start,
+                                 attempts=attempt + 1)
                 raise
-            wait = 2 ** attempt  # 1s, 2s, 4s
-            log.info("LLM retrying in %ds...", wait)
+            retry_after = (_retry_after_seconds(e)
+                           if isinstance(e, APIStatusError) else None)
+            if isinstance(e, APIStatusError) and e.status_code in OVERLOAD_STATUS_CODES:
+                # The dispatcher halves concurrency and pauses admissions
+                # globally (retry-after, else jittered backoff) — the retry re-queues.
+                get_dispatcher().on_overload(retry_after or _backoff_seconds(attempt))
+                log.info("LLM overloaded (%d), re-queueing via dispatcher", e.status_code)
+                continue
+            wait = retry_after if retry_after is not None else _backoff_seconds(attempt)
+            log.info("LLM retrying in %.1fs...", wait)
             await asyncio.sleep(wait)
@@ -0,0 +1,204 @@
+"""
+Message Batches support for headless bulk runs (see batch_runner.py).
+
+Inside ``batch_mode(...)`` every call_llm() request is parked in a shared
+BatchCollector instead of being sent immediately. Because all tickers'
+pipelines run concurrently, they all block on the same layer at roughly
+the same time; once no new request has arrived for ``flush_window``
+seconds, the collector submits everything pending as ONE message batch,
+polls until it ends, and resolves each caller's future with its Message.
+The graphs then resume and queue the next layer's requests.
+
+call_llm() keeps its contract — node code is unchanged.
+
+Two backends:
+  - AnthropicBatchBackend — the Message Batches API (half-price, async).
+  - LocalBatchBackend — a stand-in that runs each request with
+    messages.create(); for dev runs and tests against a local server.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from anthropic import APIConnectionError, APIStatusError
+from agents.llm import get_anthropic_client
+
+log = logging.getLogger("llm.batch")
+
+# The Message Batches API accepts up to 100,000 requests per batch.
+MAX_BATCH_REQUESTS = 100_000
+
+
+# Errored batch results worth resubmitting; every other error type
+# (invalid_request_error, authentication_error, ...) fails the same way again
+RETRYABLE_BATCH_ERRORS = {"overloaded_error", "api_error"}
+
+
+class BatchRequestError(Exception):
+    """
+    A single request inside a batch did not succeed (errored/canceled/expired).
+    ``retryable`` is True only for transient outcomes: expired requests and
+    errors of a RETRYABLE_BATCH_ERRORS type.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _result_error(result) -> BatchRequestError:
+    """BatchRequestError for a non-succeeded batch result, classified by type."""
+    if result.type == "errored":
+        error_type = getattr(getattr(result.error, "error", None), "type", None)
+        return BatchRequestError(f"errored: {result.error}",
+                                 retryable=error_type in RETRYABLE_BATCH_ERRORS)
+    return BatchRequestError(result.type, retryable=result.type == "expired")
+
+
+class AnthropicBatchBackend:
+    """Submits requests via the Message Batches API and polls for results."""
+
+    def __init__(self, poll_interval: float = 30.0):
+        self.poll_interval = poll_interval
+
+    async def run(self, requests: dict[str, dict]) -> dict[str, object]:
+        """
+        Runs {custom_id: params} as one batch.
+        Returns {custom_id: Message | BatchRequestError}.
+        """
+        client = get_anthropic_client()
+        batch = await client.messages.batches.create(requests=[
+            {"custom_id": custom_id, "params": params}
+            for custom_id, params in requests.items()
+        ])
+        log.info("Batch %s submitted (%d requests)", batch.id, len(requests))
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.poll_interval)
+            batch = await client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            log.info("Batch %s: %s (processing=%d succeeded=%d errored=%d)",
+                     batch.id, batch.processing_status, counts.processing,
+                     counts.succeeded, counts.errored)
+
+        results: dict[str, object] = {}
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message
+            else:
+                error = _result_error(entry.result)
+                results[entry.custom_id] = BatchRequestError(
+                    f"batch request {entry.custom_id} {error}", retryable=error.retryable
+                )
+        return results
+
+
+class LocalBatchBackend:
+    """
+    Stand-in with the same interface: runs every request concurrently via
+    messages.create(). No discount — for dev loops and local fake servers.
+    """
+
+    async def run(self, requests: dict[str, dict]) -> dict[str, object]:
+        client = get_anthropic_client()
+
+        async def _one(params: dict):
+            try:
+                return await client.messages.create(**params)
+            except APIStatusError as e:
+                return BatchRequestError(str(e), retryable=e.status_code == 429 or e.status_code >= 500)
+            except (APIConnectionError, TimeoutError) as e:
+                return BatchRequestError(str(e), retryable=True)
+            except Exception as e:
+                return BatchRequestError(str(e))
+
+        messages = await asyncio.gather(*[_one(p) for p in requests.values()])
+        return dict(zip(requests.keys(), messages))
+
+
+class BatchCollector:
+    """Collects call_llm() requests and flushes them as message batches."""
+
+    def __init__(self, backend, flush_window: float = 2.0):
+        self.backend = backend
+        self.flush_window = flush_window
+        self._pending: list[tuple[str, dict, asyncio.Future]] = []
+        self._last_enqueue = 0.0
+        self._counter = 0
+        self._flusher: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+        self.batches_submitted = 0
+        self.requests_submitted = 0
+
+    async def submit(self, request: dict):
+        """Queues one messages.create payload; returns its Message once the batch ends."""
+        self._counter += 1
+        custom_id = f"req-{self._counter}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((custom_id, request, future))
+        self._last_enqueue = time.monotonic()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_when_quiet())
+        result = await future
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _flush_when_quiet(self) -> None:
+        """Waits for a quiet window (or a full batch), then submits what is pending."""
+        while self._pending:
+            quiet_for = time.monotonic() - self._last_enqueue
+            if quiet_for < self.flush_window and len(self._pending) < MAX_BATCH_REQUESTS:
+                await asyncio.sleep(self.flush_window - quiet_for)
+                continue
+            items = self._pending[:MAX_BATCH_REQUESTS]
+            del self._pending[:MAX_BATCH_REQUESTS]
+            task = asyncio.create_task(self._run_batch(items))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, items: list[tuple[str, dict, asyncio.Future]]) -> None:
+        self.batches_submitted += 1
+        self.requests_submitted += len(items)
+        start = time.time()
+        log.info("Flushing batch #%d with %d requests", self.batches_submitted, len(items))
+        try:
+            results = await self.backend.run({cid: req for cid, req, _ in items})
+        except Exception as e:
+            log.error("Batch #%d failed: %s", self.batches_submitted, e)
+            results = {}
+            for cid, _, _ in items:
+                results[cid] = e
+
+        for custom_id, _, future in items:
+            if future.done():
+                continue
+            future.set_result(results.get(
+                custom_id, BatchRequestError(f"no result for {custom_id}", retryable=True)
+            ))
+        log.info("Batch of %d requests resolved in %.1fs", len(items), time.time() - start)
+
+
+_collector: ContextVar[BatchCollector | None] = ContextVar("batch_collector", default=None)
+
+
+def get_batch_collector() -> BatchCollector | None:
+    """Returns the collector for the current context, or None for live calls."""
+    return _collector.get()
+
+
+@contextmanager
+def batch_mode(collector: BatchCollector):
+    """
+    Routes every call_llm() made in this context (and tasks spawned from
+    it, e.g. LangGraph nodes) through the given collector.
+    """
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
@@ -0,0 +1,200 @@
+"""
+Persistent LLM response cache — content-addressed, size-bounded LRU with TTL.
+
+call_llm() looks responses up here before going to the Anthropic API.
+The key is a SHA-256 of the exact request (model, system prompt, messages,
+temperature, max_tokens), so any byte-level change to a prompt is a miss.
+
+Backed by a single SQLite file so entries survive restarts (re-runs of
+the same ticker, retried analyses, dev loops). A hit does not write:
+access times are buffered and flushed in batches (and always before an
+eviction), so lookups never wait on a commit. Async callers run get/put
+through asyncio.to_thread.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config.settings import settings
+
+log = logging.getLogger("llm.cache")
+
+# Buffered access-time updates are written once this many are pending
+TOUCH_FLUSH_EVERY = 64
+
+
+def request_fingerprint(request: dict) -> str:
+    """Returns a stable SHA-256 hex digest for an LLM request payload."""
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PersistentLRUCache:
+    """
+    SQLite-backed key → text cache with LRU eviction and per-entry TTL.
+
+    - max_entries bounds the table size; the least recently *accessed*
+      entries are evicted first.
+    - ttl_seconds <= 0 disables expiry.
+    - hits / misses / evictions are counted for the lifetime of the process.
+    - access times of hits are buffered (up to TOUCH_FLUSH_EVERY) and
+      written before any eviction; unflushed ones are lost on exit, which
+      only makes the LRU order slightly stale.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached value, or None on a miss / expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds > 0 and now - created_at > self.ttl_seconds:
+                self._touched.pop(key, None)
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_FLUSH_EVERY:
+                self._flush_touches()
+                self._conn.commit()
+            self.hits += 1
+            return value
+
+    def _flush_touches(self) -> None:
+        """Writes buffered access times (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Returns {key: value} for the keys that hit (one lookup per key)."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: str) -> None:
+        """Stores a value, evicting least-recently-used entries if over capacity."""
+        self.put_many({key: value})
+
+    def put_many(self, items: dict[str, str]) -> None:
+        """Stores several values in one transaction (evicting once, at the end)."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key in items:
+                self._touched.pop(key, None)
+            self._flush_touches()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()],
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def delete(self, key: str) -> bool:
+        """Removes one entry; returns True if it existed."""
+        with self._lock:
+            self._touched.pop(key, None)
+            cursor = self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        """Removes every entry (counters are kept)."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss/eviction counters and current size."""
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+        }
+
+
+_response_cache: PersistentLRUCache | None = None
+
+
+def get_response_cache() -> PersistentLRUCache | None:
+    """
+    Returns the process-wide response cache singleton, or None when
+    LLM_CACHE_ENABLED is false.
+    """
+    global _response_cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = PersistentLRUCache(
+            path=settings.llm_cache_path,
+            max_entries=settings.llm_cache_max_entries,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+        )
+        log.info("LLM response cache opened at %s (max=%d, ttl=%ds)",
+                 settings.llm_cache_path, settings.llm_cache_max_entries,
+                 settings.llm_cache_ttl_seconds)
+    return _response_cache
@@ -0,0 +1,216 @@
+"""
+Chunk-inference engine shared by the Layer 1 agents.
+
+Replaces the strict pair-at-a-time loops: every chunk of both documents
+is submitted at once and a shared semaphore keeps at most
+LAYER_1_CHUNK_CONCURRENCY chunk calls in flight (across the financial
+and trend agents, and Layer 0's streaming prefetch). A slow call only
+holds its own slot, so a document finishes in about one LLM latency
+when concurrency allows instead of ceil(n/2) waves.
+
+- Results come back in chunk order.
+- A chunk that still fails after call_llm's retries becomes a short
+  placeholder; the agent fails only if every chunk failed.
+- Each chunk emits a ``chunk_progress`` custom stream event (forwarded
+  to SSE by api/routes.py) when it is reused, done or failed.
+
+With LAYER_1_CHUNKS_PER_CALL > 1 and an agent that supplies infer_many,
+consecutive chunks are sent K at a time in one request (one system
+prompt, one round trip). The model answers with a marked block per
+section (format_sections / parse_sections, JSON also accepted); only
+sections missing from the answer are re-asked one chunk per call.
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Awaitable, Callable
+from langgraph.config import get_stream_writer
+from agents.chunker import chunk_key
+from config.settings import settings
+
+log = logging.getLogger("layer_1.engine")
+
+InferFn = Callable[[str, str, int], Awaitable[str]]  # (ticker, chunk, index) → inference
+# (ticker, [(index, chunk), ...]) → {index: inference} for the sections it parsed
+InferManyFn = Callable[[str, list[tuple[int, str]]], Awaitable[dict[int, str]]]
+
+_MARKER = re.compile(r"^[\s#*>]*=*\s*section\s+(\d+)\s*=*[\s*:]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def section_marker(index: int) -> str:
+    """Marker line for a chunk (1-based, matching "section N" in the prompts)."""
+    return f"=== SECTION {index + 1} ==="
+
+
+def format_sections(items: list[tuple[int, str]]) -> str:
+    """Lays out several chunks for one prompt, each under its marker line."""
+    return "\n\n".join(f"{section_marker(i)}\n{chunk}" for i, chunk in items)
+
+
+def _parse_json_sections(text: str, indices: list[int]) -> dict[int, str] | None:
+    body = text.strip()
+    if body.startswith("```"):
+        body = body.strip("`").removeprefix("json").strip()
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    if isinstance(data, list) and all(isinstance(v, str) for v in data):
+        return dict(zip(indices, data)) if len(data) == len(indices) else None
+    if isinstance(data, list):
+        pairs = [(d.get("section"), d.get("inference")) for d in data if isinstance(d, dict)]
+    elif isinstance(data, dict):
+        pairs = list(data.items())
+    else:
+        return None
+    out: dict[int, str] = {}
+    for number, inference in pairs:
+        try:
+            index = int(str(number).lower().removeprefix("section").strip()) - 1
+        except ValueError:
+            continue
+        if isinstance(inference, str):
+            out[index] = inference
+    return out
+
+
+def parse_sections(text: str, indices: list[int]) -> dict[int, str]:
+    """
+    Extracts per-section inferences from a multi-chunk answer — marker
+    lines (tolerating Markdown decoration) or JSON. Only requested,
+    non-empty sections are returned; the first answer for a section wins.
+    """
+    found = _parse_json_sections(text, indices)
+    if found is None:
+        found = {}
+        matches = list(_MARKER.finditer(text))
+        for m, nxt in zip(matches, matches[1:] + [None]):
+            end = nxt.start() if nxt else len(text)
+            found.setdefault(int(m.group(1)) - 1, text[m.end():end])
+    wanted = set(indices)
+    return {i: v.strip() for i, v in found.items() if i in wanted and v.strip()}
+
+
+def _progress_writer():
+    """Custom stream writer when running inside a LangGraph node, else None."""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+
+class ChunkEngine:
+    """Bounded-concurrency, order-preserving chunk inference."""
+
+    def __init__(self, concurrency: int, chunks_per_call: int = 1):
+        self.concurrency = concurrency
+        self.chunks_per_call = max(1, chunks_per_call)
+        self._sem = asyncio.Semaphore(concurrency)
+
+    async def infer_one(self, infer: InferFn, ticker: str, chunk: str, index: int) -> str:
+        """Runs one chunk inference inside the shared concurrency bound."""
+        async with self._sem:
+            return await infer(ticker, chunk, index)
+
+    async def run(
+        self,
+        kind: str,
+        ticker: str,
+        chunks: list[str],
+        infer: InferFn,
+        prefetched: dict[str, str] | None = None,
+        infer_many: InferManyFn | None = None,
+        on_result: Callable[[int, str, str], None] | None = None,
+    ) -> list[str]:
+        """
+        Infers every chunk (reusing prefetched results by chunk_key) and
+        returns the inferences in chunk order. infer_many, if given, is
+        used for groups of chunks_per_call chunks. on_result(index, chunk,
+        inference) is called for every chunk that did not fail.
+        """
+        prefetched = prefetched or {}
+        writer = _progress_writer()
+        total = len(chunks)
+        completed = 0
+        errors: list[Exception] = []
+
+        def _progress(index: int, status: str, inference: str | None = None) -> None:
+            nonlocal completed
+            completed += 1
+            if on_result is not None and inference is not None:
+                on_result(index, chunks[index], inference)
+            log.info("  [%s] chunk %d/%d %s (%d/%d complete)",
+                     kind, index + 1, total, status, completed, total)
+            if writer is not None:
+                writer({"event": "chunk_progress", "layer": 1, "agent_id": f"{kind}_inference",
+                        "chunk": index, "total": total, "completed": completed,
+                        "status": status})
+
+        async def _one(index: int, chunk: str) -> str:
+            reused = prefetched.get(chunk_key(kind, index, chunk))
+            if reused is not None:
+                _progress(index, "reused", reused)
+                return reused
+            try:
+                inference = await self.infer_one(infer, ticker, chunk, index)
+            except Exception as e:
+                log.error("  [%s] chunk %d failed: %s", kind, index + 1, e)
+                errors.append(e)
+                _progress(index, "failed")
+                return f"_Inference unavailable for section {index + 1}._"
+            _progress(index, "done", inference)
+            return inference
+
+        async def _group(items: list[tuple[int, str]]) -> list[str]:
+            try:
+                async with self._sem:
+                    parsed = await infer_many(ticker, items)
+            except Exception as e:
+                log.error("  [%s] chunks %s failed as a group: %s",
+                          kind, [i + 1 for i, _ in items], e)
+                parsed = {}
+            results = []
+            for index, chunk in items:
+                if index in parsed:
+                    _progress(index, "done", parsed[index])
+                    results.append(parsed[index])
+                else:
+                    results.append(None)
+            reask = [(i, c) for (i, c), r in zip(items, results) if r is None]
+            if reask:
+                log.warning("  [%s] re-asking %d/%d sections individually",
+                            kind, len(reask), len(items))
+                redone = iter(await asyncio.gather(*[_one(i, c) for i, c in reask]))
+                results = [r if r is not None else next(redone) for r in results]
+            return results
+
+        missing = [(i, c) for i, c in enumerate(chunks)
+                   if chunk_key(kind, i, c) not in prefetched]
+        k = self.chunks_per_call
+        if infer_many is None or k == 1 or len(missing) < 2:
+            inferences = await asyncio.gather(*[_one(i, c) for i, c in enumerate(chunks)])
+        else:
+            groups = [missing[g:g + k] for g in range(0, len(missing), k)]
+            grouped = await asyncio.gather(*[_group(g) for g in groups])
+            by_index = {i: r for g, rs in zip(groups, grouped) for (i, _), r in zip(g, rs)}
+            inferences = [by_index[i] if i in by_index else await _one(i, c)
+                          for i, c in enumerate(chunks)]
+        if errors and len(errors) == total:
+            raise errors[0]
+        return list(inferences)
+
+
+_engine: ChunkEngine | None = None
+
+
+def get_chunk_engine() -> ChunkEngine:
+    """Returns the process-wide chunk engine singleton."""
+    global _engine
+    if _engine is None:
+        _engine = ChunkEngine(settings.layer_1_chunk_concurrency,
+                              settings.layer_1_chunks_per_call)
+    return _engine
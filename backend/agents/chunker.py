@@ -1,12 +1,42 @@
 """
 Text chunking utility for splitting markdown documents into manageable pieces.
 
-Used by Layer 1 inference agents to process raw data in ~20-line chunks
-rather than feeding the entire document to the LLM at once.
+Used by Layer 1 inference agents to process raw data in token-budgeted
+chunks rather than feeding the entire document to the LLM at once.
+
+split_markdown() parses the document into blocks — headings with their
+content, paragraphs, pipe tables — drops ``---`` delimiters, and packs
+whole blocks into chunks of up to max_tokens. A table is never split, a
+heading always travels with what follows it, and a ``#``/``##`` section
+starts a new chunk once the current one is half full. Only a text block
+larger than the budget on its own is cut, at line boundaries.
+
+IncrementalChunker cuts the same chunks from a stream, so Layer 0 can
+start chunk inference while it is still generating (graph/layer_0/node.py).
+
+split_into_chunks() is the original fixed 20-line splitter, kept for
+comparison (benchmarks/chunking.py).
 
 See: docs/architecture/LLD_layer_1.md
 """
 
+import hashlib
+import re
+
+# Lines per chunk for the legacy split_into_chunks()
+CHUNK_LINES = 20
+
+# Default chunk budget (settings.layer_1_chunk_tokens overrides it)
+CHUNK_TOKENS = 700
+
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_HEADING = re.compile(r"^(#{1,6})\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token, as agents/dispatcher.py)."""
+    return max(1, len(text) // 4)
+
 
 def split_into_chunks(text: str, chunk_size: int = 20) -> list[str]:
     """
@@ -26,3 +56,148 @@ def split_into_chunks(text: str, chunk_size: int = 20) -> list[str]:
         if chunk.strip():  # skip empty chunks
             chunks.append(chunk)
     return chunks
+
+
+def chunk_key(kind: str, index: int, chunk: str) -> str:
+    """Identifies one chunk inference: agent kind, position and content hash."""
+    digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()[:16]
+    return f"{kind}:{index}:{digest}"
+
+
+class _Block:
+    """A run of lines that is packed as a unit."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.heading_only = True  # only headings so far (attaches to what follows)
+        self.has_table = False
+        self.level = 0            # level of the leading heading, 0 if none
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class _Packer:
+    """
+    Line-at-a-time block parser and greedy chunk packer. Chunks are only
+    emitted once a later line proves them complete, so feeding any prefix
+    of a document yields a prefix of its final chunks.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_chars = max_tokens * 4
+        self._block: _Block | None = None
+        self._blank = False
+        self._chunk: list[str] = []
+        self._chunk_chars = 0
+
+    def add_line(self, line: str) -> list[str]:
+        line = line.rstrip()
+        if not line or _RULE.match(line):
+            self._blank = True
+            if self._block is not None and not self._block.heading_only:
+                return self._close_block()
+            return []
+
+        out: list[str] = []
+        heading = _HEADING.match(line)
+        is_table = line.lstrip().startswith("|")
+        block = self._block
+        if block is not None and not block.heading_only:
+            last_table = block.lines[-1].lstrip().startswith("|")
+            if heading or self._blank or is_table != last_table:
+                out = self._close_block()
+                block = None
+        if block is None:
+            block = self._block = _Block()
+            block.level = len(heading.group(1)) if heading else 0
+        elif self._blank and block.lines:
+            block.lines.append("")
+        self._blank = False
+        block.lines.append(line)
+        block.heading_only = block.heading_only and heading is not None
+        block.has_table = block.has_table or is_table
+        return out
+
+    def finish(self) -> list[str]:
+        out = self._close_block()
+        if self._chunk:
+            out.append("\n\n".join(self._chunk))
+            self._chunk, self._chunk_chars = [], 0
+        return out
+
+    def _close_block(self) -> list[str]:
+        block, self._block = self._block, None
+        if block is None:
+            return []
+        text = block.text()
+        if len(text) <= self.max_chars or block.has_table:
+            return self._add_unit(text, section=0 < block.level <= 2)
+        # Oversized prose: cut at line boundaries
+        out: list[str] = []
+        group: list[str] = []
+        size = 0
+        for line in block.lines:
+            if group and size + len(line) + 1 > self.max_chars:
+                out += self._add_unit("\n".join(group), section=False)
+                group, size = [], 0
+            group.append(line)
+            size += len(line) + 1
+        out += self._add_unit("\n".join(group).strip("\n"), section=not out and 0 < block.level <= 2)
+        return out
+
+    def _add_unit(self, text: str, section: bool) -> list[str]:
+        out: list[str] = []
+        size = len(text) + (2 if self._chunk else 0)
+        if self._chunk and (self._chunk_chars + size > self.max_chars
+                            or (section and self._chunk_chars * 2 >= self.max_chars)):
+            out.append("\n\n".join(self._chunk))
+            self._chunk, self._chunk_chars = [], 0
+            size = len(text)
+        self._chunk.append(text)
+        self._chunk_chars += size
+        return out
+
+
+def split_markdown(text: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    Splits a markdown document into structure-aware chunks of up to
+    roughly max_tokens each (a single table may exceed it).
+    """
+    packer = _Packer(max_tokens)
+    chunks: list[str] = []
+    for line in text.split("\n"):
+        chunks += packer.add_line(line)
+    return chunks + packer.finish()
+
+
+class IncrementalChunker:
+    """
+    Cuts streamed text into the chunks split_markdown() produces for the
+    finished text, emitting each one as soon as a later line shows it is
+    complete.
+    """
+
+    def __init__(self, max_tokens: int = CHUNK_TOKENS):
+        self._packer = _Packer(max_tokens)
+        self._partial = ""
+        self._count = 0
+
+    def feed(self, text: str) -> list[tuple[int, str]]:
+        """Adds a delta; returns newly completed (index, chunk) pairs."""
+        self._partial += text
+        *complete, self._partial = self._partial.split("\n")
+        chunks: list[str] = []
+        for line in complete:
+            chunks += self._packer.add_line(line)
+        return self._number(chunks)
+
+    def finish(self) -> list[tuple[int, str]]:
+        """Flushes the remaining lines once the stream has ended."""
+        chunks = self._packer.add_line(self._partial)
+        self._partial = ""
+        return self._number(chunks + self._packer.finish())
+
+    def _number(self, chunks: list[str]) -> list[tuple[int, str]]:
+        start, self._count = self._count, self._count + len(chunks)
+        return list(enumerate(chunks, start))
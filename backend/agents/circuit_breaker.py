@@ -0,0 +1,157 @@
+"""
+Shared circuit breaker for live LLM calls.
+
+When the upstream is degraded (consecutive 5xx / 529 / timeouts /
+connection errors), every negotiation retrying on its own just piles on.
+The breaker counts those failures across the whole process:
+
+  closed     — calls flow; N consecutive upstream failures → open
+  open       — calls fail fast with CircuitOpenError, or wait
+               (LLM_CIRCUIT_OPEN_BEHAVIOR=queue) until recovery
+  half_open  — after the recovery period a few probe calls go through;
+               a success closes the circuit, a failure re-opens it
+
+429s are not counted — rate limiting is the dispatcher's job.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import asyncio
+import logging
+import time
+from config.settings import settings
+
+log = logging.getLogger("llm.circuit")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a timed half-open probe."""
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float,
+                 half_open_max_calls: int = 1, open_behavior: str = "fail",
+                 max_queue_wait: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.open_behavior = open_behavior
+        self.max_queue_wait = max_queue_wait
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._half_open_period = 0  # bumped on every open → half-open transition
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _refresh(self) -> None:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_seconds:
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._half_open_period += 1
+            log.info("Circuit half-open — letting %d probe call(s) through",
+                     self.half_open_max_calls)
+
+    def _try_admit(self) -> tuple[bool, int | None]:
+        """(admitted, probe token) — the token is set only for half-open probes."""
+        self._refresh()
+        if self.state == CLOSED:
+            return True, None
+        if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True, self._half_open_period
+        return False, None
+
+    async def before_call(self) -> int | None:
+        """
+        Admits a call, or fails fast / waits while the circuit is open.
+        Returns a probe token when the call was admitted as a half-open
+        probe (pass it to release_probe), else None.
+        """
+        admitted, probe = self._try_admit()
+        if admitted:
+            return probe
+        if self.open_behavior != "queue":
+            self.rejected += 1
+            raise CircuitOpenError(
+                f"LLM circuit is {self.state} after {self.consecutive_failures} "
+                f"consecutive upstream failures"
+            )
+
+        deadline = time.monotonic() + self.max_queue_wait
+        while True:
+            admitted, probe = self._try_admit()
+            if admitted:
+                return probe
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.rejected += 1
+                raise CircuitOpenError(f"LLM circuit still {self.state} after "
+                                       f"waiting {self.max_queue_wait:.0f}s")
+            reopen_in = self.opened_at + self.recovery_seconds - time.monotonic()
+            await asyncio.sleep(min(remaining, max(0.1, reopen_in)))
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            log.info("Circuit closed — upstream recovered")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Counts one upstream failure (5xx, 529, timeout, connection error)."""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            log.warning("Circuit OPEN after %d consecutive upstream failures — "
+                        "%s for %.0fs", self.consecutive_failures,
+                        "queueing" if self.open_behavior == "queue" else "failing fast",
+                        self.recovery_seconds)
+
+    def release_probe(self, probe: int | None) -> None:
+        """
+        Frees the slot of a half-open probe that ended without a verdict
+        (e.g. a 4xx or cancellation). Calls admitted while closed, and
+        probes from an earlier half-open period, hold no slot.
+        """
+        if (probe is not None and probe == self._half_open_period
+                and self.state == HALF_OPEN and self._probes_in_flight):
+            self._probes_in_flight -= 1
+
+    def stats(self) -> dict:
+        self._refresh()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "open_for_seconds": max(0.0, self.opened_at + self.recovery_seconds - time.monotonic())
+                                if self.state == OPEN else 0.0,
+        }
+
+
+_breaker: CircuitBreaker | None = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Returns the process-wide circuit breaker singleton."""
+    global _breaker
+    if _breaker is None:
+        _breaker = CircuitBreaker(
+            failure_threshold=settings.llm_circuit_failure_threshold,
+            recovery_seconds=settings.llm_circuit_recovery_seconds,
+            half_open_max_calls=settings.llm_circuit_half_open_calls,
+            open_behavior=settings.llm_circuit_open_behavior,
+            max_queue_wait=settings.llm_circuit_max_queue_wait_seconds,
+        )
+    return _breaker
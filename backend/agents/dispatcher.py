@@ -0,0 +1,259 @@
+"""
+Process-wide LLM dispatcher — rate limiting + adaptive concurrency.
+
+Every call_llm() request passes through one shared dispatcher, regardless
+of which analysis, layer or negotiation issued it:
+
+  - Requests-per-minute, input-tokens-per-minute and output-tokens-per-
+    minute token buckets keep the process under the account's rate
+    limits. Like the API, admission charges the input estimate to ITPM
+    and max_tokens to OTPM; both are corrected to actual usage when the
+    request finishes (cache reads do not count towards ITPM).
+  - An AIMD concurrency window grows by ~1 slot per window of successes
+    and halves on 429 / 529, so load settles near what the API accepts.
+  - A retry-after from the API pauses admission for everyone, instead of
+    each caller sleeping on its own schedule.
+  - Admission is FIFO; queue depth and wait times are tracked for metrics.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from config.settings import settings
+
+log = logging.getLogger("llm.dispatcher")
+
+# Ignore further decreases for this long after one, so a single burst of
+# 429s (all caused by the same overload) only halves the window once.
+DECREASE_COOLDOWN_SECONDS = 2.0
+
+
+def estimate_request_tokens(request: dict) -> int:
+    """Rough input-token estimate (~4 chars/token) for a messages.create payload."""
+    chars = 0
+    system = request.get("system", "")
+    if isinstance(system, str):
+        chars += len(system)
+    else:
+        chars += sum(len(b.get("text", "")) for b in system)
+    for message in request.get("messages", []):
+        content = message["content"]
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(b.get("text", "")) for b in content)
+    return max(1, chars // 4)
+
+
+class TokenBucket:
+    """
+    Continuous-refill token bucket. rate_per_minute <= 0 means unlimited.
+    The balance may go negative (debt) when actual usage exceeds the
+    estimate charged at admission; later requests then wait it off.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.rate_per_minute / 60.0,
+        )
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)  # never wait for more than a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float) -> None:
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens -= amount
+
+
+class LLMDispatcher:
+    """Admission control for all outgoing LLM requests in this process."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        input_tokens_per_minute: int,
+        output_tokens_per_minute: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+    ):
+        self.rpm = TokenBucket(requests_per_minute)
+        self.itpm = TokenBucket(input_tokens_per_minute)
+        self.otpm = TokenBucket(output_tokens_per_minute)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency),
+                               self.max_concurrency))
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: deque = deque()
+        self._cond = asyncio.Condition()
+
+        # Metrics
+        self.total_admitted = 0
+        self.total_throttled = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _admission_delay(self, ticket: object, input_tokens: int,
+                         output_tokens: int) -> float | None:
+        """
+        0 → may start now; >0 → seconds to wait for buckets / pause;
+        None → blocked until another request finishes or leaves the queue.
+        """
+        if self._waiters[0] is not ticket or self.in_flight >= int(self.limit):
+            return None
+        now = time.monotonic()
+        return max(
+            self.paused_until - now,
+            self.rpm.delay_for(1),
+            self.itpm.delay_for(input_tokens),
+            self.otpm.delay_for(output_tokens),
+            0.0,
+        )
+
+    async def acquire(self, input_tokens: int, output_tokens: int = 0) -> None:
+        """
+        Waits (FIFO) until a request of ~input_tokens input tokens and up to
+        output_tokens (max_tokens) output tokens may be sent.
+        """
+        ticket = object()
+        start = time.monotonic()
+        async with self._cond:
+            self._waiters.append(ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            try:
+                while True:
+                    delay = self._admission_delay(ticket, input_tokens, output_tokens)
+                    if delay == 0:
+                        break
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+            self.rpm.consume(1)
+            self.itpm.consume(input_tokens)
+            self.otpm.consume(output_tokens)
+            self.in_flight += 1
+            self.total_admitted += 1
+
+        waited = time.monotonic() - start
+        self.total_wait_seconds += waited
+        if waited > 1.0:
+            log.info("Dispatcher: waited %.1fs for a slot (in_flight=%d limit=%d queue=%d)",
+                     waited, self.in_flight, int(self.limit), self.queue_depth)
+
+    async def release(self, input_adjustment: int = 0, output_adjustment: int = 0) -> None:
+        """
+        Frees a slot; the adjustments charge actual-minus-estimated input
+        and output tokens (negative = refund).
+        """
+        async with self._cond:
+            self.in_flight -= 1
+            if input_adjustment:
+                self.itpm.consume(input_adjustment)
+            if output_adjustment:
+                self.otpm.consume(output_adjustment)
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, input_tokens: int, output_tokens: int = 0):
+        """
+        async with dispatcher.slot(input_tokens, max_tokens) as charge:
+            ...  # send request
+            charge["input"] = usage.input_tokens + usage.cache_creation_input_tokens
+            charge["output"] = usage.output_tokens
+
+        A request that fails keeps its admission charge.
+        """
+        await self.acquire(input_tokens, output_tokens)
+        charge = {"input": input_tokens, "output": output_tokens}
+        try:
+            yield charge
+        finally:
+            await self.release(charge["input"] - input_tokens,
+                               charge["output"] - output_tokens)
+
+    def on_success(self) -> None:
+        """Additive increase: ~+1 slot per full window of successful requests."""
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+
+    def on_overload(self, retry_after: float | None) -> None:
+        """Multiplicative decrease on 429/529, plus a global pause if retry-after given."""
+        self.total_throttled += 1
+        now = time.monotonic()
+        if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+            self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+            self._last_decrease = now
+            log.warning("Dispatcher: overload — concurrency limit now %d", int(self.limit))
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+            log.warning("Dispatcher: pausing admissions for %.1fs (retry-after)", retry_after)
+
+    def stats(self) -> dict:
+        """Snapshot of dispatcher metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "concurrency_limit": int(self.limit),
+            "total_admitted": self.total_admitted,
+            "total_throttled": self.total_throttled,
+            "avg_wait_seconds": (self.total_wait_seconds / self.total_admitted)
+                                if self.total_admitted else 0.0,
+            "paused_for_seconds": max(0.0, self.paused_until - time.monotonic()),
+        }
+
+
+_dispatcher: LLMDispatcher | None = None
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Returns the process-wide dispatcher singleton."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = LLMDispatcher(
+            requests_per_minute=settings.llm_requests_per_minute,
+            input_tokens_per_minute=settings.llm_input_tokens_per_minute,
+            output_tokens_per_minute=settings.llm_output_tokens_per_minute,
+            initial_concurrency=settings.llm_initial_concurrency,
+            min_concurrency=settings.llm_min_concurrency,
+            max_concurrency=settings.llm_max_concurrency,
+        )
+    return _dispatcher
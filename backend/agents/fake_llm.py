@@ -0,0 +1,403 @@
+"""
+Deterministic fake Anthropic Messages API — for offline benchmarks and tests.
+
+A small FastAPI app that speaks enough of the Messages API for the SDK:
+  POST /v1/messages                        (blocking and stream=true SSE)
+  POST /v1/messages/batches                (+ GET status, GET results .jsonl)
+
+Responses are canned per pipeline role, chosen from the prompt text:
+data-synthesizer packages (the few-shot template re-labelled for the
+ticker), chunk inferences (single, or marked per section for multi-chunk
+calls), F1/F2 briefs, three-move analyst documents that satisfy
+_parse_three_moves, critic / DM turns, and score JSON for _parse_scores.
+Text is seeded from a hash of the request, so identical requests get
+identical answers.
+
+It also simulates what throughput experiments need: log-normal latency
+plus per-output-token time, usage (including prompt-cache reads/writes
+for repeated cache_control prefixes), and injected 429s / 5xx.
+
+Select it with LLM_BACKEND=fake (started in-process on a free localhost
+port by agents/llm.py), or run it standalone and point
+ANTHROPIC_BASE_URL at it:
+
+  python -m agents.fake_llm --port 8089
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from config.personas import SCORING_METRICS
+from config.settings import settings
+
+log = logging.getLogger("llm.fake")
+
+_WORDS = (
+    "margin revenue growth cloud segment pricing churn retention backlog "
+    "guidance capex runway demand supply regulatory competitor partnership "
+    "expansion efficiency headcount inventory subscription enterprise region "
+    "share buyback leverage liquidity sentiment momentum product platform"
+).split()
+
+# Share of critic turns after round 1 that withdraw all objections
+FAKE_CONCESSION_RATE = 0.3
+
+_TITLE_VERBS = ["Expand", "Restructure", "Accelerate", "Consolidate", "Reprice",
+                "Divest", "Invest in", "Partner on", "Automate", "Localize"]
+
+
+# ─────────────────────────────────────────────
+# Canned, role-appropriate responses
+# ─────────────────────────────────────────────
+
+def _request_text(body: dict) -> tuple[str, str]:
+    """Flattens (system, user) text from a Messages API request body."""
+    def _flatten(value) -> str:
+        if isinstance(value, str):
+            return value
+        return "".join(block.get("text", "") for block in value or [])
+
+    system = _flatten(body.get("system", ""))
+    user = "".join(_flatten(m.get("content", "")) for m in body.get("messages", []))
+    return system, user
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.sample(_WORDS, 7)
+    pct = rng.randint(2, 38)
+    return (f"{words[0].capitalize()} {words[1]} shifted {pct}% as {words[2]} "
+            f"and {words[3]} pressure {words[4]} {words[5]} {words[6]}.")
+
+
+def _paragraphs(rng: random.Random, count: int, sentences: int) -> str:
+    return "\n\n".join(
+        " ".join(_sentence(rng) for _ in range(sentences)) for _ in range(count)
+    )
+
+
+def _synthesized_package(user: str) -> str:
+    """Re-labels the few-shot template from the prompt for the requested ticker."""
+    ticker_match = re.search(r"with ticker (\S+?)\.", user)
+    ticker = ticker_match.group(1) if ticker_match else "TICK"
+    template_match = re.search(r"\(NovaTech Inc\., NVTK\):\n\n(.*?)(?:Generate a synthetic|$)",
+                               user, re.DOTALL)
+    template = template_match.group(1) if template_match else user
+    return (template.replace("NovaTech Inc.", f"{ticker} Corp.")
+                    .replace("NovaTech", ticker).replace("NVTK", ticker).strip())
+
+
+def _move_document(rng: random.Random) -> str:
+    sections = []
+    for risk in ("Low", "Medium", "High"):
+        title = f"{rng.choice(_TITLE_VERBS)} {' '.join(rng.sample(_WORDS, 2))}"
+        sections.append(
+            f"## {risk}-Risk Move: {title.title()}\n\n"
+            f"### Reasoning\n{_paragraphs(rng, 3, 2)}\n\n"
+            f"### Supporting Evidence\n"
+            + "\n".join(f"- F{rng.randint(1, 2)}: {_sentence(rng)}" for _ in range(3))
+            + f"\n\n### Potential Downsides\n{_paragraphs(rng, 1, 2)}\n"
+        )
+    return "---\n" + "\n---\n".join(sections) + "\n---"
+
+
+def _brief(rng: random.Random, max_tokens: int, structured: bool) -> str:
+    """Bullets filling ~70% of max_tokens (real models stop short of the cap)."""
+    headings = ["## Key Facts", "## Trends", "## Risks & Open Questions"] if structured else [""]
+    per_heading = max(1, int(max_tokens * 0.7) // 20 // len(headings))
+    return "\n\n".join(
+        (f"{h}\n" if h else "") + "\n".join(f"- {_sentence(rng)}" for _ in range(per_heading))
+        for h in headings
+    )
+
+
+def _scores(rng: random.Random) -> str:
+    scores = {metric: rng.randint(3, 9) for metric in SCORING_METRICS}
+    scores["reasoning"] = _sentence(rng)
+    return json.dumps(scores, indent=4)
+
+
+def canned_response(body: dict) -> str:
+    """Returns a deterministic, role-appropriate response for a request."""
+    system, user = _request_text(body)
+    seed = hashlib.sha256((system + user).encode("utf-8")).hexdigest()
+    rng = random.Random(int(seed[:16], 16) ^ settings.fake_llm_seed)
+
+    if "Respond ONLY with valid JSON" in user:
+        return _scores(rng)
+    if "propose THREE strategic moves" in user:
+        return _move_document(rng)
+    if "Generate a synthetic" in user:
+        return _synthesized_package(user)
+    if "structured brief of at most" in user or "words of dense bullet points" in user:
+        return _brief(rng, body.get("max_tokens", 512), structured="structured brief" in user)
+    if "Provide one concise inference per section" in user:
+        numbers = re.findall(r"^=== SECTION (\d+) ===$", user, re.MULTILINE)
+        return "\n\n".join(
+            f"=== SECTION {n} ===\n" + " ".join(_sentence(rng) for _ in range(rng.randint(3, 5)))
+            for n in numbers
+        )
+    if "Provide a concise inference" in user:
+        return " ".join(_sentence(rng) for _ in range(rng.randint(3, 5)))
+    # Critic / decision-maker turns and anything else; a later-round critic
+    # sometimes concedes, as real debates converge
+    text = _paragraphs(rng, rng.randint(2, 3), 3)
+    if "of this boardroom negotiation" in user and rng.random() < FAKE_CONCESSION_RATE:
+        text += "\n\nMy concerns have been largely addressed; I have no further objections."
+    return text
+
+
+# ─────────────────────────────────────────────
+# Simulation: tokens, latency, failures
+# ─────────────────────────────────────────────
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _PromptCacheSim:
+    """Tracks cache_control prefixes seen so usage reports reads vs writes."""
+
+    def __init__(self):
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+
+    def usage(self, body: dict) -> tuple[int, int, int]:
+        """Returns (uncached_input, cache_read, cache_write) token counts."""
+        blocks = []
+        system = body.get("system", "")
+        blocks.extend([{"text": system}] if isinstance(system, str) else system)
+        for message in body.get("messages", []):
+            content = message.get("content", "")
+            blocks.extend([{"text": content}] if isinstance(content, str) else content)
+
+        total = sum(_tokens(b.get("text", "")) for b in blocks)
+        read = write = 0
+        digest = hashlib.sha256(body.get("model", "").encode())
+        covered = 0
+        with self._lock:
+            for block in blocks:
+                digest.update(block.get("text", "").encode("utf-8"))
+                covered += _tokens(block.get("text", ""))
+                if "cache_control" in block:
+                    key = digest.hexdigest()
+                    if key in self._seen:
+                        read = covered
+                    else:
+                        self._seen.add(key)
+                        write = covered - read
+        return total - read - write, read, write
+
+
+_cache_sim = _PromptCacheSim()
+
+
+def _latency_seconds(rng: random.Random, output_tokens: int) -> float:
+    base = settings.fake_llm_latency_ms * rng.lognormvariate(0, settings.fake_llm_latency_sigma)
+    return (base + output_tokens * settings.fake_llm_ms_per_token) / 1000.0
+
+
+def _injected_error(rng: random.Random) -> Response | None:
+    roll = rng.random()
+    if roll < settings.fake_llm_rate_limit_rate:
+        return JSONResponse(
+            status_code=429, headers={"retry-after": "1"},
+            content={"type": "error", "error": {"type": "rate_limit_error",
+                                                "message": "fake: rate limited"}},
+        )
+    if roll < settings.fake_llm_rate_limit_rate + settings.fake_llm_server_error_rate:
+        status = rng.choice([500, 529])
+        kind = "overloaded_error" if status == 529 else "api_error"
+        return JSONResponse(
+            status_code=status,
+            content={"type": "error", "error": {"type": kind, "message": f"fake: {status}"}},
+        )
+    return None
+
+
+def _message(body: dict, text: str) -> dict:
+    uncached, read, write = _cache_sim.usage(body)
+    return {
+        "id": f"msg_fake_{uuid.uuid4().hex[:20]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "fake"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": uncached,
+            "output_tokens": _tokens(text),
+            "cache_read_input_tokens": read,
+            "cache_creation_input_tokens": write,
+        },
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# ─────────────────────────────────────────────
+# App
+# ─────────────────────────────────────────────
+
+app = FastAPI(title="Fake Anthropic Messages API")
+_rng = random.Random(settings.fake_llm_seed)
+_batches: dict[str, dict] = {}
+
+
+@app.post("/v1/messages")
+async def create_message(request: Request):
+    body = await request.json()
+    error = _injected_error(_rng)
+    if error is not None:
+        await asyncio.sleep(_latency_seconds(_rng, 0) / 4)
+        return error
+
+    text = canned_response(body)
+    message = _message(body, text)
+    latency = _latency_seconds(_rng, message["usage"]["output_tokens"])
+
+    if not body.get("stream"):
+        await asyncio.sleep(latency)
+        return JSONResponse(message)
+
+    async def _events():
+        chunks = [text[i:i + 24] for i in range(0, len(text), 24)] or [""]
+        first_token = settings.fake_llm_latency_ms / 1000.0
+        await asyncio.sleep(min(first_token, latency))
+        start = {**message, "content": [], "stop_reason": None,
+                 "usage": {**message["usage"], "output_tokens": 1}}
+        yield _sse("message_start", {"type": "message_start", "message": start})
+        yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                           "content_block": {"type": "text", "text": ""}})
+        per_chunk = max(0.0, latency - first_token) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(per_chunk)
+            yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                               "delta": {"type": "text_delta", "text": chunk}})
+        yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+        yield _sse("message_delta", {"type": "message_delta",
+                                     "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                     "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+        yield _sse("message_stop", {"type": "message_stop"})
+
+    return StreamingResponse(_events(), media_type="text/event-stream")
+
+
+def _batch_view(batch: dict, base_url: str) -> dict:
+    ended = batch["processing_status"] == "ended"
+    return {
+        "id": batch["id"],
+        "type": "message_batch",
+        "processing_status": batch["processing_status"],
+        "request_counts": batch["request_counts"],
+        "created_at": batch["created_at"],
+        "expires_at": batch["created_at"],
+        "ended_at": batch["ended_at"],
+        "archived_at": None,
+        "cancel_initiated_at": None,
+        "results_url": f"{base_url}v1/messages/batches/{batch['id']}/results" if ended else None,
+    }
+
+
+async def _process_batch(batch: dict, requests: list[dict]) -> None:
+    """Runs batch entries with simulated latency; batches never 429."""
+    async def _one(entry: dict) -> dict:
+        params = entry["params"]
+        text = canned_response(params)
+        message = _message(params, text)
+        await asyncio.sleep(_latency_seconds(_rng, message["usage"]["output_tokens"]))
+        batch["request_counts"]["processing"] -= 1
+        batch["request_counts"]["succeeded"] += 1
+        return {"custom_id": entry["custom_id"],
+                "result": {"type": "succeeded", "message": message}}
+
+    batch["results"] = await asyncio.gather(*[_one(r) for r in requests])
+    batch["processing_status"] = "ended"
+    batch["ended_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+@app.post("/v1/messages/batches")
+async def create_batch(request: Request):
+    body = await request.json()
+    requests = body.get("requests", [])
+    batch = {
+        "id": f"msgbatch_fake_{uuid.uuid4().hex[:20]}",
+        "processing_status": "in_progress",
+        "request_counts": {"processing": len(requests), "succeeded": 0, "errored": 0,
+                           "canceled": 0, "expired": 0},
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "ended_at": None,
+        "results": [],
+    }
+    _batches[batch["id"]] = batch
+    batch["task"] = asyncio.create_task(_process_batch(batch, requests))
+    return JSONResponse(_batch_view(batch, str(request.base_url)))
+
+
+@app.get("/v1/messages/batches/{batch_id}")
+async def retrieve_batch(batch_id: str, request: Request):
+    batch = _batches.get(batch_id)
+    if batch is None:
+        return JSONResponse(status_code=404, content={
+            "type": "error", "error": {"type": "not_found_error", "message": batch_id}})
+    return JSONResponse(_batch_view(batch, str(request.base_url)))
+
+
+@app.get("/v1/messages/batches/{batch_id}/results")
+async def batch_results(batch_id: str):
+    batch = _batches[batch_id]
+    lines = "\n".join(json.dumps(r) for r in batch["results"])
+    return Response(content=lines + "\n", media_type="application/binary")
+
+
+# ─────────────────────────────────────────────
+# In-process server (LLM_BACKEND=fake)
+# ─────────────────────────────────────────────
+
+_server_url: str | None = None
+
+
+def ensure_fake_server() -> str:
+    """Starts the fake server on a free localhost port (once); returns its base URL."""
+    global _server_url
+    if _server_url is not None:
+        return _server_url
+
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port,
+                                           log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, name="fake-llm", daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    _server_url = f"http://127.0.0.1:{port}"
+    log.info("Fake LLM server listening on %s", _server_url)
+    return _server_url
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the fake Messages API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port)
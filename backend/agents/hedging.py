@@ -0,0 +1,143 @@
+"""
+Hedged LLM requests — trims tail latency (opt-in, LLM_HEDGING_ENABLED).
+
+If a call is still pending after the p-th percentile of recent latencies
+for its role (the telemetry ``node`` tag) and max_tokens class, a
+duplicate is sent; the first successful response wins and the other is
+cancelled. The cancelled request is still billed for what it processed,
+so its usage is estimated from the winner's (full input, output scaled
+by how long it ran) and recorded as a "hedge_cancelled" call. Hedges
+are capped at ``llm_hedge_budget`` × calls, and none are sent while the
+dispatcher has a queue (a hedge would only wait in line behind the same
+backlog).
+
+Only blocking (non-streaming) live calls are hedged — see agents/base.py.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+from agents.dispatcher import get_dispatcher
+from agents.telemetry import current_tags
+from config.settings import settings
+
+log = logging.getLogger("llm.hedging")
+
+# Recent latencies kept per (role, max_tokens class)
+LATENCY_WINDOW = 200
+
+
+def hedge_key(request: dict) -> tuple[str, int]:
+    """(role, max_tokens class) — max_tokens rounded up to a power of two."""
+    role = current_tags().get("node", "default")
+    return role, 1 << (request["max_tokens"] - 1).bit_length()
+
+
+class Hedger:
+    """Tracks latencies per key and runs calls with a hedged duplicate."""
+
+    def __init__(self, percentile: float, min_samples: int, budget: float,
+                 min_delay: float):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget = budget
+        self.min_delay = min_delay
+        self._latencies: dict[tuple, deque[float]] = {}
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_cancelled = 0
+
+    def delay_for(self, key: tuple) -> float | None:
+        """Seconds to wait before hedging, or None if there is too little history."""
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[rank])
+
+    def _observe(self, key: tuple, seconds: float) -> None:
+        self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def _may_hedge(self) -> bool:
+        return (self.hedges_sent < self.budget * self.calls
+                and get_dispatcher().queue_depth == 0)
+
+    async def run(self, key: tuple, attempt: Callable[[], Awaitable],
+                  on_cancelled: Callable[[Any, float, float], None] | None = None):
+        """
+        Runs attempt(); if it outlasts the key's latency percentile, starts a
+        second attempt() and returns whichever succeeds first. Errors only
+        propagate once every started attempt has failed.
+
+        When the winner leaves the other attempt running, it is cancelled
+        and on_cancelled(result, seconds_run, winner_seconds) is called so
+        the caller can record its cost.
+        """
+        self.calls += 1
+        start = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        tasks = {primary}
+        started = {primary: start}
+        try:
+            delay = self.delay_for(key)
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done() and self._may_hedge():
+                    self.hedges_sent += 1
+                    log.info("Hedging %s/%d after %.1fs (p%g)",
+                             key[0], key[1], delay, self.percentile)
+                    hedge = asyncio.ensure_future(attempt())
+                    tasks.add(hedge)
+                    started[hedge] = time.monotonic()
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        now = time.monotonic()
+                        if task is not primary:
+                            self.hedges_won += 1
+                        self._observe(key, now - start)
+                        for loser in pending:
+                            loser.cancel()
+                            self.hedges_cancelled += 1
+                            if on_cancelled is not None:
+                                on_cancelled(task.result(), now - started[loser],
+                                             now - started[task])
+                        return task.result()
+            raise primary.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "hedges_cancelled": self.hedges_cancelled,
+        }
+
+
+_hedger: Hedger | None = None
+
+
+def get_hedger() -> Hedger:
+    """Returns the process-wide hedger singleton."""
+    global _hedger
+    if _hedger is None:
+        _hedger = Hedger(
+            percentile=settings.llm_hedge_percentile,
+            min_samples=settings.llm_hedge_min_samples,
+            budget=settings.llm_hedge_budget,
+            min_delay=settings.llm_hedge_min_delay_seconds,
+        )
+    return _hedger
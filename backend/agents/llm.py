@@ -17,8 +17,23 @@ def get_anthropic_client() -> AsyncAnthropic:
     """
     Returns a singleton AsyncAnthropic client.
     Reuses the same HTTP connection pool across all LLM calls.
+    ANTHROPIC_BASE_URL points it at a local Messages API stand-in for testing;
+    LLM_BACKEND=fake starts the built-in fake (agents/fake_llm.py) in-process.
+
+    SDK-level retries are disabled: call_llm() retries through the shared
+    dispatcher so 429s are not retried behind its back.
     """
     global _client
     if _client is None:
-        _client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        base_url = settings.anthropic_base_url or None
+        api_key = settings.anthropic_api_key
+        if settings.llm_backend == "fake":
+            from agents.fake_llm import ensure_fake_server
+            base_url = ensure_fake_server()
+            api_key = api_key or "fake"
+        _client = AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+        )
     return _client
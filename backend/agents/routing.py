@@ -0,0 +1,72 @@
+"""
+Per-role model routing for call_llm().
+
+A call's role is its telemetry ``node`` tag (see agents/telemetry.py), so
+routing needs no extra plumbing at call sites. Each role maps to a model
+tier and a default max_tokens:
+
+  fast     — settings.llm_fast_model: high-volume, low-complexity calls
+             (per-chunk inferences, JSON-only scoring)
+  default  — settings.llm_model
+  strong   — settings.llm_escalation_model (llm_model when unset): also
+             the retry target when a call's output fails its validator
+             (e.g. unparseable scores); no escalation when unset
+
+LLM_MODEL_ROUTES ({"role": "model-id"}) overrides individual roles.
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+from typing import TypedDict
+from agents.telemetry import current_tags
+from config.settings import settings
+
+DEFAULT_MAX_TOKENS = 4096
+
+
+class ModelRoute(TypedDict):
+    tier: str        # "fast" | "default" | "strong"
+    max_tokens: int
+
+
+ROLE_ROUTES: dict[str, ModelRoute] = {
+    "layer_0_synthesize":  {"tier": "default", "max_tokens": 4096},
+    "financial_inference": {"tier": "fast",    "max_tokens": 512},
+    "trend_inference":     {"tier": "fast",    "max_tokens": 512},
+    "layer_1_compress":    {"tier": "fast",    "max_tokens": 1024},
+    "analyst_agent":       {"tier": "default", "max_tokens": 4096},
+    "critic":              {"tier": "default", "max_tokens": 2048},
+    "decision_maker":      {"tier": "default", "max_tokens": 2048},
+    "score_move":          {"tier": "fast",    "max_tokens": 512},
+}
+
+
+def current_role() -> str | None:
+    """The role of the call being made (the telemetry node tag)."""
+    return current_tags().get("node")
+
+
+def _tier_model(tier: str) -> str:
+    return {
+        "fast": settings.llm_fast_model,
+        "strong": settings.llm_escalation_model or settings.llm_model,
+    }.get(tier, settings.llm_model)
+
+
+def model_for(role: str | None) -> str:
+    """Model for a role: LLM_MODEL_ROUTES override → tier model → llm_model."""
+    if role in settings.llm_model_routes:
+        return settings.llm_model_routes[role]
+    route = ROLE_ROUTES.get(role)
+    return _tier_model(route["tier"]) if route else settings.llm_model
+
+
+def max_tokens_for(role: str | None) -> int:
+    route = ROLE_ROUTES.get(role)
+    return route["max_tokens"] if route else DEFAULT_MAX_TOKENS
+
+
+def escalation_model(model: str) -> str | None:
+    """Stronger model to retry with after a validation failure, or None."""
+    target = settings.llm_escalation_model
+    return target if target and target != model else None
@@ -0,0 +1,238 @@
+"""
+LLM telemetry — structured per-call records, in-process metrics, cost.
+
+call_llm() emits one record per call, tagged from the current context
+(analysis_id, layer, node, move_id, persona, round). Nodes add tags with:
+
+    with llm_tags(layer=1, node="financial_inference"):
+        await call_llm(...)
+
+Tags live in a ContextVar, so they flow into tasks spawned inside the
+block (asyncio.gather, LangGraph nodes, subgraphs).
+
+Records feed Prometheus-style counters and latency histograms (rendered
+at GET /api/metrics) and a per-analysis cost summary (AnalysisStatus).
+
+See: docs/architecture/LLD_pipeline.md § 9
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+log = logging.getLogger("llm.telemetry")
+
+TAG_KEYS = ("analysis_id", "layer", "node", "move_id", "persona", "round")
+
+# USD per million tokens: (input, output). Cache writes bill at 1.25x input,
+# cache reads at 0.1x input; Message Batches at 50% of everything.
+MODEL_PRICES_PER_MTOK: dict[str, tuple[float, float]] = {
+    "claude-haiku-4-5": (1.00, 5.00),
+    "claude-sonnet-4-5": (3.00, 15.00),
+    "claude-opus-4-1": (15.00, 75.00),
+}
+DEFAULT_PRICE_PER_MTOK = (3.00, 15.00)
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.10
+BATCH_DISCOUNT = 0.50
+
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Per-analysis records kept in memory (oldest analyses dropped first)
+MAX_TRACKED_ANALYSES = 200
+
+_tags: ContextVar[dict] = ContextVar("llm_tags", default={})
+
+
+@contextmanager
+def llm_tags(**tags):
+    """Adds telemetry tags for every call_llm() made inside the block."""
+    token = _tags.set({**_tags.get(), **{k: v for k, v in tags.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def current_tags() -> dict:
+    """Returns the telemetry tags active in this context."""
+    return dict(_tags.get())
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int,
+                  cache_read: int = 0, cache_write: int = 0, batch: bool = False) -> float:
+    """USD cost of one call from its usage."""
+    price_in, price_out = MODEL_PRICES_PER_MTOK.get(model, DEFAULT_PRICE_PER_MTOK)
+    cost = (
+        input_tokens * price_in
+        + cache_write * price_in * CACHE_WRITE_MULTIPLIER
+        + cache_read * price_in * CACHE_READ_MULTIPLIER
+        + output_tokens * price_out
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+class _Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.total += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _label_value(value) -> str:
+    """Escapes a label value per the exposition format (backslash, quote, newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+class LLMTelemetry:
+    """Process-wide sink for LLM call records."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: dict[tuple, int] = defaultdict(int)        # (layer, node, model, outcome)
+        self.tokens: dict[tuple, int] = defaultdict(int)          # (layer, node, model, kind)
+        self.cost: dict[tuple, float] = defaultdict(float)        # (layer, node, model)
+        self.latency: dict[tuple, _Histogram] = {}                # (layer, node)
+        self.by_analysis: OrderedDict[str, list[dict]] = OrderedDict()
+
+    def record(
+        self,
+        model: str,
+        outcome: str,
+        latency_seconds: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read: int = 0,
+        cache_write: int = 0,
+        batch: bool = False,
+        attempts: int = 1,
+    ) -> dict:
+        """
+        Records one call with the current tags
+        (outcome: ok | error | cache_hit | hedge_cancelled).
+        """
+        tags = current_tags()
+        cost = estimate_cost(model, input_tokens, output_tokens, cache_read, cache_write, batch)
+        record = {
+            **{k: tags.get(k) for k in TAG_KEYS},
+            "model": model,
+            "outcome": outcome,
+            "latency_seconds": round(latency_seconds, 3),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_read_input_tokens": cache_read,
+            "cache_creation_input_tokens": cache_write,
+            "cost_usd": cost,
+            "batch": batch,
+            "attempts": attempts,
+            "timestamp": time.time(),
+        }
+        layer = str(tags.get("layer", "none"))
+        node = tags.get("node", "none")
+
+        with self._lock:
+            self.requests[(layer, node, model, outcome)] += 1
+            for kind, count in (("input", input_tokens), ("output", output_tokens),
+                                ("cache_read", cache_read), ("cache_write", cache_write)):
+                if count:
+                    self.tokens[(layer, node, model, kind)] += count
+            self.cost[(layer, node, model)] += cost
+            if outcome == "ok":
+                self.latency.setdefault((layer, node), _Histogram(LATENCY_BUCKETS)) \
+                    .observe(latency_seconds)
+
+            analysis_id = tags.get("analysis_id")
+            if analysis_id:
+                self.by_analysis.setdefault(analysis_id, []).append(record)
+                self.by_analysis.move_to_end(analysis_id)
+                while len(self.by_analysis) > MAX_TRACKED_ANALYSES:
+                    self.by_analysis.popitem(last=False)
+
+        log.debug("LLM record %s", record)
+        return record
+
+    def analysis_summary(self, analysis_id: str) -> dict | None:
+        """Cost/token/latency totals for one analysis, overall and per layer."""
+        with self._lock:
+            records = list(self.by_analysis.get(analysis_id, []))
+        if not records:
+            return None
+
+        def _totals(rows: list[dict]) -> dict:
+            ok = [r for r in rows if r["outcome"] == "ok"]
+            return {
+                "calls": len(ok),
+                "cache_hits": sum(1 for r in rows if r["outcome"] == "cache_hit"),
+                "errors": sum(1 for r in rows if r["outcome"] == "error"),
+                "hedges_cancelled": sum(1 for r in rows if r["outcome"] == "hedge_cancelled"),
+                "input_tokens": sum(r["input_tokens"] for r in rows),
+                "output_tokens": sum(r["output_tokens"] for r in rows),
+                "cache_read_input_tokens": sum(r["cache_read_input_tokens"] for r in rows),
+                "cache_creation_input_tokens": sum(r["cache_creation_input_tokens"] for r in rows),
+                "cost_usd": round(sum(r["cost_usd"] for r in rows), 6),
+                "llm_seconds": round(sum(r["latency_seconds"] for r in ok), 2),
+            }
+
+        by_layer: dict[str, list[dict]] = defaultdict(list)
+        for r in records:
+            by_layer[str(r["layer"])].append(r)
+
+        return {
+            **_totals(records),
+            "by_layer": {layer: _totals(rows) for layer, rows in sorted(by_layer.items())},
+        }
+
+    def render_prometheus(self, extra_gauges: dict[str, float] | None = None) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            lines += ["# HELP llm_requests_total LLM calls by outcome.",
+                      "# TYPE llm_requests_total counter"]
+            for (layer, node, model, outcome), n in sorted(self.requests.items()):
+                lines.append(f"llm_requests_total{_labels(layer=layer, node=node, model=model, outcome=outcome)} {n}")
+
+            lines += ["# HELP llm_tokens_total Tokens by kind (input, output, cache_read, cache_write).",
+                      "# TYPE llm_tokens_total counter"]
+            for (layer, node, model, kind), n in sorted(self.tokens.items()):
+                lines.append(f"llm_tokens_total{_labels(layer=layer, node=node, model=model, kind=kind)} {n}")
+
+            lines += ["# HELP llm_cost_usd_total Estimated spend in USD.",
+                      "# TYPE llm_cost_usd_total counter"]
+            for (layer, node, model), cost in sorted(self.cost.items()):
+                lines.append(f"llm_cost_usd_total{_labels(layer=layer, node=node, model=model)} {cost:.6f}")
+
+            lines += ["# HELP llm_request_duration_seconds Latency of successful LLM calls.",
+                      "# TYPE llm_request_duration_seconds histogram"]
+            for (layer, node), hist in sorted(self.latency.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"llm_request_duration_seconds_bucket"
+                                 f"{_labels(layer=layer, node=node, le=bound)} {count}")
+                lines.append(f"llm_request_duration_seconds_bucket"
+                             f"{_labels(layer=layer, node=node, le='+Inf')} {hist.total}")
+                lines.append(f"llm_request_duration_seconds_sum{_labels(layer=layer, node=node)} {hist.sum:.3f}")
+                lines.append(f"llm_request_duration_seconds_count{_labels(layer=layer, node=node)} {hist.total}")
+
+        for name, value in (extra_gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+telemetry = LLMTelemetry()
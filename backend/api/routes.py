@@ -4,6 +4,9 @@ FastAPI route definitions.
   POST /api/analyze    — start an analysis pipeline
   GET  /api/stream/:id — SSE stream for real-time progress
   GET  /api/results/:id — fetch completed results
+  GET  /api/metrics    — LLM telemetry (Prometheus text format)
+  GET  /api/health     — circuit breaker + dispatcher state
+  DELETE /api/admin/layer-0-cache[/:ticker] — invalidate cached Layer 0 data
 
 See: docs/architecture/LLD_pipeline.md § 5
 """
@@ -12,9 +15,15 @@ import logging
 import traceback
 import uuid
 from fastapi import APIRouter, BackgroundTasks, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from agents.cache import get_response_cache
+from agents.circuit_breaker import CLOSED, OPEN, get_circuit_breaker
+from agents.dispatcher import get_dispatcher
+from agents.hedging import get_hedger
+from agents.telemetry import llm_tags, telemetry
 from models.schemas import AnalyzeRequest, AnalyzeResponse, AnalysisStatus
 from api.sse import SSEManager
+from graph.layer_0.cache import invalidate_layer_0
 from graph.pipeline import pipeline
 from graph.sandbox.orchestrator import set_sse_publish
 
@@ -42,8 +51,10 @@ async def start_analysis(
         "result": None,
     }
 
-    log.info("POST /analyze  ticker=%s  id=%s", request.ticker, analysis_id)
-    background_tasks.add_task(_run_pipeline, analysis_id, request.ticker)
+    log.info("POST /analyze  ticker=%s  id=%s%s", request.ticker, analysis_id,
+             "  force_refresh" if request.force_refresh else "")
+    background_tasks.add_task(_run_pipeline, analysis_id, request.ticker,
+                              request.force_refresh)
 
     return AnalyzeResponse(
         analysis_id=analysis_id,
@@ -83,10 +94,55 @@ async def get_results(analysis_id: str):
         ticker=analysis["ticker"],
         status=analysis["status"],
         result=analysis.get("result"),
+        cost_summary=telemetry.analysis_summary(analysis_id),
     )
 
 
-async def _run_pipeline(analysis_id: str, ticker: str):
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """LLM call counters, token/cost totals and latency histograms for Prometheus."""
+    gauges = {f"llm_dispatcher_{k}": v for k, v in get_dispatcher().stats().items()}
+    gauges.update({f"llm_hedge_{k}": v for k, v in get_hedger().stats().items()})
+    circuit = get_circuit_breaker().stats()
+    gauges["llm_circuit_state"] = {CLOSED: 0, OPEN: 2}.get(circuit["state"], 1)
+    gauges["llm_circuit_times_opened"] = circuit["times_opened"]
+    gauges["llm_circuit_rejected"] = circuit["rejected"]
+    cache = get_response_cache()
+    if cache is not None:
+        stats = cache.stats()
+        gauges.update({f"llm_response_cache_{k}": stats[k]
+                       for k in ("hits", "misses", "evictions", "size")})
+    return PlainTextResponse(
+        telemetry.render_prometheus(gauges),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@router.get("/health")
+async def health():
+    """Liveness plus LLM upstream state; status is "degraded" while the circuit is not closed."""
+    circuit = get_circuit_breaker().stats()
+    return {
+        "status": "ok" if circuit["state"] == CLOSED else "degraded",
+        "circuit_breaker": circuit,
+        "dispatcher": get_dispatcher().stats(),
+        "running_analyses": sum(1 for a in active_analyses.values() if a["status"] == "running"),
+    }
+
+
+@router.delete("/admin/layer-0-cache/{ticker}")
+async def invalidate_layer_0_ticker(ticker: str):
+    """Drops the cached Layer 0 data for one ticker."""
+    return {"ticker": ticker.upper(), "removed": await invalidate_layer_0(ticker)}
+
+
+@router.delete("/admin/layer-0-cache")
+async def invalidate_layer_0_all():
+    """Drops every cached Layer 0 entry."""
+    return {"removed": await invalidate_layer_0()}
+
+
+async def _run_pipeline(analysis_id: str, ticker: str, force_refresh: bool = False):
     """
     Runs the LangGraph pipeline via astream and publishes status_updates
     to SSE subscribers in real time. Accumulates the final state from
@@ -104,8 +160,9 @@ async def _run_pipeline(analysis_id: str, ticker: str):
     # immediately by the orchestrator as each subgraph node finishes.
     async def _sandbox_sse_callback(event: dict):
         event_type = event.get("event", "unknown")
-        log.info("[%s] SSE (realtime) -> %s %s", short_id, event_type,
-                 {k: v for k, v in event.items() if k != "messages"})
+        if event_type != "sandbox_delta":  # token deltas are too chatty to log
+            log.info("[%s] SSE (realtime) -> %s %s", short_id, event_type,
+                     {k: v for k, v in event.items() if k != "messages"})
         await sse_manager.publish(analysis_id, event)
 
     set_sse_publish(_sandbox_sse_callback)
@@ -116,6 +173,8 @@ async def _run_pipeline(analysis_id: str, ticker: str):
     SANDBOX_REALTIME_EVENTS = {
         "layer_start", "layer_complete",
         "sandbox_round", "sandbox_scored", "sandbox_skipped",
+        "sandbox_tournament", "sandbox_round_budget", "sandbox_converged",
+        "agent_complete",  # analysts run inside the orchestrator (SANDBOX_STREAMING_HANDOFF)
     }
 
     try:
@@ -129,96 +188,104 @@ async def _run_pipeline(analysis_id: str, ticker: str):
 
         log.info("[%s] Starting pipeline.astream()...", short_id)
 
-        async for event in pipeline.astream(
-            {"company_ticker": ticker},
-            stream_mode="updates",
-        ):
-            for node_name, node_output in event.items():
-                # Log what keys this node produced
-                keys = list(node_output.keys())
-                log.info("[%s] astream node=%s  keys=%s", short_id, node_name, keys)
-
-                # Merge node output into final_state
-                for key, value in node_output.items():
-                    if key == "status_updates":
-                        final_state.setdefault("status_updates", [])
-                        final_state["status_updates"].extend(value)
-                    elif isinstance(value, list) and isinstance(
-                        final_state.get(key), list
-                    ):
-                        # For Annotated[list, add] fields — extend
-                        final_state[key].extend(value)
-                    else:
-                        final_state[key] = value
-
-                # Publish status_updates to SSE
-                # For sandbox_orchestrator, events were already published
-                # in real-time by the orchestrator — skip re-publishing.
-                is_sandbox_node = (node_name == "sandbox_orchestrator")
-
-                for update in node_output.get("status_updates", []):
-                    event_type = update.get("event", "unknown")
-
-                    # Skip events already published in real-time by orchestrator
-                    if is_sandbox_node and event_type in SANDBOX_REALTIME_EVENTS:
-                        log.info("[%s] SSE (skip dup) %s from %s",
-                                 short_id, event_type, node_name)
-                        continue
-
-                    layer = update.get("layer", "?")
-                    agent_id = update.get("agent_id", "")
-                    persona = update.get("persona", "")
-
-                    # Build a meaningful log line depending on event type
-                    if event_type == "layer_start":
-                        log.info("[%s] SSE -> layer_start layer=%s", short_id, layer)
-                    elif event_type == "layer_complete":
-                        artifacts = update.get("artifacts", [])
-                        total_moves = update.get("total_moves", "")
-                        log.info("[%s] SSE -> layer_complete layer=%s status=%s, artifacts=%s%s",
-                                 short_id, layer, update.get("status", "done"),
-                                 artifacts,
-                                 f", total_moves={total_moves}" if total_moves else "")
-                    elif event_type == "agent_complete":
-                        move_count = update.get("move_count", "")
-                        log.info("[%s] SSE -> agent_complete layer=%s agent_id=%s, persona=%s%s",
-                                 short_id, layer, agent_id, persona,
-                                 f", move_count={move_count}" if move_count else "")
-                    elif event_type == "sandbox_round":
-                        log.info("[%s] SSE -> sandbox_round move=%s round=%s status=%s",
-                                 short_id, update.get("move"), update.get("round"), update.get("status"))
-                    elif event_type == "sandbox_scored":
-                        log.info("[%s] SSE -> sandbox_scored move=%s score=%s",
-                                 short_id, update.get("move"), update.get("score"))
-                    elif event_type == "sandbox_skipped":
-                        log.info("[%s] SSE -> sandbox_skipped move=%s reason=%s",
-                                 short_id, update.get("move"), update.get("reason"))
-                    elif event_type == "pipeline_complete":
-                        recommended = update.get("recommended", [])
-                        log.info("[%s] SSE -> pipeline_complete recommended=%s", short_id, recommended)
-                    else:
-                        log.info("[%s] SSE -> %s %s", short_id, event_type, update)
-
-                    await sse_manager.publish(analysis_id, update)
-
-                # Log move accumulation
-                if "move_suggestions" in node_output:
-                    total = len(final_state.get("move_suggestions", []))
-                    log.info("[%s]   +%d moves (total: %d)",
-                             short_id, len(node_output["move_suggestions"]), total)
-
-                # ── Continuously update partial results so GET /results/:id
-                #    returns data as each layer completes (not just at the end).
-                active_analyses[analysis_id]["result"] = {
-                    "recommended_moves": final_state.get("recommended_moves", []),
-                    "other_moves": final_state.get("other_moves", []),
-                    "f1": final_state.get("f1_financial_inference", ""),
-                    "f2": final_state.get("f2_trend_inference", ""),
-                    "move_suggestions": final_state.get("move_suggestions", []),
-                    "conversation_logs": final_state.get("conversation_logs", []),
-                    "financial_data_raw": final_state.get("financial_data_raw", ""),
-                    "news_data_raw": final_state.get("news_data_raw", ""),
-                }
+        # Tags every LLM call made by this run (see agents/telemetry.py)
+        with llm_tags(analysis_id=analysis_id):
+            async for mode, event in pipeline.astream(
+                {"company_ticker": ticker, "force_refresh": force_refresh},
+                stream_mode=["updates", "custom"],
+            ):
+                # Custom events (e.g. chunk_progress from agents/chunk_engine.py)
+                # are published as-is; they carry no state.
+                if mode == "custom":
+                    await sse_manager.publish(analysis_id, event)
+                    continue
+
+                for node_name, node_output in event.items():
+                    # Log what keys this node produced
+                    keys = list(node_output.keys())
+                    log.info("[%s] astream node=%s  keys=%s", short_id, node_name, keys)
+
+                    # Merge node output into final_state
+                    for key, value in node_output.items():
+                        if key == "status_updates":
+                            final_state.setdefault("status_updates", [])
+                            final_state["status_updates"].extend(value)
+                        elif isinstance(value, list) and isinstance(
+                            final_state.get(key), list
+                        ):
+                            # For Annotated[list, add] fields — extend
+                            final_state[key].extend(value)
+                        else:
+                            final_state[key] = value
+
+                    # Publish status_updates to SSE
+                    # For sandbox_orchestrator, events were already published
+                    # in real-time by the orchestrator — skip re-publishing.
+                    is_sandbox_node = (node_name == "sandbox_orchestrator")
+
+                    for update in node_output.get("status_updates", []):
+                        event_type = update.get("event", "unknown")
+
+                        # Skip events already published in real-time by orchestrator
+                        if is_sandbox_node and event_type in SANDBOX_REALTIME_EVENTS:
+                            log.info("[%s] SSE (skip dup) %s from %s",
+                                     short_id, event_type, node_name)
+                            continue
+
+                        layer = update.get("layer", "?")
+                        agent_id = update.get("agent_id", "")
+                        persona = update.get("persona", "")
+
+                        # Build a meaningful log line depending on event type
+                        if event_type == "layer_start":
+                            log.info("[%s] SSE -> layer_start layer=%s", short_id, layer)
+                        elif event_type == "layer_complete":
+                            artifacts = update.get("artifacts", [])
+                            total_moves = update.get("total_moves", "")
+                            log.info("[%s] SSE -> layer_complete layer=%s status=%s, artifacts=%s%s",
+                                     short_id, layer, update.get("status", "done"),
+                                     artifacts,
+                                     f", total_moves={total_moves}" if total_moves else "")
+                        elif event_type == "agent_complete":
+                            move_count = update.get("move_count", "")
+                            log.info("[%s] SSE -> agent_complete layer=%s agent_id=%s, persona=%s%s",
+                                     short_id, layer, agent_id, persona,
+                                     f", move_count={move_count}" if move_count else "")
+                        elif event_type == "sandbox_round":
+                            log.info("[%s] SSE -> sandbox_round move=%s round=%s status=%s",
+                                     short_id, update.get("move"), update.get("round"), update.get("status"))
+                        elif event_type == "sandbox_scored":
+                            log.info("[%s] SSE -> sandbox_scored move=%s score=%s",
+                                     short_id, update.get("move"), update.get("score"))
+                        elif event_type == "sandbox_skipped":
+                            log.info("[%s] SSE -> sandbox_skipped move=%s reason=%s",
+                                     short_id, update.get("move"), update.get("reason"))
+                        elif event_type == "pipeline_complete":
+                            recommended = update.get("recommended", [])
+                            log.info("[%s] SSE -> pipeline_complete recommended=%s", short_id, recommended)
+                        else:
+                            log.info("[%s] SSE -> %s %s", short_id, event_type, update)
+
+                        await sse_manager.publish(analysis_id, update)
+
+                    # Log move accumulation
+                    if "move_suggestions" in node_output:
+                        total = len(final_state.get("move_suggestions", []))
+                        log.info("[%s]   +%d moves (total: %d)",
+                                 short_id, len(node_output["move_suggestions"]), total)
+
+                    # ── Continuously update partial results so GET /results/:id
+                    #    returns data as each layer completes (not just at the end).
+                    active_analyses[analysis_id]["result"] = {
+                        "recommended_moves": final_state.get("recommended_moves", []),
+                        "other_moves": final_state.get("other_moves", []),
+                        "f1": final_state.get("f1_financial_inference", ""),
+                        "f2": final_state.get("f2_trend_inference", ""),
+                        "move_suggestions": final_state.get("move_suggestions", []),
+                        "conversation_logs": final_state.get("conversation_logs", []),
+                        "financial_data_raw": final_state.get("financial_data_raw", ""),
+                        "news_data_raw": final_state.get("news_data_raw", ""),
+                    }
 
         # ── Pipeline finished successfully ──
         moves_count = len(final_state.get("move_suggestions", []))
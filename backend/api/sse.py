@@ -11,13 +11,19 @@ from typing import AsyncGenerator
 
 log = logging.getLogger("sse")
 
+# Live-preview events (token deltas). They are superseded by the final
+# sandbox_round message, so they are never buffered for late subscribers
+# and are dropped for a subscriber whose queue is already backed up.
+TRANSIENT_EVENTS = {"sandbox_delta"}
+MAX_TRANSIENT_BACKLOG = 500
+
 
 class SSEManager:
     """
     Manages Server-Sent Event streams for multiple concurrent analyses.
     Each analysis_id has its own list of subscriber queues.
     Events published before any subscriber connects are buffered and
-    replayed when the first subscriber connects.
+    replayed when the first subscriber connects (except transient deltas).
     """
 
     def __init__(self):
@@ -28,6 +34,13 @@ class SSEManager:
         """Publishes an event to all subscribers of an analysis."""
         data = json.dumps(event)
         short_id = analysis_id[:8]
+        transient = event.get("event") in TRANSIENT_EVENTS
+
+        if transient:
+            for queue in self._queues.get(analysis_id, []):
+                if queue.qsize() < MAX_TRANSIENT_BACKLOG:
+                    queue.put_nowait(data)
+            return
 
         if analysis_id not in self._queues or not self._queues[analysis_id]:
             # No subscribers yet — buffer the event
@@ -0,0 +1,122 @@
+"""
+Big4 — Headless bulk runner (Message Batches).
+
+Runs the full pipeline for many tickers without the API server or SSE.
+All tickers run concurrently inside agents.batch.batch_mode(), so each
+layer's LLM requests across every ticker are submitted together as one
+message batch; the graphs resume when the batch ends.
+
+Usage:
+  python batch_runner.py AAPL MSFT NVDA -o results.jsonl
+  python batch_runner.py --tickers-file watchlist.txt -o results.jsonl
+  python batch_runner.py AAPL --backend local     # stand-in, no Batches API
+
+Writes one JSON object per ticker (recommended/other moves, F1/F2,
+conversation logs, or the error) to the output JSONL file.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from agents.batch import (
+    AnthropicBatchBackend,
+    BatchCollector,
+    LocalBatchBackend,
+    batch_mode,
+)
+from config.settings import settings
+from graph.pipeline import build_pipeline
+from utils.logger import setup_logging
+
+log = logging.getLogger("batch_runner")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Big4 pipeline for many tickers via Message Batches.")
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols, e.g. AAPL MSFT")
+    parser.add_argument("--tickers-file", help="File with one ticker per line")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Output JSONL path")
+    parser.add_argument("--backend", choices=["anthropic", "local"], default="anthropic",
+                        help="'anthropic' = Message Batches API; 'local' = per-request stand-in")
+    parser.add_argument("--poll-interval", type=float, default=30.0,
+                        help="Seconds between batch status polls")
+    parser.add_argument("--flush-window", type=float, default=2.0,
+                        help="Quiet seconds before pending requests are submitted as a batch")
+    parser.add_argument("--sandbox-concurrency", type=int, default=1000,
+                        help="Per-ticker negotiation concurrency (high, so every move joins the same batch)")
+    return parser.parse_args()
+
+
+def _load_tickers(args: argparse.Namespace) -> list[str]:
+    tickers = [t.strip().upper() for t in args.tickers if t.strip()]
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers.extend(line.strip().upper() for line in f
+                           if line.strip() and not line.startswith("#"))
+    return list(dict.fromkeys(tickers))  # dedupe, keep order
+
+
+async def _run_ticker(pipeline, ticker: str) -> dict:
+    """Runs one pipeline to completion; never raises (errors go to the record)."""
+    start = time.time()
+    try:
+        state = await pipeline.ainvoke({"company_ticker": ticker})
+    except Exception as e:
+        log.error("[%s] FAILED: %s", ticker, e, exc_info=True)
+        return {"ticker": ticker, "status": "error", "error": str(e),
+                "elapsed_seconds": round(time.time() - start, 1)}
+
+    log.info("[%s] COMPLETE in %.1fs", ticker, time.time() - start)
+    return {
+        "ticker": ticker,
+        "status": "complete",
+        "elapsed_seconds": round(time.time() - start, 1),
+        "recommended_moves": state.get("recommended_moves", []),
+        "other_moves": state.get("other_moves", []),
+        "f1": state.get("f1_financial_inference", ""),
+        "f2": state.get("f2_trend_inference", ""),
+        "conversation_logs": state.get("conversation_logs", []),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    tickers = _load_tickers(args)
+    if not tickers:
+        raise SystemExit("No tickers given (pass them as arguments or via --tickers-file)")
+
+    # Scoped to this run: restored on exit so callers in the same process
+    # (tests, notebooks) keep their own limit.
+    saved_concurrency = settings.sandbox_concurrency
+    settings.sandbox_concurrency = args.sandbox_concurrency
+    try:
+        await _run_batch(args, tickers)
+    finally:
+        settings.sandbox_concurrency = saved_concurrency
+
+
+async def _run_batch(args: argparse.Namespace, tickers: list[str]) -> None:
+    backend = (AnthropicBatchBackend(poll_interval=args.poll_interval)
+               if args.backend == "anthropic" else LocalBatchBackend())
+    collector = BatchCollector(backend, flush_window=args.flush_window)
+    pipeline = build_pipeline()
+
+    log.info("Batch run START: %d tickers, backend=%s, output=%s",
+             len(tickers), args.backend, args.output)
+    start = time.time()
+
+    with batch_mode(collector), open(args.output, "w") as out:
+        for coro in asyncio.as_completed([_run_ticker(pipeline, t) for t in tickers]):
+            record = await coro
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+    log.info("Batch run DONE: %d tickers in %.1fs — %d batches, %d requests",
+             len(tickers), time.time() - start,
+             collector.batches_submitted, collector.requests_submitted)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(run(_parse_args()))
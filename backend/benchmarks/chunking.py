@@ -0,0 +1,94 @@
+"""
+Layer 1 chunking benchmark — fixed 20-line splitter vs split_markdown().
+
+Chunks the Layer 0 example documents (graph/layer_0/templates.py) both
+ways and reports, per document: LLM calls, estimated input tokens
+(persona + prompt + chunk, what each call actually sends), estimated
+output tokens, tables cut across chunks and undersized chunks. No LLM
+calls are made.
+
+Usage (from backend/):
+  python -m benchmarks.chunking
+  python -m benchmarks.chunking --budgets 400 700 1000
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import argparse
+from agents.chunker import CHUNK_LINES, estimate_tokens, split_into_chunks, split_markdown
+from config.personas import FINANCIAL_CHUNK_INFERENCE_PERSONA, TREND_CHUNK_INFERENCE_PERSONA
+from graph.layer_0.templates import FINANCIAL_DATA_TEMPLATE, NEWS_DATA_TEMPLATE
+
+# 3-5 sentences per chunk inference
+OUTPUT_TOKENS_PER_CALL = 120
+# Per-call prompt wrapper around the chunk (see graph/layer_1/*_inference.py)
+PROMPT_OVERHEAD = (
+    "Here is section 1 of the financial data for NVTK. Provide a concise "
+    "inference (3-5 sentences) analyzing what this section reveals:\n\n"
+)
+
+DOCUMENTS = {
+    "financial": (FINANCIAL_DATA_TEMPLATE, FINANCIAL_CHUNK_INFERENCE_PERSONA),
+    "trend": (NEWS_DATA_TEMPLATE, TREND_CHUNK_INFERENCE_PERSONA),
+}
+
+
+def _cut_tables(text: str, chunks: list[str]) -> int:
+    """Tables whose rows land in more than one chunk."""
+    tables, current = [], []
+    for line in text.split("\n"):
+        if line.lstrip().startswith("|"):
+            current.append(line.rstrip())
+        elif current:
+            tables.append(current)
+            current = []
+    if current:
+        tables.append(current)
+    return sum(
+        1 for rows in tables
+        if not any(all(r in c for r in rows) for c in chunks)
+    )
+
+
+def _measure(text: str, persona: str, chunks: list[str], budget: int) -> dict:
+    overhead = estimate_tokens(persona + PROMPT_OVERHEAD)
+    return {
+        "calls": len(chunks),
+        "input_tokens": sum(overhead + estimate_tokens(c) for c in chunks),
+        "output_tokens": len(chunks) * OUTPUT_TOKENS_PER_CALL,
+        "cut_tables": _cut_tables(text, chunks),
+        "small_chunks": sum(1 for c in chunks if estimate_tokens(c) < budget // 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare Layer 1 chunkers on the template documents.")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[400, 700, 1000],
+                        help="split_markdown token budgets to try")
+    args = parser.parse_args()
+
+    header = f"{'document':<10} {'chunker':<20} {'calls':>5} {'in_tok':>7} {'out_tok':>7} {'cut_tbl':>7} {'small':>5}"
+    print(header)
+    print("-" * len(header))
+    totals: dict[str, dict] = {}
+    for name, (text, persona) in DOCUMENTS.items():
+        legacy = split_into_chunks(text, CHUNK_LINES)
+        # Legacy chunks average ~20 lines; "small" is judged against their mean size.
+        legacy_budget = sum(estimate_tokens(c) for c in legacy) // max(1, len(legacy))
+        runs = [(f"lines={CHUNK_LINES}", _measure(text, persona, legacy, legacy_budget))]
+        for budget in args.budgets:
+            runs.append((f"markdown tok={budget}", _measure(text, persona, split_markdown(text, budget), budget)))
+        for label, m in runs:
+            print(f"{name:<10} {label:<20} {m['calls']:>5} {m['input_tokens']:>7} "
+                  f"{m['output_tokens']:>7} {m['cut_tables']:>7} {m['small_chunks']:>5}")
+            total = totals.setdefault(label, dict.fromkeys(m, 0))
+            for k, v in m.items():
+                total[k] += v
+    print("-" * len(header))
+    for label, m in totals.items():
+        print(f"{'total':<10} {label:<20} {m['calls']:>5} {m['input_tokens']:>7} "
+              f"{m['output_tokens']:>7} {m['cut_tables']:>7} {m['small_chunks']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+F1/F2 compression benchmark — Layer 2 input tokens with and without briefs.
+
+Runs Layer 0 and Layer 1 for one ticker on the fake LLM backend (no
+tokens spent), then compresses F1/F2 at each brief budget and reports:
+brief size, what the compression calls cost, and the analyst fan-out
+input (NUM_ANALYST_AGENTS × persona + F1/F2 context + move prompt) with
+the shared context prompt-cached as in graph/layer_2/analyst_agent.py.
+
+LAYER_1_CHUNK_TOKENS is lowered by default so F1/F2 have roughly as many
+sections as a real, longer data package.
+
+Usage (from backend/):
+  python -m benchmarks.compression
+  python -m benchmarks.compression --budgets 600 1200 2400 --chunk-tokens 250
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("ANTHROPIC_BASE_URL", "")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "20")
+os.environ.setdefault("LAYER_0_CACHE_ENABLED", "false")
+os.environ.setdefault("LAYER_1_STORE_ENABLED", "false")
+
+from agents.chunker import estimate_tokens  # noqa: E402
+from agents.routing import model_for  # noqa: E402
+from agents.telemetry import estimate_cost, llm_tags, telemetry  # noqa: E402
+from config.personas import ANALYST_PERSONAS, MOVE_GENERATION_CONTEXT, MOVE_GENERATION_PROMPT  # noqa: E402
+from config.settings import settings  # noqa: E402
+from graph.layer_0.node import layer_0_synthesize  # noqa: E402
+from graph.layer_1.compress import compress_inference  # noqa: E402
+from graph.layer_1.financial_inference import financial_inference_agent  # noqa: E402
+from graph.layer_1.node import dispatch_layer_1  # noqa: E402
+from graph.layer_1.trend_inference import trend_inference_agent  # noqa: E402
+
+
+def _layer_2_input(ticker: str, f1: str, f2: str) -> tuple[int, float]:
+    """(input tokens, USD) for the analyst fan-out on this F1/F2."""
+    context = estimate_tokens(MOVE_GENERATION_CONTEXT.format(ticker=ticker, f1=f1, f2=f2))
+    prompt = estimate_tokens(MOVE_GENERATION_PROMPT)
+    personas = ANALYST_PERSONAS[:settings.num_analyst_agents]
+    model = model_for("analyst_agent")
+    tokens = cost = 0
+    for i, persona in enumerate(personas):
+        uncached = estimate_tokens(persona["system_prompt"]) + prompt
+        tokens += uncached + context
+        # First analyst writes the shared-prefix cache entry, the rest read it
+        cost += estimate_cost(model, uncached, 0,
+                              cache_read=context if i else 0, cache_write=0 if i else context)
+    return tokens, cost
+
+
+async def _run(ticker: str, budgets: list[int]) -> None:
+    state = {"company_ticker": ticker}
+    state.update(await layer_0_synthesize(state))
+    sends = dispatch_layer_1(state)
+    f1_out, f2_out = await asyncio.gather(
+        financial_inference_agent(sends[0].arg), trend_inference_agent(sends[1].arg),
+    )
+    f1, f2 = f1_out["f1_financial_inference"], f2_out["f2_trend_inference"]
+
+    header = f"{'variant':<14} {'F1+F2 tok':>9} {'calls':>5} {'compress $':>10} {'L2 in tok':>9} {'L2 in $':>8} {'net $':>8}"
+    print(header)
+    print("-" * len(header))
+    base_tokens, base_cost = _layer_2_input(ticker, f1, f2)
+    print(f"{'full':<14} {estimate_tokens(f1) + estimate_tokens(f2):>9} {0:>5} {0:>10.4f} "
+          f"{base_tokens:>9} {base_cost:>8.4f} {base_cost:>8.4f}")
+    for budget in budgets:
+        run_id = f"compress-{budget}"
+        with llm_tags(analysis_id=run_id):
+            b1, b2 = await asyncio.gather(
+                compress_inference("financial", ticker, f1, budget // 2),
+                compress_inference("trend", ticker, f2, budget // 2),
+            )
+        summary = telemetry.analysis_summary(run_id) or {"calls": 0, "cost_usd": 0.0}
+        tokens, cost = _layer_2_input(ticker, b1, b2)
+        net = cost + summary["cost_usd"]
+        print(f"{f'brief={budget}':<14} {estimate_tokens(b1) + estimate_tokens(b2):>9} "
+              f"{summary['calls']:>5} {summary['cost_usd']:>10.4f} {tokens:>9} {cost:>8.4f} {net:>8.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure Layer 2 token savings from F1/F2 briefs.")
+    parser.add_argument("--ticker", default="NVTK")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[600, 1200, 2400],
+                        help="LAYER_1_BRIEF_TOKENS values to try (F1 + F2)")
+    parser.add_argument("--chunk-tokens", type=int, default=150,
+                        help="LAYER_1_CHUNK_TOKENS for the Layer 1 run")
+    args = parser.parse_args()
+    settings.layer_1_chunk_tokens = args.chunk_tokens
+    if settings.llm_backend != "fake":
+        print(f"warning: LLM_BACKEND={settings.llm_backend} — this run spends tokens", file=sys.stderr)
+    asyncio.run(_run(args.ticker, args.budgets))
+
+
+if __name__ == "__main__":
+    main()
@@ -145,6 +145,20 @@ Be specific and concise. Every sentence must reference data from the section.
 """
 
 
+INFERENCE_COMPRESSION_PERSONA = """
+You are a senior research editor at a top-tier investment bank.
+You are given short inference notes written section by section about
+one company's data. Your job is to merge them into a compact brief for
+the strategists who will read it.
+
+Rules:
+- Keep every specific figure, percentage, date and source that carries
+  signal; drop repetition and filler.
+- Never invent numbers or facts that are not in the notes.
+- Do NOT make strategic recommendations — only describe and infer.
+- Respect the word limit you are given.
+"""
+
 # ─────────────────────────────────────────────
 # LAYER 2 — Analyst Agent Personas
 # ─────────────────────────────────────────────
@@ -203,7 +217,9 @@ ANALYST_PERSONAS = [
     },
 ]
 
-MOVE_GENERATION_PROMPT = """
+# Stable, persona-independent context: sent ahead of the analyst persona
+# so all analysts share one prompt-cache entry for F1 + F2.
+MOVE_GENERATION_CONTEXT = """
 You are given two inference documents about {ticker}:
 
 ## F1 — Financial Inference:
@@ -211,7 +227,9 @@ You are given two inference documents about {ticker}:
 
 ## F2 — Market Trend Inference:
 {f2}
+"""
 
+MOVE_GENERATION_PROMPT = """
 Based on your analysis of both documents, propose THREE strategic moves
 for this company:
 
@@ -364,13 +382,10 @@ DECISION_MAKER_PERSONAS = [
 
 SCORING_METRICS = ["impact", "feasibility", "risk_adjusted_return", "strategic_alignment"]
 
+# Sent after the move document (shared prefix) and the transcript blocks,
+# so no placeholders — the JSON braces below are literal.
 SCORING_PROMPT = """
-You have just completed a multi-round boardroom negotiation about this business move:
-
-{move_content}
-
-Your full negotiation transcript:
-{transcript}
+You have just completed the multi-round boardroom negotiation above about this business move.
 
 Now score this move on the following 4 metrics, each out of 10.
 Be OBJECTIVE — reflect what you genuinely believe after the full debate,
@@ -384,11 +399,11 @@ Metrics:
 4. Strategic Alignment (1-10): How well does the move fit the company's long-term direction?
 
 Respond ONLY with valid JSON in this exact format:
-{{
+{
     "impact": <int>,
     "feasibility": <int>,
     "risk_adjusted_return": <int>,
     "strategic_alignment": <int>,
     "reasoning": "<1-2 sentence justification for your scores>"
-}}
+}
 """
@@ -4,6 +4,7 @@ Application settings — loaded from environment / .env file.
 See: docs/architecture/LLD_pipeline.md § 8
 """
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -15,17 +16,118 @@ class Settings(BaseSettings):
 
     # --- LLM (Anthropic Claude) ---
     anthropic_api_key: str = ""          # or set ANTHROPIC_API_KEY in env
+    anthropic_base_url: str = ""         # empty = SDK default (api.anthropic.com)
+    llm_backend: str = "anthropic"       # "anthropic" | "fake" (agents/fake_llm.py)
     llm_model: str = "claude-haiku-4-5"  # Haiku for prototype speed/cost
+    llm_fast_model: str = "claude-haiku-4-5"          # chunk inference + scoring roles
+    llm_escalation_model: str = ""   # retry target on invalid output, e.g. claude-sonnet-4-5; "" = off
+    llm_model_routes: dict[str, str] = {}             # per-role overrides (agents/routing.py)
     llm_temperature: float = 0.7
     llm_max_retries: int = 3
+    llm_prompt_caching: bool = True      # cache_control breakpoints on stable prefixes
+    llm_coalesce_inflight: bool = True   # identical concurrent requests share one call
+    llm_request_timeout_seconds: float = 120.0   # per attempt, excludes queueing; 0 = none
+    llm_retry_base_seconds: float = 1.0          # full-jitter backoff base ...
+    llm_retry_max_backoff_seconds: float = 30.0  # ... and cap
+
+    # --- LLM circuit breaker (shared, see agents/circuit_breaker.py) ---
+    llm_circuit_failure_threshold: int = 5      # consecutive 5xx/timeouts before opening
+    llm_circuit_recovery_seconds: float = 30.0  # open → half-open after this long
+    llm_circuit_half_open_calls: int = 1        # probe calls allowed while half-open
+    llm_circuit_open_behavior: str = "fail"     # "fail" fast | "queue" until recovery
+    llm_circuit_max_queue_wait_seconds: float = 300.0
+
+    # --- LLM dispatcher (process-wide, see agents/dispatcher.py) ---
+    llm_requests_per_minute: int = 0     # 0 = unlimited; set to the account's RPM
+    llm_input_tokens_per_minute: int = 0   # 0 = unlimited; the account's ITPM
+    llm_output_tokens_per_minute: int = 0  # 0 = unlimited; the account's OTPM
+    llm_initial_concurrency: int = 8
+    llm_min_concurrency: int = 1
+    llm_max_concurrency: int = 32
+
+    # --- LLM hedged requests (tail latency, see agents/hedging.py) ---
+    llm_hedging_enabled: bool = False
+    llm_hedge_percentile: float = 95.0   # hedge once a call outlasts this latency percentile
+    llm_hedge_min_samples: int = 20      # per role/max_tokens class before hedging starts
+    llm_hedge_budget: float = 0.05       # max hedges as a fraction of calls (extra cost cap)
+    llm_hedge_min_delay_seconds: float = 2.0
+
+    # --- LLM response cache (content-addressed, see agents/cache.py) ---
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = ".cache/llm_responses.sqlite3"
+    llm_cache_max_entries: int = 5000
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600   # 0 disables expiry
+
+    # --- Layer 0 data source (see graph/layer_0/scrapers/) ---
+    layer_0_data_source: str = "llm"             # "llm" | "snapshot"
+    layer_0_snapshot_dir: str = "data/snapshots"  # {dir}/{TICKER}/meta.json, fundamentals.*, news.json
+    layer_0_fallback_to_llm: bool = True         # synthesize tickers missing from the source
+    layer_0_stream_to_layer_1: bool = True       # start Layer 1 chunk inference during generation
+
+    # --- Layer 0 artifact cache (per ticker, see graph/layer_0/cache.py) ---
+    layer_0_cache_enabled: bool = True
+    layer_0_cache_path: str = ".cache/layer_0.sqlite3"
+    layer_0_cache_max_entries: int = 1000
+    layer_0_cache_ttl_seconds: int = 6 * 3600
+
+    # --- Layer 1 chunk inference (see agents/chunk_engine.py) ---
+    layer_1_chunk_concurrency: int = 8  # chunk calls in flight across both agents
+    layer_1_chunk_tokens: int = 700     # chunk budget (agents/chunker.split_markdown)
+    layer_1_chunks_per_call: int = 1    # >1 infers several chunks per request
+    layer_1_metrics_enabled: bool = True           # exact table metrics in F1 (graph/layer_1/metrics.py)
+    layer_1_metrics_skip_table_chunks: bool = False  # don't infer chunks that are only tables
+
+    # --- Layer 1 chunk-inference store (see graph/layer_1/store.py) ---
+    layer_1_store_enabled: bool = True
+    layer_1_store_path: str = ".cache/layer_1.sqlite3"
+    layer_1_store_max_entries: int = 20000
+    layer_1_store_ttl_seconds: int = 7 * 24 * 3600
+
+    # --- Layer 1 → Layer 2 brief (see graph/layer_1/compress.py) ---
+    layer_1_compress_enabled: bool = False
+    layer_1_brief_tokens: int = 1200            # F1 + F2 brief budget, split evenly
+    layer_1_compress_group_tokens: int = 3000   # max notes per merge call
+
+    # --- Fake LLM backend (LLM_BACKEND=fake, for offline benchmarks) ---
+    fake_llm_latency_ms: float = 800.0   # median time-to-first-token
+    fake_llm_latency_sigma: float = 0.5  # log-normal spread of the above
+    fake_llm_ms_per_token: float = 5.0   # added per output token
+    fake_llm_rate_limit_rate: float = 0.0    # fraction of calls answered with 429
+    fake_llm_server_error_rate: float = 0.0  # fraction answered with 500/529
+    fake_llm_seed: int = 0
 
     # --- Pipeline Config ---
     num_analyst_agents: int = 5
     num_negotiation_rounds: int = 3
     num_decision_makers: int = 3
     sandbox_concurrency: int = 6
+    sandbox_stream_deltas: bool = True   # stream critic/DM tokens as sandbox_delta SSE events
+    sandbox_streaming_handoff: bool = True  # negotiate each analyst's moves as soon as it returns
+    sandbox_dedup_enabled: bool = False    # debate one move per near-duplicate cluster (opt-in)
+    sandbox_dedup_threshold: float = 0.45  # TF-IDF cosine at which two moves are duplicates
+    sandbox_tournament_enabled: bool = False  # successive halving instead of full debates for all
+    sandbox_tournament_first_rounds: int = 1  # rounds every move gets before the first cut
+    sandbox_tournament_eta: int = 3           # keep the top 1/eta per rung (≥ top_k_recommendations)
+    sandbox_convergence_enabled: bool = False    # score early once the critic concedes or rounds repeat
+    sandbox_convergence_min_rounds: int = 2      # earliest round after which a debate may stop
+    sandbox_convergence_min_novelty: float = 0.25  # share of new bigrams below which a round repeats
+    sandbox_round_budget: int = 0                # max debate rounds per analysis (0 = rounds per move);
+                                                 # at least 3 × num_analyst_agents (one round per move)
+    sandbox_round_budget_max_per_move: int = 5   # most rounds the budget gives one move
     top_k_recommendations: int = 3
 
+    @model_validator(mode="after")
+    def _check_round_budget(self) -> "Settings":
+        # Every move debates one round before the budget is allocated, so a
+        # smaller budget could not be kept (each analyst proposes 3 moves)
+        moves = 3 * self.num_analyst_agents
+        if 0 < self.sandbox_round_budget < moves:
+            raise ValueError(
+                f"SANDBOX_ROUND_BUDGET={self.sandbox_round_budget} is below one round per "
+                f"move ({moves} moves from {self.num_analyst_agents} analysts); use 0 or ≥ {moves}"
+            )
+        return self
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -0,0 +1,79 @@
+"""
+Layer 0 artifact cache — synthesized data packages keyed by ticker.
+
+A hit skips both Layer 0 LLM calls (the serial head of the pipeline).
+Entries expire after LAYER_0_CACHE_TTL_SECONDS; an analysis started with
+force_refresh regenerates and overwrites its ticker's entry, and the
+admin endpoints in api/routes.py invalidate entries on demand.
+
+Stored in its own SQLite file via agents.cache.PersistentLRUCache. The
+helpers are async and run the SQLite work through asyncio.to_thread, so
+a lookup never blocks the event loop.
+
+See: docs/architecture/LLD_layer_0.md
+"""
+
+import asyncio
+import json
+import logging
+from agents.cache import PersistentLRUCache
+from config.settings import settings
+
+log = logging.getLogger("layer_0.cache")
+
+_cache: PersistentLRUCache | None = None
+
+
+def get_layer_0_cache() -> PersistentLRUCache | None:
+    """Returns the Layer 0 cache singleton, or None when LAYER_0_CACHE_ENABLED is false."""
+    global _cache
+    if not settings.layer_0_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = PersistentLRUCache(
+            path=settings.layer_0_cache_path,
+            max_entries=settings.layer_0_cache_max_entries,
+            ttl_seconds=settings.layer_0_cache_ttl_seconds,
+        )
+    return _cache
+
+
+def _key(ticker: str) -> str:
+    return ticker.strip().upper()
+
+
+async def load_layer_0(ticker: str) -> dict | None:
+    """Returns {financial_data_raw, news_data_raw} for a fresh entry, else None."""
+    cache = await asyncio.to_thread(get_layer_0_cache)
+    if cache is None:
+        return None
+    value = await asyncio.to_thread(cache.get, _key(ticker))
+    return json.loads(value) if value is not None else None
+
+
+async def store_layer_0(ticker: str, financial_data_raw: str, news_data_raw: str) -> None:
+    cache = await asyncio.to_thread(get_layer_0_cache)
+    if cache is None:
+        return
+    await asyncio.to_thread(cache.put, _key(ticker), json.dumps({
+        "financial_data_raw": financial_data_raw,
+        "news_data_raw": news_data_raw,
+    }))
+
+
+def _invalidate(cache: PersistentLRUCache, ticker: str | None) -> int:
+    if ticker is None:
+        removed = cache.stats()["size"]
+        cache.clear()
+        return removed
+    return int(cache.delete(_key(ticker)))
+
+
+async def invalidate_layer_0(ticker: str | None = None) -> int:
+    """Drops one ticker's entry (or every entry if ticker is None); returns how many."""
+    cache = await asyncio.to_thread(get_layer_0_cache)
+    if cache is None:
+        return 0
+    removed = await asyncio.to_thread(_invalidate, cache, ticker)
+    log.info("Layer 0 cache invalidated: %s (%d entries)", ticker or "ALL", removed)
+    return removed
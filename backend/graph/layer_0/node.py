@@ -6,6 +6,18 @@ realistic synthetic data in Markdown format. Two parallel LLM calls produce:
   - financial_data_raw: a ~2-page financial data package
   - news_data_raw: a ~2-page news and sentiment brief
 
+With LAYER_0_DATA_SOURCE set (graph/layer_0/scrapers/), real data is
+loaded and rendered in the same Markdown shape instead; tickers the
+source has no data for fall back to synthesis (LAYER_0_FALLBACK_TO_LLM).
+
+While synthesizing, both calls are streamed into an IncrementalChunker
+and each completed chunk's Layer 1 inference starts right away
+(LAYER_0_STREAM_TO_LAYER_1). The results go to state as
+prefetched_inferences, so Layer 1 only infers chunks that are missing.
+
+Synthesized results are cached per ticker (graph/layer_0/cache.py); a fresh entry
+skips both calls unless the analysis was started with force_refresh.
+
 See: docs/architecture/LLD_layer_0.md
 """
 
@@ -13,15 +25,91 @@ import asyncio
 import logging
 from models.state import PipelineState
 from agents.base import call_llm
+from agents.chunk_engine import get_chunk_engine
+from agents.chunker import IncrementalChunker, chunk_key, split_markdown
+from config.settings import settings
+from agents.telemetry import llm_tags
 from config.personas import (
     DATA_SYNTHESIZER_FINANCIAL_PERSONA,
     DATA_SYNTHESIZER_NEWS_PERSONA,
 )
+from graph.layer_0.cache import load_layer_0, store_layer_0
+from graph.layer_0.scrapers.registry import get_data_source
 from graph.layer_0.templates import FINANCIAL_DATA_TEMPLATE, NEWS_DATA_TEMPLATE
+from graph.layer_1.financial_inference import infer_chunk as infer_financial_chunk
+from graph.layer_1.trend_inference import infer_chunk as infer_trend_chunk
 
 log = logging.getLogger("layer_0")
 
 
+class _ChunkPrefetcher:
+    """Starts Layer 1 chunk inferences while Layer 0 is still streaming."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.tasks: dict[str, asyncio.Task] = {}
+        self._finishers = []
+
+    def on_delta(self, kind: str, infer):
+        """
+        Returns a call_llm on_delta callback feeding one document's chunker.
+        A reset (the call is retried and re-streams) starts a new chunker
+        and cancels the inferences started from the failed attempt.
+        """
+        chunker = IncrementalChunker(settings.layer_1_chunk_tokens)
+        started: list[str] = []
+
+        def _start(ready: list[tuple[int, str]]) -> None:
+            for index, chunk in ready:
+                key = chunk_key(kind, index, chunk)
+                if key not in self.tasks:
+                    self.tasks[key] = asyncio.create_task(
+                        get_chunk_engine().infer_one(infer, self.ticker, chunk, index))
+                    started.append(key)
+
+        async def _feed(text: str, *, reset: bool = False) -> None:
+            nonlocal chunker
+            if reset:
+                for key in started:
+                    self.tasks.pop(key).cancel()
+                started.clear()
+                chunker = IncrementalChunker(settings.layer_1_chunk_tokens)
+            _start(chunker.feed(text))
+
+        self._finishers.append(lambda: _start(chunker.finish()))
+        return _feed
+
+    async def collect(self, documents: dict[str, str]) -> dict[str, str]:
+        """
+        Flushes the last chunks and awaits the inferences that match the
+        final documents. Any others are cancelled; failures are left for
+        Layer 1 to redo.
+        """
+        for finish in self._finishers:
+            finish()
+        wanted = {
+            chunk_key(kind, i, chunk)
+            for kind, text in documents.items()
+            for i, chunk in enumerate(split_markdown(text, settings.layer_1_chunk_tokens))
+        }
+        for key, task in self.tasks.items():
+            if key not in wanted:
+                task.cancel()
+        keys = [k for k in self.tasks if k in wanted]
+        results = await asyncio.gather(*[self.tasks[k] for k in keys], return_exceptions=True)
+        prefetched = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                log.warning("  Prefetch of %s failed (Layer 1 will retry): %s", key, result)
+            else:
+                prefetched[key] = result
+        return prefetched
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+
 async def layer_0_synthesize(state: PipelineState) -> dict:
     """
     Layer 0 node: generates synthetic financial and news data via LLM.
@@ -29,43 +117,103 @@ async def layer_0_synthesize(state: PipelineState) -> dict:
     """
     ticker = state["company_ticker"]
     log.info("Layer 0 START — synthesizing data for %s", ticker)
+
+    source = get_data_source()
+    if source is not None:
+        try:
+            loaded = await source.load(ticker)
+        except Exception as e:
+            log.warning("  Layer 0 %s source failed for %s: %s", source.name, ticker, e)
+            loaded = None
+        if loaded is not None:
+            log.info("  Layer 0 DONE from %s source — financial=%d chars, news=%d chars",
+                     source.name, len(loaded["financial_data_raw"]), len(loaded["news_data_raw"]))
+            return {
+                **loaded,
+                "status_updates": [
+                    {"event": "layer_complete", "layer": 0, "status": "done",
+                     "source": source.name}
+                ],
+            }
+        if not settings.layer_0_fallback_to_llm:
+            raise ValueError(f"No {source.name} data for {ticker} and LLM fallback is disabled")
+        log.info("  No %s data for %s — falling back to LLM synthesis", source.name, ticker)
+
+    cached = None if state.get("force_refresh") else await load_layer_0(ticker)
+    if cached is not None:
+        log.info("  Layer 0 cache HIT for %s — financial=%d chars, news=%d chars",
+                 ticker, len(cached["financial_data_raw"]), len(cached["news_data_raw"]))
+        return {
+            **cached,
+            "status_updates": [
+                {"event": "layer_complete", "layer": 0, "status": "done", "cached": True}
+            ],
+        }
+
     log.info("  Calling LLM x2 in parallel (financial + news)...")
 
+    # The few-shot template is identical for every ticker, so it goes
+    # first as a cacheable prefix; only the short instruction varies.
+    financial_example = (
+        "Here is an example financial data package for a different company "
+        "(NovaTech Inc., NVTK):\n\n"
+        f"{FINANCIAL_DATA_TEMPLATE}"
+    )
     financial_prompt = (
         f"Generate a synthetic financial data package for the company "
         f"with ticker {ticker}.\n\n"
-        f"Here is an example for a different company (NovaTech Inc., NVTK). "
-        f"Follow the EXACT same structure, section headers, and table formats, "
-        f"but generate completely new data for {ticker}:\n\n"
-        f"{FINANCIAL_DATA_TEMPLATE}"
+        f"Follow the EXACT same structure, section headers, and table formats "
+        f"as the example above, but generate completely new data for {ticker}."
     )
 
+    news_example = (
+        "Here is an example news and sentiment brief for a different company "
+        "(NovaTech Inc., NVTK):\n\n"
+        f"{NEWS_DATA_TEMPLATE}"
+    )
     news_prompt = (
         f"Generate a synthetic news and sentiment brief for the company "
         f"with ticker {ticker}.\n\n"
-        f"Here is an example for a different company (NovaTech Inc., N reduce). "
-        f"Follow the EXACT same structure, section headers, and formatting, "
-        f"but generate completely new data for {ticker}:\n\n"
-        f"{NEWS_DATA_TEMPLATE}"
+        f"Follow the EXACT same structure, section headers, and formatting "
+        f"as the example above, but generate completely new data for {ticker}."
     )
 
-    financial_raw, news_raw = await asyncio.gather(
-        call_llm(
-            system_prompt=DATA_SYNTHESIZER_FINANCIAL_PERSONA,
-            user_prompt=financial_prompt,
-        ),
-        call_llm(
-            system_prompt=DATA_SYNTHESIZER_NEWS_PERSONA,
-            user_prompt=news_prompt,
-        ),
-    )
+    prefetcher = _ChunkPrefetcher(ticker) if settings.layer_0_stream_to_layer_1 else None
+    try:
+        with llm_tags(layer=0, node="layer_0_synthesize"):
+            financial_raw, news_raw = await asyncio.gather(
+                call_llm(
+                    system_prompt=DATA_SYNTHESIZER_FINANCIAL_PERSONA,
+                    user_prompt=financial_prompt,
+                    user_prefix=financial_example,
+                    on_delta=prefetcher and prefetcher.on_delta("financial", infer_financial_chunk),
+                ),
+                call_llm(
+                    system_prompt=DATA_SYNTHESIZER_NEWS_PERSONA,
+                    user_prompt=news_prompt,
+                    user_prefix=news_example,
+                    on_delta=prefetcher and prefetcher.on_delta("trend", infer_trend_chunk),
+                ),
+            )
+        log.info("  Layer 0 generated — financial=%d chars, news=%d chars",
+                 len(financial_raw), len(news_raw))
+
+        prefetched = {}
+        if prefetcher is not None:
+            prefetched = await prefetcher.collect({"financial": financial_raw, "trend": news_raw})
+            log.info("  Prefetched %d Layer 1 chunk inferences while streaming", len(prefetched))
+    except BaseException:
+        if prefetcher is not None:
+            prefetcher.cancel()
+        raise
 
-    log.info("  Layer 0 DONE — financial=%d chars, news=%d chars",
-             len(financial_raw), len(news_raw))
+    log.info("  Layer 0 DONE")
+    await store_layer_0(ticker, financial_raw, news_raw)
 
     return {
         "financial_data_raw": financial_raw,
         "news_data_raw": news_raw,
+        "prefetched_inferences": prefetched,
         "status_updates": [
             {"event": "layer_complete", "layer": 0, "status": "done"}
         ],
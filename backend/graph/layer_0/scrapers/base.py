@@ -0,0 +1,28 @@
+"""
+Layer 0 data-source interface.
+
+A DataSource returns the two Layer 0 artifacts for a ticker —
+financial_data_raw and news_data_raw — as Markdown in the same shape the
+LLM synthesizer produces (see graph/layer_0/templates.py), or None when
+it has nothing for that ticker (Layer 0 then falls back to the LLM).
+
+See: docs/architecture/LLD_layer_0.md
+"""
+
+from abc import ABC, abstractmethod
+from typing import TypedDict
+
+
+class Layer0Data(TypedDict):
+    financial_data_raw: str
+    news_data_raw: str
+
+
+class DataSource(ABC):
+    """Loads real (non-synthesized) Layer 0 data for a ticker."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def load(self, ticker: str) -> Layer0Data | None:
+        """Returns both Markdown documents, or None if this source has no data."""
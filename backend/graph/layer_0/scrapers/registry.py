@@ -0,0 +1,27 @@
+"""
+Selects the Layer 0 data source from settings.
+
+  LAYER_0_DATA_SOURCE=llm       — always synthesize via LLM (default)
+  LAYER_0_DATA_SOURCE=snapshot  — local snapshot store (LAYER_0_SNAPSHOT_DIR)
+
+See: docs/architecture/LLD_layer_0.md
+"""
+
+from config.settings import settings
+from graph.layer_0.scrapers.base import DataSource
+from graph.layer_0.scrapers.snapshot import SnapshotDataSource
+
+_source: DataSource | None = None
+
+
+def get_data_source() -> DataSource | None:
+    """Returns the configured DataSource, or None for LLM-only synthesis."""
+    global _source
+    if settings.layer_0_data_source == "llm":
+        return None
+    if _source is None:
+        if settings.layer_0_data_source == "snapshot":
+            _source = SnapshotDataSource(settings.layer_0_snapshot_dir)
+        else:
+            raise ValueError(f"Unknown LAYER_0_DATA_SOURCE: {settings.layer_0_data_source!r}")
+    return _source
@@ -0,0 +1,126 @@
+"""
+Markdown rendering for loaded Layer 0 data.
+
+Produces the same document shape as the synthesizer templates
+(graph/layer_0/templates.py) — title block, ``---``-separated ``##``
+sections, pipe tables — so Layer 1 chunking and the inference prompts
+see no difference between loaded and synthesized data.
+
+See: docs/architecture/LLD_layer_0.md
+"""
+
+SECTION_BREAK = "\n\n---\n\n"
+
+
+class Table:
+    """A pipe table: header row plus labelled rows, in insertion order."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.columns: list[str] = []
+        self.rows: dict[str, dict[str, str]] = {}
+
+    def set(self, row: str, column: str, value: str) -> None:
+        if column not in self.columns:
+            self.columns.append(column)
+        self.rows.setdefault(row, {})[column] = value
+
+
+def render_table(table: Table) -> str:
+    header = [table.label, *table.columns]
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "|" + "|".join("-" * (len(h) + 2) for h in header) + "|",
+    ]
+    for row, values in table.rows.items():
+        cells = [row, *(values.get(c, "") for c in table.columns)]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def render_financial(meta: dict, tables: dict[str, Table]) -> str:
+    """
+    Financial data package. ``meta["sections"]`` orders the document:
+    each section has a title and optional ``tables`` (ids into ``tables``,
+    with the first-column label), ``notes`` lines and ``bullets``.
+    """
+    parts = [
+        f"# {meta['name']} ({meta['ticker']}) — Financial Data Package\n\n"
+        f"**Sector:** {meta.get('sector', 'n/a')} | **Industry:** {meta.get('industry', 'n/a')}\n"
+        f"**Market Cap:** {meta.get('market_cap', 'n/a')} | **Report Date:** {meta.get('report_date', 'n/a')}"
+    ]
+    for section in meta.get("sections", []):
+        blocks = []
+        for ref in section.get("tables", []):
+            table = tables.get(ref["id"])
+            if table is None or not table.rows:
+                continue
+            table.label = ref.get("label", table.label)
+            blocks.append(render_table(table))
+        if section.get("notes"):
+            blocks.append("\n".join(section["notes"]))
+        if section.get("bullets"):
+            blocks.append("\n".join(f"- {b}" for b in section["bullets"]))
+        if blocks:
+            parts.append(f"## {section['title']}\n\n" + "\n\n".join(blocks))
+    return SECTION_BREAK.join(parts)
+
+
+def render_news(meta: dict, news: dict) -> str:
+    """Market & sentiment brief from a news.json document."""
+    parts = [
+        f"# {meta['name']} ({meta['ticker']}) — Market & Sentiment Brief\n\n"
+        f"**Data as of:** {news.get('as_of', meta.get('report_date', 'n/a'))}"
+    ]
+
+    articles = news.get("articles", [])
+    if articles:
+        items = [
+            f"### {i}. {a['title']}\n"
+            f"**Source:** {a.get('source', 'n/a')} | **Date:** {a.get('date', 'n/a')} "
+            f"| **Sentiment:** {a.get('sentiment', 'n/a')}\n\n{a.get('summary', '')}".rstrip()
+            for i, a in enumerate(articles, 1)
+        ]
+        parts.append("## Recent News Coverage\n\n" + "\n\n".join(items))
+
+    threads = news.get("social", [])
+    if threads:
+        items = []
+        for t in threads:
+            comments = "\n\n".join(f'> "{c}"' for c in t.get("comments", []))
+            items.append(
+                f"### r/{t['subreddit']} — \"{t['title']}\"\n"
+                f"**Date:** {t.get('date', 'n/a')} | **Score:** {t.get('score', 0)} upvotes\n\n"
+                f"Top comments:\n{comments}"
+            )
+        parts.append("## Reddit / Social Sentiment\n\n" + "\n\n".join(items))
+
+    markets = news.get("prediction_markets", [])
+    if markets:
+        table = Table("Event")
+        for m in markets:
+            table.set(m["event"], "Probability", f"**{m['probability']}**")
+            table.set(m["event"], "Volume", m.get("volume", ""))
+        parts.append("## Prediction Market Signals (Polymarket)\n\n" + render_table(table))
+
+    competitors = news.get("competitors", [])
+    if competitors:
+        items = [
+            f"### {c['name']}\n" + "\n".join(f"- {b}" for b in c.get("bullets", []))
+            for c in competitors
+        ]
+        parts.append("## Competitor Activity\n\n" + "\n\n".join(items))
+
+    ratings = news.get("analyst_ratings", [])
+    if ratings:
+        table = Table("Firm")
+        for r in ratings:
+            table.set(r["firm"], "Rating", r.get("rating", ""))
+            table.set(r["firm"], "Target Price", r.get("target", ""))
+            table.set(r["firm"], "Date", r.get("date", ""))
+        block = render_table(table)
+        if news.get("analyst_summary"):
+            block += f"\n\n{news['analyst_summary']}"
+        parts.append("## Analyst Ratings\n\n" + block)
+
+    return SECTION_BREAK.join(parts)
@@ -0,0 +1,118 @@
+"""
+Snapshot data source — Layer 0 data from a local, pre-staged store.
+
+A nightly job stages one directory per ticker under
+LAYER_0_SNAPSHOT_DIR; request-time Layer 0 then renders Markdown from it
+in milliseconds instead of two LLM calls:
+
+  {snapshot_dir}/{TICKER}/
+    meta.json                   company header + section layout (see render.py)
+    fundamentals.parquet        long-format table: table, row, column, value
+      (or fundamentals.csv)     ... same columns, when pyarrow is unavailable
+    news.json                   articles, social, prediction_markets,
+                                competitors, analyst_ratings
+
+Parquet files are read through a memory map (pyarrow, optional), only
+the four string columns are materialized, and the OS page cache keeps
+hot tickers resident across requests.
+
+Tickers that are not plain symbols (TICKER_PATTERN), or whose directory
+resolves outside the snapshot root, are treated as missing.
+
+See: docs/architecture/LLD_layer_0.md
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+from graph.layer_0.scrapers.base import DataSource, Layer0Data
+from graph.layer_0.scrapers.render import Table, render_financial, render_news
+from models.schemas import TICKER_PATTERN
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional — CSV snapshots still work
+    pq = None
+
+log = logging.getLogger("layer_0.snapshot")
+
+FUNDAMENTALS_COLUMNS = ["table", "row", "column", "value"]
+
+
+def _read_parquet(path: str) -> list[tuple[str, str, str, str]]:
+    table = pq.read_table(path, columns=FUNDAMENTALS_COLUMNS, memory_map=True)
+    columns = [table.column(name).to_pylist() for name in FUNDAMENTALS_COLUMNS]
+    return [tuple("" if v is None else str(v) for v in row) for row in zip(*columns)]
+
+
+def _read_csv(path: str) -> list[tuple[str, str, str, str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [tuple(r[c] for c in FUNDAMENTALS_COLUMNS) for r in csv.DictReader(f)]
+
+
+class SnapshotDataSource(DataSource):
+    """Reads pre-staged per-ticker snapshots from a directory tree."""
+
+    name = "snapshot"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _fundamentals(self, directory: str) -> dict[str, Table] | None:
+        parquet_path = os.path.join(directory, "fundamentals.parquet")
+        csv_path = os.path.join(directory, "fundamentals.csv")
+        if os.path.exists(parquet_path) and pq is not None:
+            rows = _read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
+            rows = _read_csv(csv_path)
+        else:
+            if os.path.exists(parquet_path):
+                log.warning("%s needs pyarrow (pip install pyarrow)", parquet_path)
+            return None
+
+        tables: dict[str, Table] = {}
+        for table_id, row, column, value in rows:
+            tables.setdefault(table_id, Table()).set(row, column, value)
+        return tables
+
+    def _directory(self, ticker: str) -> str | None:
+        """The ticker's snapshot directory, or None if it would leave the root."""
+        if not TICKER_PATTERN.match(ticker):
+            log.warning("Refusing snapshot lookup for ticker %r", ticker)
+            return None
+        root = os.path.realpath(self.root)
+        directory = os.path.realpath(os.path.join(root, ticker))
+        if os.path.dirname(directory) != root:
+            log.warning("Snapshot path for %r resolves outside %s", ticker, root)
+            return None
+        return directory
+
+    def _load_sync(self, ticker: str) -> Layer0Data | None:
+        ticker = ticker.strip().upper()
+        directory = self._directory(ticker)
+        if directory is None:
+            return None
+        meta_path = os.path.join(directory, "meta.json")
+        news_path = os.path.join(directory, "news.json")
+        if not (os.path.exists(meta_path) and os.path.exists(news_path)):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(news_path, encoding="utf-8") as f:
+            news = json.load(f)
+        tables = self._fundamentals(directory)
+        if tables is None:
+            return None
+
+        meta.setdefault("ticker", ticker)
+        return {
+            "financial_data_raw": render_financial(meta, tables),
+            "news_data_raw": render_news(meta, news),
+        }
+
+    async def load(self, ticker: str) -> Layer0Data | None:
+        # File reads are off the event loop so concurrent analyses don't stall.
+        return await asyncio.to_thread(self._load_sync, ticker)
@@ -0,0 +1,112 @@
+"""
+F1/F2 compression — merges chunk inferences into a bounded brief.
+
+F1 and F2 are every chunk inference joined with ``---``, and each of
+the Layer 2 analysts receives both in full. With
+LAYER_1_COMPRESS_ENABLED, layer_1_reduce condenses each document that
+exceeds its share of LAYER_1_BRIEF_TOKENS into a structured brief:
+
+  1. pieces = the chunk inferences
+  2. while they don't fit in one merge call (LAYER_1_COMPRESS_GROUP_TOKENS),
+     condense groups of pieces in parallel, each to its proportional
+     share of the budget (one level of the hierarchy)
+  3. merge what is left into the final brief, capped at the budget
+
+The full F1/F2 stay in state (and in /api/results); Layer 2 reads the
+briefs when present.
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import asyncio
+import logging
+from agents.base import call_llm
+from agents.chunker import estimate_tokens
+from agents.telemetry import llm_tags
+from config.personas import INFERENCE_COMPRESSION_PERSONA
+from config.settings import settings
+
+log = logging.getLogger("layer_1.compress")
+
+SECTION_SEPARATOR = "\n\n---\n\n"
+# Each merge must at least halve its input, so the hierarchy always converges
+MIN_GROUP_PIECES = 2
+
+_SUBJECTS = {"financial": "financial data", "trend": "market trends and sentiment"}
+
+
+def split_inference_document(document: str) -> tuple[str, list[str]]:
+    """Splits an F1/F2 document into its header line and chunk inferences."""
+    header, _, body = document.strip().partition("\n")
+    pieces = [p.strip() for p in body.strip().split(SECTION_SEPARATOR) if p.strip()]
+    return header, pieces
+
+
+def _groups(pieces: list[str], max_tokens: int) -> list[list[str]]:
+    groups: list[list[str]] = [[]]
+    size = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if len(groups[-1]) >= MIN_GROUP_PIECES and size + tokens > max_tokens:
+            groups.append([])
+            size = 0
+        groups[-1].append(piece)
+        size += tokens
+    if len(groups) > 1 and len(groups[-1]) < MIN_GROUP_PIECES:
+        groups[-2].extend(groups.pop())
+    return groups
+
+
+async def _merge(kind: str, ticker: str, pieces: list[str], budget: int, final: bool) -> str:
+    words = max(50, int(budget * 0.75))
+    notes = SECTION_SEPARATOR.join(pieces)
+    if final:
+        instruction = (
+            f"Merge these {len(pieces)} notes on {ticker}'s {_SUBJECTS[kind]} into one "
+            f"structured brief of at most {words} words, using exactly these sections:\n"
+            f"## Key Facts — bullets with the exact figures, dates and sources\n"
+            f"## Trends — what is improving or deteriorating, and how fast\n"
+            f"## Risks & Open Questions"
+        )
+    else:
+        instruction = (
+            f"Condense these {len(pieces)} notes on {ticker}'s {_SUBJECTS[kind]} into "
+            f"at most {words} words of dense bullet points."
+        )
+    with llm_tags(layer=1, node="layer_1_compress"):
+        return (await call_llm(
+            system_prompt=INFERENCE_COMPRESSION_PERSONA,
+            user_prompt=f"{instruction}\n\nNotes:\n\n{notes}",
+            max_tokens=budget,
+        )).strip()
+
+
+async def compress_inference(kind: str, ticker: str, document: str, budget: int) -> str:
+    """
+    Returns a brief of at most ~budget tokens for an F1/F2 document, or
+    the document itself when it already fits.
+    """
+    header, pieces = split_inference_document(document)
+    total = sum(estimate_tokens(p) for p in pieces)
+    if total <= budget:
+        return document
+
+    level = 0
+    group_tokens = settings.layer_1_compress_group_tokens
+    while len(pieces) > MIN_GROUP_PIECES and total > group_tokens:
+        groups = _groups(pieces, group_tokens)
+        if len(groups) == 1:
+            break
+        level += 1
+        targets = [max(64, budget * sum(estimate_tokens(p) for p in g) // total) for g in groups]
+        pieces = list(await asyncio.gather(*[
+            _merge(kind, ticker, g, target, final=False) for g, target in zip(groups, targets)
+        ]))
+        log.info("  [%s] level %d: %d groups → %d tokens",
+                 kind, level, len(groups), sum(estimate_tokens(p) for p in pieces))
+        total = sum(estimate_tokens(p) for p in pieces)
+
+    brief = await _merge(kind, ticker, pieces, budget, final=True)
+    log.info("  [%s] brief %d → %d tokens (%d levels)",
+             kind, estimate_tokens(document), estimate_tokens(brief), level + 1)
+    return f"{header} (brief)\n\n{brief}\n"
@@ -1,33 +1,60 @@
 """
 Financial inference agent — produces F1 (Financial Inference Markdown).
 
-Splits the raw financial data into ~20-line chunks, processes pairs of
-chunks in parallel, and appends all short inferences to build F1.
+Splits the raw financial data into structure-aware, token-budgeted chunks
+(agents/chunker.py), runs them through the shared chunk engine
+(agents/chunk_engine.py), and appends all short inferences to build F1.
 
 See: docs/architecture/LLD_layer_1.md
 """
 
-import asyncio
 import logging
 from agents.base import call_llm
-from agents.chunker import split_into_chunks
+from agents.chunk_engine import format_sections, get_chunk_engine, parse_sections, section_marker
+from agents.chunker import chunk_key, split_markdown
+from agents.routing import max_tokens_for
+from agents.telemetry import llm_tags
+from config.settings import settings
+from graph.layer_1.metrics import compute_metrics, is_table_only, render_metrics
+from graph.layer_1.store import InferenceWriter, load_inferences
 from config.personas import FINANCIAL_CHUNK_INFERENCE_PERSONA
 
 log = logging.getLogger("layer_1.financial")
 
 
-async def _infer_chunk(ticker: str, chunk: str, chunk_index: int) -> str:
+async def infer_chunk(ticker: str, chunk: str, chunk_index: int) -> str:
     """Generates a short inference for a single chunk of financial data."""
     prompt = (
         f"Here is section {chunk_index + 1} of the financial data for {ticker}. "
         f"Provide a concise inference (3-5 sentences) analyzing what this "
         f"section reveals:\n\n{chunk}"
     )
-    return await call_llm(
-        system_prompt=FINANCIAL_CHUNK_INFERENCE_PERSONA,
-        user_prompt=prompt,
-        max_tokens=512,
+    with llm_tags(layer=1, node="financial_inference"):
+        return await call_llm(
+            system_prompt=FINANCIAL_CHUNK_INFERENCE_PERSONA,
+            user_prompt=prompt,
+        )
+
+
+async def infer_chunks(ticker: str, items: list[tuple[int, str]]) -> dict[int, str]:
+    """
+    Generates inferences for several chunks in one call (LAYER_1_CHUNKS_PER_CALL).
+    Returns the sections that parsed; the engine re-asks the rest one by one.
+    """
+    prompt = (
+        f"Here are {len(items)} sections of the financial data for {ticker}. "
+        f"Provide one concise inference per section (3-5 sentences each) "
+        f"analyzing what that section reveals. Begin each inference with its "
+        f"section's marker line exactly as given (e.g. {section_marker(items[0][0])}) "
+        f"and write nothing else.\n\n{format_sections(items)}"
     )
+    with llm_tags(layer=1, node="financial_inference"):
+        text = await call_llm(
+            system_prompt=FINANCIAL_CHUNK_INFERENCE_PERSONA,
+            user_prompt=prompt,
+            max_tokens=max_tokens_for("financial_inference") * len(items),
+        )
+    return parse_sections(text, [index for index, _ in items])
 
 
 async def financial_inference_agent(state: dict) -> dict:
@@ -36,31 +63,49 @@ async def financial_inference_agent(state: dict) -> dict:
     Called via Send from dispatch_layer_1.
 
     Strategy:
-    1. Split raw_data into ~20-line chunks
-    2. Process chunks in pairs (2 at a time via asyncio.gather)
-    3. Append all inferences in order with section separators
+    1. Split raw_data into token-budgeted chunks along its Markdown structure
+    2. Reuse inferences Layer 0 prefetched while streaming (state["prefetched"])
+       and those stored for unchanged chunks by earlier runs (graph/layer_1/store.py)
+    3. Compute exact table metrics (graph/layer_1/metrics.py); optionally skip
+       table-only chunks they cover
+    4. Run the remaining chunks through the shared engine (bounded concurrency,
+       LAYER_1_CHUNKS_PER_CALL chunks per request)
+    5. Append the metrics and all inferences in order with section separators
     """
     ticker = state["ticker"]
     raw_data = state["raw_data"]
 
-    chunks = split_into_chunks(raw_data, chunk_size=20)
+    chunks = split_markdown(raw_data, settings.layer_1_chunk_tokens)
     log.info("Financial inference START — %d chunks from %d chars", len(chunks), len(raw_data))
-    inferences: list[str] = []
-
-    # Process chunks in pairs — 2 parallel LLM calls at a time
-    for i in range(0, len(chunks), 2):
-        tasks = [_infer_chunk(ticker, chunks[i], i)]
-        if i + 1 < len(chunks):
-            tasks.append(_infer_chunk(ticker, chunks[i + 1], i + 1))
+    reusable = dict(state.get("prefetched", {}))
+    stored = {}
+    if not state.get("force_refresh"):
+        stored = await load_inferences("financial", FINANCIAL_CHUNK_INFERENCE_PERSONA, ticker, chunks)
+        if stored:
+            log.info("  %d/%d chunks unchanged since a previous run", len(stored), len(chunks))
+        reusable.update(stored)
+    metrics = ""
+    if settings.layer_1_metrics_enabled:
+        computed = compute_metrics(raw_data)
+        metrics = render_metrics(computed)
+        log.info("  Computed metrics for %d tables", len(computed))
+        if computed and settings.layer_1_metrics_skip_table_chunks:
+            # Table-only chunks would just restate numbers the metrics cover
+            for i, chunk in enumerate(chunks):
+                if is_table_only(chunk):
+                    reusable[chunk_key("financial", i, chunk)] = ""
 
-        results = await asyncio.gather(*tasks)
-        inferences.extend(results)
-        processed = min(i + 2, len(chunks))
-        log.info("  Chunk pair %d done (%d/%d chunks processed)", (i // 2) + 1, processed, len(chunks))
+    writer = InferenceWriter("financial", FINANCIAL_CHUNK_INFERENCE_PERSONA, ticker, stored)
+    inferences = await get_chunk_engine().run(
+        "financial", ticker, chunks, infer_chunk, reusable,
+        infer_many=infer_chunks,
+        on_result=writer,
+    )
+    await writer.flush()
 
     # Assemble F1 document
     header = f"# Financial Inference — {ticker}\n"
-    body = "\n\n---\n\n".join(inferences)
+    body = "\n\n---\n\n".join(p for p in [metrics, *inferences] if p)
     f1 = f"{header}\n{body}\n"
 
     log.info("Financial inference DONE — F1=%d chars", len(f1))
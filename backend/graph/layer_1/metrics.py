@@ -0,0 +1,229 @@
+"""
+Deterministic financial metrics — exact numbers for F1 without an LLM.
+
+Parses the pipe tables of financial_data_raw (utils/documents.py) and
+computes, with vectorized NumPy over each table's value matrix:
+
+  - growth       period-over-period and first→last change of every series
+                 (percentage points for series already in %)
+  - mix shift    each row's share of the column total, and how the share
+                 moved between the first and last period ("by ..." tables)
+  - margins      profit / cost / income rows over Revenue per period, and
+                 the margin change first→last
+  - benchmarks   value vs a sector / peer average column
+  - anomalies    period moves at least twice the series' median move
+
+Tables are recognized by shape (quarters as columns, or dates/quarters
+as rows), not by name, so any Layer 0 source with the same Markdown
+layout works. The facts are injected into F1 as a "Computed Metrics"
+section; with LAYER_1_METRICS_SKIP_TABLE_CHUNKS, chunks that are nothing
+but tables are not sent to the LLM at all.
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import logging
+import re
+import numpy as np
+from utils.documents import MarkdownTable, parse_markdown_tables
+
+log = logging.getLogger("layer_1.metrics")
+
+_QUARTER = re.compile(r"^Q[1-4]\s+\d{4}$")
+_DATE = re.compile(r"^[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4}$")
+_MIX_TITLE = re.compile(r"\bby\b|\bmix\b|breakdown", re.IGNORECASE)
+_MARGIN_ROW = re.compile(r"profit|income|expense|cost|cash flow", re.IGNORECASE)
+_BENCHMARK_COLUMN = re.compile(r"avg|average|sector|peer|benchmark", re.IGNORECASE)
+_TOTAL_ROW = re.compile(r"^total\b", re.IGNORECASE)
+
+# A move is an anomaly when it is this many times the median move …
+ANOMALY_RATIO = 2.0
+# … and at least this large (% growth, or pp for % series)
+ANOMALY_MIN_CHANGE = 5.0
+# Benchmark gaps smaller than this (relative %) are not reported
+BENCHMARK_MIN_GAP = 10.0
+
+
+def _fmt(value: float, unit: str) -> str:
+    if unit == "$":
+        sign = "-" if value < 0 else ""
+        v = abs(value)
+        if v >= 1e9:
+            return f"{sign}${v / 1e9:,.2f}B"
+        if v >= 1e6:
+            return f"{sign}${v / 1e6:,.0f}M"
+        if v >= 1e3:
+            return f"{sign}${v / 1e3:,.0f}K"
+        return f"{sign}${v:,.2f}"
+    if unit == "%":
+        return f"{value:.1f}%"
+    if unit == "x":
+        return f"{value:.2f}x"
+    if abs(value) >= 1e6:
+        return f"{value / 1e6:,.1f}M"
+    return f"{value:,.4g}"
+
+
+def _pct(value: float) -> str:
+    return f"{value:+.1f}%"
+
+
+def _pp(value: float) -> str:
+    return f"{value:+.1f}pp"
+
+
+def _series(table: MarkdownTable) -> tuple[list[str], list[str], np.ndarray, list[str]] | None:
+    """
+    (series labels, period labels, values [series × periods], units) for
+    tables with a time axis, or None. Quarters as columns win over dated
+    rows; other period columns (e.g. FY totals) are left out.
+    """
+    quarter_cols = [j for j, c in enumerate(table.columns) if _QUARTER.match(c)]
+    if len(quarter_cols) >= 2:
+        values = table.values[:, quarter_cols]
+        units = []
+        for i in range(len(table.row_labels)):
+            found = [table.cell_units[i][j] for j in quarter_cols if not np.isnan(table.values[i, j])]
+            units.append(max(found, key=found.count) if found else "")
+        return table.row_labels, [table.columns[j] for j in quarter_cols], values, units
+
+    period_rows = [i for i, r in enumerate(table.row_labels) if _QUARTER.match(r) or _DATE.match(r)]
+    if len(period_rows) >= 2:
+        cols = table.numeric_columns()
+        values = table.values[np.ix_(period_rows, cols)].T
+        return ([table.columns[j] for j in cols], [table.row_labels[i] for i in period_rows],
+                values, [table.units[j] for j in cols])
+    return None
+
+
+def _growth_facts(labels, periods, values, units) -> list[str]:
+    facts = []
+    pct_series = np.array([u == "%" for u in units])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio_steps = (values[:, 1:] / values[:, :-1] - 1) * 100
+        ratio_total = (values[:, -1] / values[:, 0] - 1) * 100
+        ratio_steps[values[:, :-1] <= 0] = np.nan
+        ratio_total[values[:, 0] <= 0] = np.nan
+    pp_steps = np.diff(values, axis=1)
+    steps = np.where(pct_series[:, None], pp_steps, ratio_steps)
+    total = np.where(pct_series, values[:, -1] - values[:, 0], ratio_total)
+
+    magnitude = np.abs(steps)
+    # nanmedian warns (a Python warning, not a float error) on all-NaN rows
+    measured = ~np.all(np.isnan(magnitude), axis=1)
+    median = np.full(len(magnitude), np.nan)
+    if measured.any():
+        median[measured] = np.nanmedian(magnitude[measured], axis=1)
+    anomalies = (magnitude >= ANOMALY_RATIO * median[:, None]) & (magnitude >= ANOMALY_MIN_CHANGE)
+    anomalies &= (steps.shape[1] >= 3)
+
+    for i, label in enumerate(labels):
+        if np.isnan(total[i]):
+            continue
+        fmt_step = _pp if pct_series[i] else _pct
+        path = ", ".join("n/m" if np.isnan(s) else fmt_step(s) for s in steps[i])
+        facts.append(
+            f"{label}: {_fmt(values[i, 0], units[i])} ({periods[0]}) → "
+            f"{_fmt(values[i, -1], units[i])} ({periods[-1]}), {fmt_step(total[i])} overall"
+            + (f"; per period {path}" if steps.shape[1] > 1 else "")
+        )
+        for j in np.flatnonzero(anomalies[i]):
+            facts.append(f"Anomaly — {label} moved {fmt_step(steps[i, j])} "
+                         f"from {periods[j]} to {periods[j + 1]}, "
+                         f"{magnitude[i, j] / median[i]:.1f}× its median move")
+    return facts
+
+
+def _margin_facts(labels, periods, values, units) -> list[str]:
+    revenue = [i for i, label in enumerate(labels) if label.lower() in ("revenue", "total revenue")]
+    if not revenue:
+        return []
+    rows = [i for i, label in enumerate(labels)
+            if i != revenue[0] and units[i] == "$" and _MARGIN_ROW.search(label)]
+    if not rows:
+        return []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margins = values[rows] / values[revenue[0]] * 100  # broadcast over periods
+    delta = margins[:, -1] - margins[:, 0]
+    return [
+        f"{labels[i]} / Revenue: {margins[k, 0]:.1f}% ({periods[0]}) → "
+        f"{margins[k, -1]:.1f}% ({periods[-1]}), {_pp(delta[k])}"
+        for k, i in enumerate(rows) if not np.isnan(delta[k])
+    ]
+
+
+def _mix_facts(table: MarkdownTable, series) -> list[str]:
+    if not _MIX_TITLE.search(table.title):
+        return []
+    keep = [i for i, r in enumerate(table.row_labels) if not _TOTAL_ROW.match(r)]
+    if series is not None:
+        labels, periods, values, units = series
+        values = values[keep]
+    else:
+        money = [j for j in table.numeric_columns() if table.units[j] in ("$", "")]
+        if not money:
+            return []
+        labels, periods = table.row_labels, [table.columns[money[0]]]
+        values = table.values[keep][:, [money[0]]]
+    labels = [labels[i] for i in keep]
+    if np.isnan(values).any() or (values < 0).any():
+        return []
+    shares = values / values.sum(axis=0) * 100
+    shift = shares[:, -1] - shares[:, 0]
+    facts = []
+    for i, label in enumerate(labels):
+        if len(periods) > 1:
+            facts.append(f"{label} share: {shares[i, 0]:.1f}% ({periods[0]}) → "
+                         f"{shares[i, -1]:.1f}% ({periods[-1]}), {_pp(shift[i])}")
+        else:
+            facts.append(f"{label} share of total: {shares[i, 0]:.1f}%")
+    return facts
+
+
+def _benchmark_facts(table: MarkdownTable) -> list[str]:
+    numeric = table.numeric_columns()
+    bench = [j for j in numeric if _BENCHMARK_COLUMN.search(table.columns[j])]
+    own = [j for j in numeric if j not in bench]
+    if not bench or not own:
+        return []
+    value, reference = table.values[:, own[0]], table.values[:, bench[0]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = (value - reference) / np.abs(reference) * 100
+    facts = []
+    for i in np.flatnonzero(np.abs(gap) >= BENCHMARK_MIN_GAP):
+        unit = table.cell_units[i][own[0]]
+        facts.append(f"{table.row_labels[i]}: {_fmt(value[i], unit)} vs "
+                     f"{_fmt(reference[i], unit)} {table.columns[bench[0]].lower()} ({_pct(gap[i])})")
+    return facts
+
+
+def compute_metrics(financial_data: str) -> dict[str, list[str]]:
+    """Facts per table title, for every table that yields any."""
+    results: dict[str, list[str]] = {}
+    for table in parse_markdown_tables(financial_data):
+        if not table.row_labels or not table.numeric_columns():
+            continue
+        series = _series(table)
+        facts = _mix_facts(table, series)
+        if series is not None:
+            facts = _growth_facts(*series) + _margin_facts(*series) + facts
+        facts += _benchmark_facts(table)
+        if facts:
+            results.setdefault(table.title or table.label, []).extend(facts)
+    return results
+
+
+def render_metrics(metrics: dict[str, list[str]]) -> str:
+    """The F1 "Computed Metrics" section ("" when nothing was computed)."""
+    if not metrics:
+        return ""
+    blocks = [f"**{title}**\n" + "\n".join(f"- {fact}" for fact in facts)
+              for title, facts in metrics.items()]
+    return "## Computed Metrics (exact, from the data tables)\n\n" + "\n\n".join(blocks)
+
+
+def is_table_only(chunk: str) -> bool:
+    """True when a chunk holds tables and headings only, no prose."""
+    lines = [line.strip() for line in chunk.split("\n") if line.strip()]
+    has_table = any(line.startswith("|") for line in lines)
+    return has_table and all(line.startswith(("|", "#")) for line in lines)
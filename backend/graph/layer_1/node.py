@@ -17,10 +17,14 @@ def dispatch_layer_1(state: dict) -> list[Send]:
             "agent_type": "financial",
             "raw_data": state["financial_data_raw"],
             "ticker": state["company_ticker"],
+            "prefetched": state.get("prefetched_inferences", {}),
+            "force_refresh": state.get("force_refresh", False),
         }),
         Send("trend_inference_agent", {
             "agent_type": "trend",
             "raw_data": state["news_data_raw"],
             "ticker": state["company_ticker"],
+            "prefetched": state.get("prefetched_inferences", {}),
+            "force_refresh": state.get("force_refresh", False),
         }),
     ]
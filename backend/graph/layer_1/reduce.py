@@ -1,23 +1,50 @@
 """
 Layer 1 reduce node — collects F1 + F2 into parent state.
 
+With LAYER_1_COMPRESS_ENABLED it also condenses F1 and F2 into bounded
+briefs for the Layer 2 fan-out (graph/layer_1/compress.py).
+
 See: docs/architecture/LLD_layer_1.md § 4.3
 """
 
+import asyncio
 import logging
+from agents.chunker import estimate_tokens
+from config.settings import settings
+from graph.layer_1.compress import compress_inference
 
 log = logging.getLogger("layer_1.reduce")
 
 
-def layer_1_reduce(state: dict) -> dict:
+async def layer_1_reduce(state: dict) -> dict:
     """
     After both inference agents complete, emits layer_complete event.
     F1 and F2 are already written to state by the agent nodes.
     """
-    log.info("Layer 1 REDUCE — both inference agents done, dispatching layer 2")
-    return {
-        "status_updates": [
-            {"event": "layer_complete", "layer": 1, "status": "done",
+    event = {"event": "layer_complete", "layer": 1, "status": "done",
              "artifacts": ["F1", "F2"]}
-        ],
+    if not settings.layer_1_compress_enabled:
+        log.info("Layer 1 REDUCE — both inference agents done, dispatching layer 2")
+        return {"status_updates": [event]}
+
+    ticker = state["company_ticker"]
+    budget = settings.layer_1_brief_tokens // 2
+    try:
+        f1_brief, f2_brief = await asyncio.gather(
+            compress_inference("financial", ticker, state["f1_financial_inference"], budget),
+            compress_inference("trend", ticker, state["f2_trend_inference"], budget),
+        )
+    except Exception as e:
+        # The full documents still work for Layer 2, just at a higher token cost
+        log.warning("Layer 1 REDUCE — compression failed, sending full F1/F2: %s", e)
+        return {"status_updates": [event]}
+
+    brief_tokens = estimate_tokens(f1_brief) + estimate_tokens(f2_brief)
+    log.info("Layer 1 REDUCE — briefs %d tokens (F1+F2 %d), dispatching layer 2", brief_tokens,
+             estimate_tokens(state["f1_financial_inference"]) + estimate_tokens(state["f2_trend_inference"]))
+    event["brief_tokens"] = brief_tokens
+    return {
+        "f1_brief": f1_brief,
+        "f2_brief": f2_brief,
+        "status_updates": [event],
     }
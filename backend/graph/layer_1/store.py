@@ -0,0 +1,100 @@
+"""
+Layer 1 chunk-inference store — per-chunk inferences keyed by
+(persona, ticker, chunk content hash).
+
+Daily re-runs mostly see unchanged sections; their inferences are
+reused from here, so only new or edited chunks reach the LLM and F1/F2
+are reassembled from stored and fresh pieces in document order. Keys
+ignore the chunk's position, so sections that merely moved still hit;
+editing a persona prompt changes its digest and invalidates its entries,
+and so does routing the agent to another model (agents/routing.py).
+
+Stored in its own SQLite file via agents.cache.PersistentLRUCache.
+An analysis started with force_refresh skips lookups but still writes.
+Lookups for a document are one asyncio.to_thread call; new or changed
+inferences are queued while the chunks run and written in one
+transaction afterwards (entries reused from the store are not written
+back).
+
+See: docs/architecture/LLD_layer_1.md
+"""
+
+import asyncio
+import hashlib
+import logging
+from agents.cache import PersistentLRUCache
+from agents.chunker import chunk_key
+from agents.routing import model_for
+from config.settings import settings
+
+log = logging.getLogger("layer_1.store")
+
+_store: PersistentLRUCache | None = None
+
+
+def get_chunk_store() -> PersistentLRUCache | None:
+    """Returns the store singleton, or None when LAYER_1_STORE_ENABLED is false."""
+    global _store
+    if not settings.layer_1_store_enabled:
+        return None
+    if _store is None:
+        _store = PersistentLRUCache(
+            path=settings.layer_1_store_path,
+            max_entries=settings.layer_1_store_max_entries,
+            ttl_seconds=settings.layer_1_store_ttl_seconds,
+        )
+    return _store
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def inference_key(persona: str, model: str, ticker: str, chunk: str) -> str:
+    return f"{_digest(persona)}:{model}:{ticker.strip().upper()}:{_digest(chunk)}"
+
+
+def _model(kind: str) -> str:
+    """The model the kind's agent is routed to (role = its telemetry node)."""
+    return model_for(f"{kind}_inference")
+
+
+async def load_inferences(kind: str, persona: str, ticker: str, chunks: list[str]) -> dict[str, str]:
+    """Stored inferences for these chunks, keyed by chunk_key(kind, index, chunk)."""
+    store = await asyncio.to_thread(get_chunk_store)
+    if store is None:
+        return {}
+    model = _model(kind)
+    keys = [inference_key(persona, model, ticker, chunk) for chunk in chunks]
+    values = await asyncio.to_thread(store.get_many, keys)
+    return {chunk_key(kind, i, chunk): values[key]
+            for i, (chunk, key) in enumerate(zip(chunks, keys)) if key in values}
+
+
+class InferenceWriter:
+    """
+    ChunkEngine on_result callback: queues each non-empty inference that
+    is not already stored (stored = load_inferences(...) for this run);
+    flush() writes the queue in one transaction.
+    """
+
+    def __init__(self, kind: str, persona: str, ticker: str, stored: dict[str, str]):
+        self.kind = kind
+        self.persona = persona
+        self.ticker = ticker
+        self.stored = stored
+        self.model = _model(kind)
+        self._pending: dict[str, str] = {}
+
+    def __call__(self, index: int, chunk: str, inference: str) -> None:
+        if inference and self.stored.get(chunk_key(self.kind, index, chunk)) != inference:
+            self._pending[inference_key(self.persona, self.model, self.ticker, chunk)] = inference
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        store = await asyncio.to_thread(get_chunk_store)
+        if store is not None:
+            await asyncio.to_thread(store.put_many, pending)
+            log.info("Stored %d new %s chunk inferences", len(pending), self.kind)
@@ -1,33 +1,59 @@
 """
 Trend inference agent — produces F2 (Trend Inference Markdown).
 
-Splits the raw news/sentiment data into ~20-line chunks, processes pairs of
-chunks in parallel, and appends all short inferences to build F2.
+Splits the raw news/sentiment data into structure-aware, token-budgeted chunks
+(agents/chunker.py), runs them through the shared chunk engine
+(agents/chunk_engine.py), and appends all short inferences to build F2.
 
 See: docs/architecture/LLD_layer_1.md
 """
 
-import asyncio
 import logging
 from agents.base import call_llm
-from agents.chunker import split_into_chunks
+from agents.chunk_engine import format_sections, get_chunk_engine, parse_sections, section_marker
+from agents.chunker import split_markdown
+from agents.routing import max_tokens_for
+from agents.telemetry import llm_tags
+from config.settings import settings
+from graph.layer_1.store import InferenceWriter, load_inferences
 from config.personas import TREND_CHUNK_INFERENCE_PERSONA
 
 log = logging.getLogger("layer_1.trend")
 
 
-async def _infer_chunk(ticker: str, chunk: str, chunk_index: int) -> str:
+async def infer_chunk(ticker: str, chunk: str, chunk_index: int) -> str:
     """Generates a short inference for a single chunk of news/sentiment data."""
     prompt = (
         f"Here is section {chunk_index + 1} of the news and sentiment data "
         f"for {ticker}. Provide a concise inference (3-5 sentences) analyzing "
         f"what this section reveals:\n\n{chunk}"
     )
-    return await call_llm(
-        system_prompt=TREND_CHUNK_INFERENCE_PERSONA,
-        user_prompt=prompt,
-        max_tokens=512,
+    with llm_tags(layer=1, node="trend_inference"):
+        return await call_llm(
+            system_prompt=TREND_CHUNK_INFERENCE_PERSONA,
+            user_prompt=prompt,
+        )
+
+
+async def infer_chunks(ticker: str, items: list[tuple[int, str]]) -> dict[int, str]:
+    """
+    Generates inferences for several chunks in one call (LAYER_1_CHUNKS_PER_CALL).
+    Returns the sections that parsed; the engine re-asks the rest one by one.
+    """
+    prompt = (
+        f"Here are {len(items)} sections of the news and sentiment data for {ticker}. "
+        f"Provide one concise inference per section (3-5 sentences each) "
+        f"analyzing what that section reveals. Begin each inference with its "
+        f"section's marker line exactly as given (e.g. {section_marker(items[0][0])}) "
+        f"and write nothing else.\n\n{format_sections(items)}"
     )
+    with llm_tags(layer=1, node="trend_inference"):
+        text = await call_llm(
+            system_prompt=TREND_CHUNK_INFERENCE_PERSONA,
+            user_prompt=prompt,
+            max_tokens=max_tokens_for("trend_inference") * len(items),
+        )
+    return parse_sections(text, [index for index, _ in items])
 
 
 async def trend_inference_agent(state: dict) -> dict:
@@ -36,27 +62,32 @@ async def trend_inference_agent(state: dict) -> dict:
     Called via Send from dispatch_layer_1.
 
     Strategy:
-    1. Split raw_data into ~20-line chunks
-    2. Process chunks in pairs (2 at a time via asyncio.gather)
-    3. Append all inferences in order with section separators
+    1. Split raw_data into token-budgeted chunks along its Markdown structure
+    2. Reuse inferences Layer 0 prefetched while streaming (state["prefetched"])
+       and those stored for unchanged chunks by earlier runs (graph/layer_1/store.py)
+    3. Run the remaining chunks through the shared engine (bounded concurrency,
+       LAYER_1_CHUNKS_PER_CALL chunks per request)
+    4. Append all inferences in order with section separators
     """
     ticker = state["ticker"]
     raw_data = state["raw_data"]
 
-    chunks = split_into_chunks(raw_data, chunk_size=20)
+    chunks = split_markdown(raw_data, settings.layer_1_chunk_tokens)
     log.info("Trend inference START — %d chunks from %d chars", len(chunks), len(raw_data))
-    inferences: list[str] = []
-
-    # Process chunks in pairs — 2 parallel LLM calls at a time
-    for i in range(0, len(chunks), 2):
-        tasks = [_infer_chunk(ticker, chunks[i], i)]
-        if i + 1 < len(chunks):
-            tasks.append(_infer_chunk(ticker, chunks[i + 1], i + 1))
-
-        results = await asyncio.gather(*tasks)
-        inferences.extend(results)
-        processed = min(i + 2, len(chunks))
-        log.info("  Chunk pair %d done (%d/%d chunks processed)", (i // 2) + 1, processed, len(chunks))
+    reusable = dict(state.get("prefetched", {}))
+    stored = {}
+    if not state.get("force_refresh"):
+        stored = await load_inferences("trend", TREND_CHUNK_INFERENCE_PERSONA, ticker, chunks)
+        if stored:
+            log.info("  %d/%d chunks unchanged since a previous run", len(stored), len(chunks))
+        reusable.update(stored)
+    writer = InferenceWriter("trend", TREND_CHUNK_INFERENCE_PERSONA, ticker, stored)
+    inferences = await get_chunk_engine().run(
+        "trend", ticker, chunks, infer_chunk, reusable,
+        infer_many=infer_chunks,
+        on_result=writer,
+    )
+    await writer.flush()
 
     # Assemble F2 document
     header = f"# Market Trend Inference — {ticker}\n"
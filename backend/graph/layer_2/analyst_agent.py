@@ -8,7 +8,8 @@ See: docs/architecture/LLD_layer_2.md § 4.2
 import logging
 import re
 from agents.base import call_llm
-from config.personas import MOVE_GENERATION_PROMPT
+from agents.telemetry import llm_tags
+from config.personas import MOVE_GENERATION_CONTEXT, MOVE_GENERATION_PROMPT
 
 log = logging.getLogger("layer_2.analyst")
 
@@ -24,16 +25,20 @@ async def analyst_agent(state: dict) -> dict:
 
     log.info("Analyst '%s' (%s) START for %s", persona["name"], persona["id"], ticker)
 
-    prompt = MOVE_GENERATION_PROMPT.format(
+    # F1 + F2 go first as a shared prefix: identical for all analysts,
+    # so it is written to the prompt cache once and read by the rest.
+    context = MOVE_GENERATION_CONTEXT.format(
         ticker=ticker,
         f1=state["f1"],
         f2=state["f2"],
     )
 
-    raw_response = await call_llm(
-        system_prompt=persona["system_prompt"],
-        user_prompt=prompt,
-    )
+    with llm_tags(layer=2, node="analyst_agent", persona=persona["id"]):
+        raw_response = await call_llm(
+            system_prompt=persona["system_prompt"],
+            user_prompt=MOVE_GENERATION_PROMPT,
+            shared_prefix=context,
+        )
 
     moves = _parse_three_moves(raw_response, persona, ticker)
     move_ids = [m["move_id"] for m in moves]
@@ -13,14 +13,15 @@ def dispatch_layer_2(state: dict) -> list[Send]:
     """
     Conditional edge after Layer 1 reduce.
     Dispatches N parallel analyst agents (controlled by NUM_ANALYST_AGENTS in .env).
-    Each agent gets F1, F2, and its persona config.
+    Each agent gets F1, F2 (their briefs, if Layer 1 compressed them),
+    and its persona config.
     """
     active_personas = ANALYST_PERSONAS[:settings.num_analyst_agents]
     return [
         Send("analyst_agent", {
             "ticker": state["company_ticker"],
-            "f1": state["f1_financial_inference"],
-            "f2": state["f2_trend_inference"],
+            "f1": state.get("f1_brief") or state["f1_financial_inference"],
+            "f2": state.get("f2_brief") or state["f2_trend_inference"],
             "persona": persona,
         })
         for persona in active_personas
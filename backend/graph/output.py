@@ -31,15 +31,25 @@ def rank_and_output(state: PipelineState) -> dict:
         mid = entry.get("move_id", "?")
         score = entry.get("total_score", 0)
         skipped = entry.get("skipped", False)
-        log.info("  #%d  %s  score=%d%s", i, mid, score, " (SKIPPED)" if skipped else "")
+        note = " (SKIPPED)" if skipped else ""
+        if entry.get("duplicate_of"):
+            note = f" (duplicate of {entry['duplicate_of']})"
+        elif entry.get("eliminated"):
+            note = f" (eliminated after {entry.get('rounds')} rounds)"
+        log.info("  #%d  %s  score=%d%s", i, mid, score, note)
 
     # Attach move document to each score
     for score_entry in ranked:
         score_entry["move_document"] = move_lookup.get(score_entry["move_id"], {})
 
-    # Split top 3 vs rest
-    recommended = ranked[:3]
-    other = ranked[3:]
+    # Split top 3 vs rest — near-duplicates share their representative's
+    # score, so they go to "other" rather than filling the top 3; moves
+    # eliminated early in a sandbox tournament only fill in if fewer than
+    # 3 finalists were scored
+    candidates = [r for r in ranked if not r.get("duplicate_of")]
+    recommended = ([r for r in candidates if not r.get("eliminated")]
+                   + [r for r in candidates if r.get("eliminated")])[:3]
+    other = [r for r in ranked if r not in recommended]
 
     log.info("Rank & Output DONE: top 3 = %s",
              [f"{r['move_id']}({r['total_score']})" for r in recommended])
@@ -6,11 +6,16 @@ Wires all layers together:
         → [layer_2 fan-out] → layer_2_reduce
         → sandbox_orchestrator → rank_and_output → END
 
+With SANDBOX_STREAMING_HANDOFF, layer_1_reduce goes straight to the
+sandbox orchestrator, which runs the analysts and streams their moves
+into negotiation (see graph/sandbox/orchestrator.py).
+
 See: docs/architecture/HLD.md § 3
      docs/architecture/LLD_pipeline.md § 2
 """
 
 from langgraph.graph import StateGraph, START, END
+from config.settings import settings
 from models.state import PipelineState
 
 # Layer 0
@@ -43,8 +48,9 @@ def build_pipeline() -> StateGraph:
     builder.add_node("financial_inference_agent", financial_inference_agent)
     builder.add_node("trend_inference_agent", trend_inference_agent)
     builder.add_node("layer_1_reduce", layer_1_reduce)
-    builder.add_node("analyst_agent", analyst_agent)
-    builder.add_node("layer_2_reduce", layer_2_reduce)
+    if not settings.sandbox_streaming_handoff:
+        builder.add_node("analyst_agent", analyst_agent)
+        builder.add_node("layer_2_reduce", layer_2_reduce)
     builder.add_node("sandbox_orchestrator", sandbox_orchestrator)
     builder.add_node("rank_and_output", rank_and_output)
 
@@ -60,14 +66,19 @@ def build_pipeline() -> StateGraph:
     builder.add_edge("financial_inference_agent", "layer_1_reduce")
     builder.add_edge("trend_inference_agent", "layer_1_reduce")
 
-    # Layer 1 reduce → Layer 2 (fan-out to 5 parallel analyst agents)
-    builder.add_conditional_edges("layer_1_reduce", dispatch_layer_2)
+    if settings.sandbox_streaming_handoff:
+        # Layer 1 reduce → Sandbox orchestrator, which runs the analysts
+        # itself and negotiates each move as soon as it exists
+        builder.add_edge("layer_1_reduce", "sandbox_orchestrator")
+    else:
+        # Layer 1 reduce → Layer 2 (fan-out to 5 parallel analyst agents)
+        builder.add_conditional_edges("layer_1_reduce", dispatch_layer_2)
 
-    # All analyst agents → Layer 2 reduce
-    builder.add_edge("analyst_agent", "layer_2_reduce")
+        # All analyst agents → Layer 2 reduce
+        builder.add_edge("analyst_agent", "layer_2_reduce")
 
-    # Layer 2 reduce → Sandbox orchestrator
-    builder.add_edge("layer_2_reduce", "sandbox_orchestrator")
+        # Layer 2 reduce → Sandbox orchestrator
+        builder.add_edge("layer_2_reduce", "sandbox_orchestrator")
 
     # Sandbox → Rank and output
     builder.add_edge("sandbox_orchestrator", "rank_and_output")
@@ -0,0 +1,101 @@
+"""
+Round-budget allocation — a fixed number of debate rounds per analysis.
+
+With SANDBOX_ROUND_BUDGET > 0 rounds are no longer num_negotiation_rounds
+per move. Every move debates one round and gets a provisional score;
+the rest of the budget is then handed out in a few passes, each move's
+share proportional to how contentious it still is:
+
+  - closeness     how near its provisional score is to the top-k cutoff
+                  (the midpoint between the k-th and (k+1)-th scores),
+                  on the scale of the score spread — an extra round can
+                  only change the recommendation for these
+  - disagreement  the spread of the decision makers' totals (0-40 each)
+  - objection     the critic's last turn still objects (did not concede,
+                  see convergence.critic_conceded)
+
+Moves far above or below the cutoff that the DMs and the critic agree on
+get little or nothing. A move never exceeds SANDBOX_ROUND_BUDGET_MAX_PER_MOVE rounds.
+Rounds that a grant does not use (the debate converged) return to the
+pool for the next pass. The orchestrator applies the grants through
+_negotiate_move as a per-move max_rounds.
+
+See: docs/architecture/LLD_sandbox.md § 8
+"""
+
+import math
+from config.personas import SCORING_METRICS
+from graph.sandbox.convergence import critic_conceded
+from models.state import ConversationEntry
+
+# Rounds every move debates before the first provisional score
+FIRST_ROUNDS = 1
+# Allocation passes after the first round (unspent rounds are re-granted)
+MAX_PASSES = 3
+# Priorities below this get no rounds
+MIN_PRIORITY = 0.05
+# Weights of DM disagreement and a standing critic objection relative to
+# closeness to the cutoff (0-1 each)
+DISAGREEMENT_WEIGHT = 0.5
+OBJECTION_WEIGHT = 0.25
+
+
+def top_k_cutoff(totals: list[float], k: int) -> float:
+    """Score separating the top k from the rest (midpoint of the k-th and k+1-th)."""
+    ranked = sorted(totals, reverse=True)
+    if len(ranked) <= k:
+        return ranked[-1] if ranked else 0.0
+    return (ranked[k - 1] + ranked[k]) / 2
+
+
+def dm_disagreement(scores_by_agent: dict) -> float:
+    """Spread (max − min) of the DMs' totals as a share of one DM's maximum."""
+    totals = [sum(s.get(m, 0) for m in SCORING_METRICS) for s in scores_by_agent.values()]
+    if len(totals) < 2:
+        return 0.0
+    return (max(totals) - min(totals)) / (10 * len(SCORING_METRICS))
+
+
+def critic_objects(conversation: list[ConversationEntry]) -> bool:
+    """True unless the critic conceded in its latest round."""
+    rounds = [e["round"] for e in conversation if e["role"] == "critic"]
+    return bool(rounds) and not critic_conceded(conversation, max(rounds))
+
+
+def contention(total: float, scores_by_agent: dict, cutoff: float, scale: float,
+               objecting: bool = False) -> float:
+    """
+    Priority of one more round for a move: closeness to the cutoff, DM
+    disagreement, and whether the critic still objects.
+    """
+    closeness = math.exp(-abs(total - cutoff) / max(scale, 1.0))
+    return (closeness + DISAGREEMENT_WEIGHT * dm_disagreement(scores_by_agent)
+            + OBJECTION_WEIGHT * objecting)
+
+
+def allocate_rounds(priorities: dict[str, float], headroom: dict[str, int], rounds: int) -> dict[str, int]:
+    """
+    Splits rounds across moves in proportion to priority (largest
+    remainder), never giving a move more than its headroom.
+    """
+    grants = {mid: 0 for mid in priorities}
+    eligible = {mid for mid, p in priorities.items() if p >= MIN_PRIORITY and headroom.get(mid, 0) > 0}
+    while rounds > 0 and eligible:
+        weight = sum(priorities[mid] for mid in eligible)
+        shares = {mid: rounds * priorities[mid] / weight for mid in eligible}
+        given = 0
+        for mid in eligible:
+            n = min(int(shares[mid]), headroom[mid] - grants[mid])
+            grants[mid] += n
+            given += n
+        leftover = rounds - given
+        by_remainder = sorted(eligible, key=lambda mid: shares[mid] - int(shares[mid]), reverse=True)
+        for mid in by_remainder:
+            if leftover == 0:
+                break
+            if grants[mid] < headroom[mid]:
+                grants[mid] += 1
+                leftover -= 1
+        rounds = leftover
+        eligible = {mid for mid in eligible if grants[mid] < headroom[mid]}
+    return {mid: n for mid, n in grants.items() if n > 0}
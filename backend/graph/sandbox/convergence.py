@@ -0,0 +1,78 @@
+"""
+Convergence detection — ends a negotiation once further rounds add little.
+
+Runs after every all_dms_respond (from SANDBOX_CONVERGENCE_MIN_ROUNDS on)
+and reports why the debate should stop, if it should:
+
+  - critic_conceded   the critic's latest message withdraws its
+                      objections ("no further objections", "my concerns
+                      have been addressed", ...). Acknowledging a single
+                      point does not count.
+  - repetition        the latest round's messages are mostly restating
+                      earlier rounds: the share of their content-word
+                      bigrams never seen before in the debate is below
+                      SANDBOX_CONVERGENCE_MIN_NOVELTY.
+
+No extra LLM call is made. The subgraph routes a converged debate
+straight to score_move and records stop_reason; "max_rounds" is
+recorded when the round limit ends it.
+
+See: docs/architecture/LLD_sandbox.md § 7
+"""
+
+import re
+from config.settings import settings
+from models.state import ConversationEntry
+
+_WORD = re.compile(r"[a-z][a-z'-]{3,}")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_CONCESSION = re.compile(
+    r"\b(?:"
+    r"(?:i have|i've|i see|there are) no (?:further|remaining|more) (?:objections?|concerns?)"
+    r"|i (?:withdraw|drop) (?:my|all) (?:remaining )?(?:objections?|concerns?)"
+    r"|my (?:remaining )?concerns (?:have been|are) (?:fully |largely |adequately )?(?:addressed|resolved)"
+    r"|i(?:'m| am) (?:now )?satisfied (?:with|that)"
+    r"|i concede the (?:debate|argument|case)"
+    r")\b",
+    re.IGNORECASE,
+)
+
+
+def _bigrams(text: str) -> set[str]:
+    words = _WORD.findall(text.lower())
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def round_novelty(conversation: list[ConversationEntry], round_num: int) -> float:
+    """Share of round_num's content-word bigrams not used in earlier rounds."""
+    current, prior = set(), set()
+    for entry in conversation:
+        if entry["round"] == round_num:
+            current |= _bigrams(entry["content"])
+        elif entry["round"] < round_num:
+            prior |= _bigrams(entry["content"])
+    if not current:
+        return 0.0
+    return len(current - prior) / len(current)
+
+
+def critic_conceded(conversation: list[ConversationEntry], round_num: int) -> bool:
+    """
+    True when the critic's message in round_num withdraws its objections
+    in a statement (a question like "do you have no further objections?"
+    does not count).
+    """
+    return any(
+        _CONCESSION.search(sentence) and not sentence.rstrip().endswith("?")
+        for e in conversation if e["role"] == "critic" and e["round"] == round_num
+        for sentence in _SENTENCE.split(e["content"])
+    )
+
+
+def convergence_reason(conversation: list[ConversationEntry], round_num: int) -> str:
+    """Why the debate has converged after round_num, or "" if it has not."""
+    if critic_conceded(conversation, round_num):
+        return "critic_conceded"
+    if round_num > 1 and round_novelty(conversation, round_num) < settings.sandbox_convergence_min_novelty:
+        return "repetition"
+    return ""
@@ -4,6 +4,8 @@ Conversation log management — append, format, read for shared conversation.
 See: docs/architecture/LLD_sandbox.md § 10
 """
 
+from langgraph.config import get_stream_writer
+from config.settings import settings
 from models.state import ConversationEntry
 
 
@@ -24,23 +26,49 @@ def append_to_log(
     }]
 
 
+def _format_entry(entry: ConversationEntry) -> str:
+    """Formats a single conversation entry with its round/role header."""
+    if entry["role"] == "critic":
+        role_label = "CRITIC"
+    else:
+        role_label = f"DECISION MAKER ({entry['role']})"
+    return f"**[Round {entry['round']}] {role_label}:**\n{entry['content']}"
+
+
 def format_transcript(conversation: list[ConversationEntry]) -> str:
     """
     Formats a conversation log as a human-readable transcript.
-    This is what gets passed to the LLM on each call.
     """
-    lines = []
-    for entry in conversation:
-        if entry["role"] == "critic":
-            role_label = "CRITIC"
-        else:
-            role_label = f"DECISION MAKER ({entry['role']})"
+    return "\n\n---\n\n".join(_format_entry(e) for e in conversation)
 
-        lines.append(
-            f"**[Round {entry['round']}] {role_label}:**\n"
-            f"{entry['content']}"
-        )
-    return "\n\n---\n\n".join(lines)
+
+def format_transcript_blocks(conversation: list[ConversationEntry]) -> list[str]:
+    """
+    Formats a conversation log as one prompt block per entry.
+    This is what gets passed to the LLM on each call (as user_prefix).
+
+    Concatenated, the blocks equal format_transcript() under a heading.
+    Each block carries its own leading separator, so appending new
+    entries never changes earlier blocks — the previous round's
+    transcript stays a byte-identical, cacheable prefix.
+    """
+    blocks = []
+    for i, entry in enumerate(conversation):
+        lead = "Negotiation transcript so far:\n\n" if i == 0 else "\n\n---\n\n"
+        blocks.append(lead + _format_entry(entry))
+    return blocks
+
+
+def format_move_context(ticker: str, move: dict) -> str:
+    """
+    The move document as a shared prompt prefix. Identical for the critic,
+    all decision makers and the scorers of a move, so one cache entry
+    serves every call in the negotiation.
+    """
+    return (
+        f"Proposed business move for {ticker} under discussion:\n\n"
+        f"{move['content']}"
+    )
 
 
 def get_latest_message(conversation: list[ConversationEntry]) -> str:
@@ -48,3 +76,29 @@ def get_latest_message(conversation: list[ConversationEntry]) -> str:
     if not conversation:
         return ""
     return conversation[-1]["content"]
+
+
+def delta_callback(move_id: str, round_num: int, role: str):
+    """
+    Returns an on_delta callback for call_llm() that emits each text delta
+    as a ``sandbox_delta`` custom stream event (forwarded to SSE by the
+    orchestrator), or None when SANDBOX_STREAM_DELTAS is off.
+
+    Deltas are a live preview only — the authoritative message still
+    arrives in the ``sandbox_round`` event once the response completes.
+    A retried call emits ``reset: true`` first so the draft is cleared.
+    """
+    if not settings.sandbox_stream_deltas:
+        return None
+    writer = get_stream_writer()
+
+    async def _on_delta(text: str, *, reset: bool = False) -> None:
+        event = {
+            "event": "sandbox_delta", "move": move_id,
+            "round": round_num, "role": role, "delta": text,
+        }
+        if reset:
+            event["reset"] = True
+        writer(event)
+
+    return _on_delta
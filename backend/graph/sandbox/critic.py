@@ -11,8 +11,13 @@ See: docs/architecture/LLD_sandbox.md § 5.1
 import logging
 import time
 from agents.base import call_llm
+from agents.telemetry import llm_tags
 from config.personas import CRITIC_PERSONA
-from graph.sandbox.conversation import format_transcript
+from graph.sandbox.conversation import (
+    delta_callback,
+    format_move_context,
+    format_transcript_blocks,
+)
 from models.state import SandboxState
 
 log = logging.getLogger("sandbox.critic")
@@ -35,25 +40,15 @@ async def critic_respond(state: SandboxState) -> dict:
 
     if round_num == 1:
         # Opening critique — no prior conversation
-        prompt = f"""
-Here is a proposed business move for {state['ticker']}:
-
-{move['content']}
-
+        prompt = """
 Provide your initial counterpoints to this move. Challenge the reasoning,
 question the evidence, and identify risks.
 
 Be concise — focus on your top 3 counterpoints in 2-3 paragraphs.
 """
     else:
-        transcript = format_transcript(conversation)
         prompt = f"""
-You are in round {round_num} of a boardroom negotiation about this move for {state['ticker']}:
-
-{move['content']}
-
-The full conversation so far:
-{transcript}
+You are in round {round_num} of this boardroom negotiation.
 
 All three decision makers responded in the previous round. Address the
 strongest points raised by each of them. If a DM made a compelling argument,
@@ -63,11 +58,14 @@ Raise new counterpoints if you see additional weaknesses.
 Be concise — respond in 2-3 focused paragraphs. Do not repeat prior points.
 """
 
-    response = await call_llm(
-        system_prompt=CRITIC_PERSONA,
-        user_prompt=prompt,
-        max_tokens=2048,
-    )
+    with llm_tags(node="critic", persona="critic", round=round_num):
+        response = await call_llm(
+            system_prompt=CRITIC_PERSONA,
+            user_prompt=prompt,
+            shared_prefix=format_move_context(state["ticker"], move),
+            user_prefix=format_transcript_blocks(conversation),
+            on_delta=delta_callback(move_id, round_num, "critic"),
+        )
 
     elapsed = time.time() - start
     log.info("[%s] Critic round %d DONE (%.1fs, %d chars)",
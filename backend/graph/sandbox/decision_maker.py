@@ -13,8 +13,13 @@ import asyncio
 import logging
 import time
 from agents.base import call_llm
+from agents.telemetry import llm_tags
 from config.personas import DECISION_MAKER_PERSONAS
-from graph.sandbox.conversation import format_transcript
+from graph.sandbox.conversation import (
+    delta_callback,
+    format_move_context,
+    format_transcript_blocks,
+)
 from models.state import SandboxState
 
 log = logging.getLogger("sandbox.dm")
@@ -31,7 +36,8 @@ async def all_dms_respond(state: SandboxState) -> dict:
     move_id = move.get("move_id", "?")
     round_num = state["current_round"]
     conversation = state["conversation"]
-    transcript = format_transcript(conversation)
+    move_context = format_move_context(state["ticker"], move)
+    transcript_blocks = format_transcript_blocks(conversation)
 
     log.info("[%s] All DMs round %d START", move_id, round_num)
     start = time.time()
@@ -41,13 +47,8 @@ async def all_dms_respond(state: SandboxState) -> dict:
         dm_name = dm_persona["name"]
         log.info("[%s]   %s (%s) — calling LLM", move_id, dm_id, dm_name)
 
-        prompt = f"""
-You are in a boardroom discussion about this business move for {state['ticker']}:
-
-{move['content']}
-
-Here is the full negotiation transcript so far:
-{transcript}
+        prompt = """
+You are in a boardroom discussion about this business move.
 
 Respond to the critic's latest points. You may also engage with arguments
 made by other decision makers in prior rounds. Defend the move where you
@@ -56,11 +57,14 @@ believe it has merit, and concede where the critic makes valid points.
 Be concise — respond in 2-3 paragraphs. Address the critic's strongest new point first.
 """
 
-        response = await call_llm(
-            system_prompt=dm_persona["system_prompt"],
-            user_prompt=prompt,
-            max_tokens=2048,
-        )
+        with llm_tags(node="decision_maker", persona=dm_id, round=round_num):
+            response = await call_llm(
+                system_prompt=dm_persona["system_prompt"],
+                user_prompt=prompt,
+                shared_prefix=move_context,
+                user_prefix=transcript_blocks,
+                on_delta=delta_callback(move_id, round_num, dm_id),
+            )
         return dm_id, response
 
     results = await asyncio.gather(
@@ -2,17 +2,40 @@
 Sandbox orchestrator — runs move negotiations concurrently.
 
 Uses astream() per subgraph so that each node's status_updates are
-published to SSE in real-time.  Up to ``settings.sandbox_concurrency``
-negotiations run in parallel (controlled by asyncio.Semaphore).
+published to SSE in real-time, along with ``sandbox_delta`` token
+deltas that the critic / DM nodes emit on the custom stream.  Up to
+``settings.sandbox_concurrency`` negotiations run in parallel
+(controlled by asyncio.Semaphore).
+
+With SANDBOX_STREAMING_HANDOFF the graph routes Layer 1 straight here
+and the orchestrator runs the Layer 2 analysts itself: each analyst's
+three moves are queued for negotiation the moment it returns, so fast
+analysts' moves are mid-debate while the slowest is still writing.
+Dedup, stub filtering and the semaphore apply as before, and
+rank_and_output still runs once, after every negotiation.
+
+With SANDBOX_DEDUP_ENABLED, near-duplicate moves (graph/sandbox/
+similarity.py) are not negotiated: only the first move of each cluster
+is debated, and its score is copied to the others with duplicate_of /
+similarity provenance.
 
 See: docs/architecture/LLD_sandbox.md § 8
 """
 
 import asyncio
 import logging
+import math
+import statistics
 import time
 from typing import Callable, Awaitable, Optional
+from agents.telemetry import llm_tags
 from models.state import PipelineState, SandboxState
+from graph.layer_2.analyst_agent import analyst_agent
+from graph.layer_2.node import dispatch_layer_2
+from graph.sandbox.budget import (
+    FIRST_ROUNDS, MAX_PASSES, allocate_rounds, contention, critic_objects, top_k_cutoff,
+)
+from graph.sandbox.similarity import MoveIndex, background_documents, cluster_moves
 from graph.sandbox.subgraph import sandbox_subgraph
 from config.settings import settings
 
@@ -54,18 +77,60 @@ def _deduplicate_moves(moves: list[dict]) -> list[dict]:
     return unique
 
 
+def _similarity_background(state: PipelineState) -> list:
+    """IDF background for the similarity index: the F1/F2 the analysts read."""
+    return background_documents(
+        state.get("f1_brief") or state.get("f1_financial_inference", ""),
+        state.get("f2_brief") or state.get("f2_trend_inference", ""),
+    )
+
+
+def _duplicate_event(move: dict, representative: str, similarity: float) -> dict:
+    return {
+        "event": "sandbox_skipped", "move": move["move_id"],
+        "reason": "duplicate",
+        "duplicate_of": representative,
+        "similarity": similarity,
+        "title": move.get("title", "Untitled"),
+        "risk_level": move.get("risk_level", "unknown"),
+        "persona": move.get("persona", ""),
+    }
+
+
+def _propagate_scores(scores: list[dict], duplicates: dict[str, tuple[str, float]]) -> list[dict]:
+    """Score entries for near-duplicates, copied from their representative."""
+    by_id = {s["move_id"]: s for s in scores}
+    copied = []
+    for move_id, (representative, similarity) in duplicates.items():
+        source = by_id[representative]
+        copied.append({
+            **{k: v for k, v in source.items() if k != "move_id"},
+            "move_id": move_id,
+            "duplicate_of": representative,
+            "similarity": similarity,
+        })
+    return copied
+
+
 async def _negotiate_move(
     sem: asyncio.Semaphore,
     move: dict,
     idx: int,
     total_moves: int,
     ticker: str,
+    max_rounds: int | None = None,
+    resume: dict | None = None,
 ) -> dict:
     """
     Run a single move negotiation, gated by the semaphore.
     Returns a dict with keys: score, log, status_updates.
+
+    max_rounds defaults to settings.num_negotiation_rounds; resume (an
+    earlier result of this function) continues that debate from its
+    last round instead of starting over.
     """
     move_id = move["move_id"]
+    max_rounds = max_rounds or settings.num_negotiation_rounds
 
     # ── Content validation: skip blank stubs (no semaphore needed) ──
     if not _is_move_substantive(move):
@@ -82,6 +147,7 @@ async def _negotiate_move(
                 "move_id": move_id,
                 "total_score": 0,
                 "scores_by_agent": {},
+                "rounds": 0,
                 "skipped": True,
                 "reason": f"Move content insufficient for evaluation "
                           f"(< {MIN_MOVE_CONTENT_LINES} lines)",
@@ -104,7 +170,7 @@ async def _negotiate_move(
             "risk_level": move.get("risk_level", "unknown"),
             "persona": move.get("persona", ""),
             "total_moves": total_moves,
-            "max_rounds": settings.num_negotiation_rounds,
+            "max_rounds": max_rounds,
         }
         await _publish(start_event)
         status_updates_pre: list[dict] = [start_event]
@@ -112,9 +178,10 @@ async def _negotiate_move(
         subgraph_input: SandboxState = {
             "move_document": move,
             "ticker": ticker,
-            "conversation": [],
-            "current_round": 0,
-            "max_rounds": settings.num_negotiation_rounds,
+            "conversation": resume["log"]["conversation"] if resume else [],
+            "current_round": resume["score"]["rounds"] if resume else 0,
+            "max_rounds": max_rounds,
+            "stop_reason": "",
             "scores": {},
             "total_score": 0,
             "status_updates": [],
@@ -124,24 +191,31 @@ async def _negotiate_move(
 
         try:
             result = {}
-            async for event in sandbox_subgraph.astream(
-                subgraph_input, stream_mode="updates"
-            ):
-                for node_name, node_output in event.items():
-                    for key, value in node_output.items():
-                        if key == "status_updates":
-                            result.setdefault("status_updates", [])
-                            result["status_updates"].extend(value)
-                        elif isinstance(value, list) and isinstance(
-                            result.get(key), list
-                        ):
-                            result[key].extend(value)
-                        else:
-                            result[key] = value
-
-                    for update in node_output.get("status_updates", []):
-                        await _publish(update)
-                        status_updates.append(update)
+            with llm_tags(move_id=move_id):
+                async for mode, event in sandbox_subgraph.astream(
+                    subgraph_input, stream_mode=["updates", "custom"]
+                ):
+                    if mode == "custom":
+                        # Token deltas from critic / DM calls — publish only,
+                        # they are not part of the move's status_updates.
+                        await _publish(event)
+                        continue
+
+                    for node_name, node_output in event.items():
+                        for key, value in node_output.items():
+                            if key == "status_updates":
+                                result.setdefault("status_updates", [])
+                                result["status_updates"].extend(value)
+                            elif isinstance(value, list) and isinstance(
+                                result.get(key), list
+                            ):
+                                result[key].extend(value)
+                            else:
+                                result[key] = value
+
+                        for update in node_output.get("status_updates", []):
+                            await _publish(update)
+                            status_updates.append(update)
 
             score = result.get("total_score", 0)
             elapsed = time.time() - move_start
@@ -153,10 +227,13 @@ async def _negotiate_move(
                     "move_id": move_id,
                     "total_score": result.get("total_score", 0),
                     "scores_by_agent": result.get("scores", {}),
+                    "rounds": result.get("current_round", max_rounds),
                 },
                 "log": {
                     "move_id": move_id,
                     "conversation": result.get("conversation", []),
+                    "rounds": result.get("current_round", max_rounds),
+                    "stop_reason": result.get("stop_reason", "max_rounds"),
                 },
                 "status_updates": status_updates,
             }
@@ -176,6 +253,7 @@ async def _negotiate_move(
                     "move_id": move_id,
                     "total_score": 0,
                     "scores_by_agent": {},
+                    "rounds": 0,
                     "skipped": True,
                     "reason": f"Sandbox error: {e}",
                 },
@@ -184,6 +262,298 @@ async def _negotiate_move(
             }
 
 
+def _collect(
+    results: list[dict],
+    started: float,
+    duplicates: dict[str, tuple[str, float]] | None = None,
+) -> tuple[dict, list[dict]]:
+    """
+    Merges negotiation results into the orchestrator's state update;
+    near-duplicates get their representative's score.
+    """
+    duplicates = duplicates or {}
+    all_scores = [r["score"] for r in results]
+    all_logs = [r["log"] for r in results if r["log"] is not None]
+    all_status_updates = []
+    for r in results:
+        all_status_updates.extend(r["status_updates"])
+
+    total_elapsed = time.time() - started
+    scored_count = sum(1 for s in all_scores if not s.get("skipped"))
+    log.info("Sandbox Orchestrator DONE: %d scored, %d skipped, %d near-duplicates, %.1fs total",
+             scored_count, len(all_scores) - scored_count, len(duplicates), total_elapsed)
+    all_scores += _propagate_scores(all_scores, duplicates)
+
+    return {
+        "policy_scores": all_scores,
+        "conversation_logs": all_logs,
+    }, all_status_updates
+
+
+def tournament_depths(max_rounds: int, first_rounds: int, eta: int) -> list[int]:
+    """Round counts of the successive-halving rungs, e.g. (3, 1, 3) → [1, 3]."""
+    depths = []
+    depth = max(1, min(first_rounds, max_rounds))
+    while depth < max_rounds:
+        depths.append(depth)
+        depth *= max(2, eta)
+    return depths + [max_rounds]
+
+
+def _first_rung_rounds() -> int:
+    """Rounds every move gets before any round budget grant or tournament cut."""
+    if settings.sandbox_round_budget > 0:
+        return FIRST_ROUNDS
+    if not settings.sandbox_tournament_enabled:
+        return settings.num_negotiation_rounds
+    return tournament_depths(settings.num_negotiation_rounds,
+                             settings.sandbox_tournament_first_rounds,
+                             settings.sandbox_tournament_eta)[0]
+
+
+async def _extend_debates(
+    sem: asyncio.Semaphore,
+    by_id: dict[str, dict],
+    current: dict[str, dict],
+    targets: dict[str, int],
+    ticker: str,
+) -> list[str]:
+    """
+    Resumes debates to targets[move_id] rounds and rescores them, replacing
+    their entries in current (earlier scores go to provisional_scores).
+    A debate that fails keeps its earlier result. Returns the failed ids.
+    """
+    mids = list(targets)
+    extended = await asyncio.gather(*[
+        _negotiate_move(sem, by_id[mid], idx, len(mids), ticker,
+                        max_rounds=targets[mid], resume=current[mid])
+        for idx, mid in enumerate(mids, 1)
+    ])
+    failed = []
+    for mid, result in zip(mids, extended):
+        prior = current[mid]
+        if result["score"].get("skipped"):
+            log.warning("%s: failed going to %d rounds, keeping its %d-round score",
+                        mid, targets[mid], prior["score"]["rounds"])
+            failed.append(mid)
+            continue
+        result["score"]["provisional_scores"] = (
+            prior["score"].get("provisional_scores", []) + [prior["score"]["total_score"]]
+        )
+        result["status_updates"] = prior["status_updates"] + result["status_updates"]
+        current[mid] = result
+    return failed
+
+
+def _errored(result: dict) -> bool:
+    """True when a negotiation failed with an error (not a blank-stub skip)."""
+    return result["score"].get("reason", "").startswith("Sandbox error")
+
+
+def _converged(result: dict) -> bool:
+    """True when a negotiation stopped before its round limit (see convergence.py)."""
+    return result["log"] is not None and result["log"]["stop_reason"] != "max_rounds"
+
+
+async def _run_tournament(
+    sem: asyncio.Semaphore,
+    moves: list[dict],
+    results: list[dict],
+    ticker: str,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Successive halving over first-rung results (SANDBOX_TOURNAMENT_ENABLED).
+    Each rung keeps the top 1/eta by provisional score — never fewer than
+    top_k_recommendations — and resumes their debates to the next depth;
+    the finalists complete num_negotiation_rounds. Returns the results in
+    the same order (latest rung per move) and the tournament events.
+    """
+    eta = max(2, settings.sandbox_tournament_eta)
+    depths = tournament_depths(settings.num_negotiation_rounds,
+                               settings.sandbox_tournament_first_rounds, eta)
+    by_id = {m["move_id"]: m for m in moves}
+    current = {r["score"]["move_id"]: r for r in results}
+    alive = [mid for mid, r in current.items() if not r["score"].get("skipped")]
+    events = []
+
+    for depth in depths[1:]:
+        keep = max(settings.top_k_recommendations, math.ceil(len(alive) / eta))
+        ranked = sorted(alive, key=lambda mid: current[mid]["score"]["total_score"], reverse=True)
+        alive, eliminated = ranked[:keep], ranked[keep:]
+        # A debate that already converged keeps its place but is not extended
+        alive = [mid for mid in alive if not _converged(current[mid])]
+        log.info("Tournament: %d moves advance to %d rounds %s, %d eliminated",
+                 len(alive), depth, alive, len(eliminated))
+        for mid in eliminated:
+            current[mid]["score"]["eliminated"] = True
+        event = {"event": "sandbox_tournament", "rounds": depth,
+                 "advanced": alive, "eliminated": eliminated}
+        await _publish(event)
+        events.append(event)
+
+        failed = await _extend_debates(sem, by_id, current, {mid: depth for mid in alive}, ticker)
+        alive = [mid for mid in alive if mid not in failed]
+
+    return [current[r["score"]["move_id"]] for r in results], events
+
+
+async def _run_round_budget(
+    sem: asyncio.Semaphore,
+    moves: list[dict],
+    results: list[dict],
+    ticker: str,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Hands out what is left of SANDBOX_ROUND_BUDGET after the first round
+    (graph/sandbox/budget.py), in up to MAX_PASSES passes: contentious
+    moves get more rounds, a grant a debate does not use (it converged)
+    goes back to the pool. Returns the results in the same order and the
+    allocation events.
+    """
+    budget = settings.sandbox_round_budget
+    cap = settings.sandbox_round_budget_max_per_move
+    by_id = {m["move_id"]: m for m in moves}
+    current = {r["score"]["move_id"]: r for r in results}
+    # A first round that failed mid-debate still spent its calls
+    remaining = budget - sum(r["score"]["rounds"] or (FIRST_ROUNDS if _errored(r) else 0)
+                             for r in results)
+    events = []
+
+    for pass_num in range(1, MAX_PASSES + 1):
+        scored = {mid: r["score"] for mid, r in current.items() if not r["score"].get("skipped")}
+        open_moves = [mid for mid, score in scored.items()
+                      if score["rounds"] < cap and not _converged(current[mid])]
+        if remaining <= 0 or not open_moves:
+            break
+        totals = [score["total_score"] for score in scored.values()]
+        cutoff = top_k_cutoff(totals, settings.top_k_recommendations)
+        scale = statistics.pstdev(totals) if len(totals) > 1 else 1.0
+        priorities = {mid: contention(scored[mid]["total_score"], scored[mid]["scores_by_agent"],
+                                      cutoff, scale, critic_objects(current[mid]["log"]["conversation"]))
+                      for mid in open_moves}
+        grants = allocate_rounds(priorities, {mid: cap - scored[mid]["rounds"] for mid in open_moves},
+                                 remaining)
+        if not grants:
+            break
+        log.info("Round budget pass %d: %d rounds left, cutoff %.1f, grants %s",
+                 pass_num, remaining, cutoff, grants)
+        event = {"event": "sandbox_round_budget", "pass": pass_num, "remaining": remaining,
+                 "cutoff": round(cutoff, 1), "grants": grants}
+        await _publish(event)
+        events.append(event)
+
+        before = {mid: scored[mid]["rounds"] for mid in grants}
+        failed = await _extend_debates(sem, by_id, current,
+                                       {mid: before[mid] + n for mid, n in grants.items()}, ticker)
+        # Failed extensions are charged their whole grant
+        used = sum(grants[mid] if mid in failed else current[mid]["score"]["rounds"] - before[mid]
+                   for mid in grants)
+        remaining -= used
+        if used == 0:
+            break
+
+    log.info("Round budget: %d of %d rounds used", budget - remaining, budget)
+    return [current[r["score"]["move_id"]] for r in results], events
+
+
+async def _extra_rounds(
+    sem: asyncio.Semaphore,
+    moves: list[dict],
+    results: list[dict],
+    ticker: str,
+) -> tuple[list[dict], list[dict]]:
+    """Runs the round budget or tournament, if configured, after the first rounds."""
+    with llm_tags(layer=3):
+        if settings.sandbox_round_budget > 0:
+            return await _run_round_budget(sem, moves, results, ticker)
+        if settings.sandbox_tournament_enabled:
+            return await _run_tournament(sem, moves, results, ticker)
+    return results, []
+
+
+async def _streaming_orchestrator(state: PipelineState) -> dict:
+    """
+    Runs the analysts and negotiates each move as soon as its analyst
+    returns (SANDBOX_STREAMING_HANDOFF).
+    """
+    ticker = state["company_ticker"]
+    sends = dispatch_layer_2(state)
+    expected_moves = len(sends) * 3
+
+    log.info("Sandbox Orchestrator START (streaming): %d analysts → up to %d moves",
+             len(sends), expected_moves)
+    log.info("Rounds per move: %d, Decision makers: %d, Concurrency: %d",
+             settings.num_negotiation_rounds, settings.num_decision_makers,
+             settings.sandbox_concurrency)
+
+    orchestrator_start = time.time()
+    layer_start_event = {"event": "layer_start", "layer": 3}
+    await _publish(layer_start_event)
+
+    sem = asyncio.Semaphore(settings.sandbox_concurrency)
+    moves: list[dict] = []
+    seen: set[str] = set()
+    negotiations: list[asyncio.Task] = []
+    analyst_updates: list[dict] = []
+    index = MoveIndex(settings.sandbox_dedup_threshold, _similarity_background(state))
+    duplicates: dict[str, tuple[str, float]] = {}
+
+    async def _analyst(payload: dict) -> None:
+        output = await analyst_agent(payload)
+        for update in output["status_updates"]:
+            await _publish(update)
+            analyst_updates.append(update)
+        for move in output["move_suggestions"]:
+            moves.append(move)
+            if move["move_id"] in seen:
+                log.info("%s: duplicate move_id, not negotiated again", move["move_id"])
+                continue
+            seen.add(move["move_id"])
+            if settings.sandbox_dedup_enabled and _is_move_substantive(move):
+                match = index.add(move)
+                if match is not None:
+                    duplicates[move["move_id"]] = match
+                    event = _duplicate_event(move, *match)
+                    await _publish(event)
+                    analyst_updates.append(event)
+                    continue
+            negotiations.append(asyncio.create_task(
+                _negotiate_move(sem, move, len(seen), expected_moves, ticker,
+                                max_rounds=_first_rung_rounds())
+            ))
+
+    try:
+        with llm_tags(layer=3):
+            await asyncio.gather(*[_analyst(send.arg) for send in sends])
+    except BaseException:
+        for task in negotiations:
+            task.cancel()
+        raise
+
+    layer_2_event = {"event": "layer_complete", "layer": 2, "status": "done",
+                     "artifacts": [m["move_id"] for m in moves],
+                     "total_moves": len(moves)}
+    await _publish(layer_2_event)
+    log.info("Layer 2 done after %.1fs — %d moves, %d negotiations already finished",
+             time.time() - orchestrator_start, len(moves), sum(1 for t in negotiations if t.done()))
+
+    results = await asyncio.gather(*negotiations)
+    results, schedule_events = await _extra_rounds(sem, moves, results, ticker)
+    update, negotiation_updates = _collect(results, orchestrator_start, duplicates)
+
+    layer_complete_event = {
+        "event": "layer_complete", "layer": 3, "status": "done",
+        "total_policies_scored": len(update["policy_scores"]),
+    }
+    await _publish(layer_complete_event)
+
+    return {
+        **update,
+        "move_suggestions": moves,
+        "status_updates": [layer_start_event, *analyst_updates, layer_2_event,
+                           *negotiation_updates, *schedule_events, layer_complete_event],
+    }
+
 
 async def sandbox_orchestrator(state: PipelineState) -> dict:
     """
@@ -191,12 +561,22 @@ async def sandbox_orchestrator(state: PipelineState) -> dict:
     settings.sandbox_concurrency at a time).  SSE events stream
     in real-time as each subgraph node completes.
     """
+    if settings.sandbox_streaming_handoff:
+        return await _streaming_orchestrator(state)
+
     raw_moves = state["move_suggestions"]
     moves = _deduplicate_moves(raw_moves)
     total_moves = len(moves)
 
     log.info("Sandbox Orchestrator START: %d unique moves (from %d raw, %d duplicates removed)",
              total_moves, len(raw_moves), len(raw_moves) - total_moves)
+    duplicates: dict[str, tuple[str, float]] = {}
+    if settings.sandbox_dedup_enabled:
+        substantive = [m for m in moves if _is_move_substantive(m)]
+        _, duplicates = cluster_moves(substantive, settings.sandbox_dedup_threshold,
+                                      _similarity_background(state))
+        log.info("%d near-duplicate moves will take their representative's score",
+                 len(duplicates))
     log.info("Rounds per move: %d, Decision makers: %d, Concurrency: %d",
              settings.num_negotiation_rounds, settings.num_decision_makers,
              settings.sandbox_concurrency)
@@ -205,34 +585,31 @@ async def sandbox_orchestrator(state: PipelineState) -> dict:
 
     layer_start_event = {"event": "layer_start", "layer": 3}
     await _publish(layer_start_event)
+    duplicate_events = [_duplicate_event(m, *duplicates[m["move_id"]])
+                        for m in moves if m["move_id"] in duplicates]
+    for event in duplicate_events:
+        await _publish(event)
 
     sem = asyncio.Semaphore(settings.sandbox_concurrency)
 
-    results = await asyncio.gather(*[
-        _negotiate_move(sem, move, idx, total_moves, state["company_ticker"])
-        for idx, move in enumerate(moves, 1)
-    ])
-
-    all_scores = [r["score"] for r in results]
-    all_logs = [r["log"] for r in results if r["log"] is not None]
-    all_status_updates = [layer_start_event]
-    for r in results:
-        all_status_updates.extend(r["status_updates"])
+    with llm_tags(layer=3):
+        results = await asyncio.gather(*[
+            _negotiate_move(sem, move, idx, total_moves, state["company_ticker"],
+                            max_rounds=_first_rung_rounds())
+            for idx, move in enumerate(moves, 1) if move["move_id"] not in duplicates
+        ])
+    results, schedule_events = await _extra_rounds(sem, moves, results, state["company_ticker"])
 
-    total_elapsed = time.time() - orchestrator_start
-    scored_count = sum(1 for s in all_scores if not s.get("skipped"))
-    log.info("Sandbox Orchestrator DONE: %d scored, %d skipped, %.1fs total",
-             scored_count, total_moves - scored_count, total_elapsed)
+    update, negotiation_updates = _collect(results, orchestrator_start, duplicates)
 
     layer_complete_event = {
         "event": "layer_complete", "layer": 3, "status": "done",
-        "total_policies_scored": len(all_scores),
+        "total_policies_scored": len(update["policy_scores"]),
     }
     await _publish(layer_complete_event)
-    all_status_updates.append(layer_complete_event)
 
     return {
-        "policy_scores": all_scores,
-        "conversation_logs": all_logs,
-        "status_updates": all_status_updates,
+        **update,
+        "status_updates": [layer_start_event, *duplicate_events, *negotiation_updates,
+                           *schedule_events, layer_complete_event],
     }
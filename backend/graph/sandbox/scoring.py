@@ -10,8 +10,9 @@ import logging
 import re
 import time
 from agents.base import call_llm
+from agents.telemetry import llm_tags
 from config.personas import DECISION_MAKER_PERSONAS, SCORING_PROMPT, SCORING_METRICS
-from graph.sandbox.conversation import format_transcript
+from graph.sandbox.conversation import format_move_context, format_transcript_blocks
 from models.state import SandboxState
 
 log = logging.getLogger("sandbox.scoring")
@@ -31,18 +32,18 @@ async def score_move(state: SandboxState) -> dict:
              move_id, state["current_round"])
     start = time.time()
 
-    transcript = format_transcript(conversation)
+    move_context = format_move_context(state["ticker"], move)
+    transcript_blocks = format_transcript_blocks(conversation)
 
     async def _score(dm_persona):
-        prompt = SCORING_PROMPT.format(
-            move_content=move["content"],
-            transcript=transcript,
-        )
-        response = await call_llm(
-            system_prompt=dm_persona["system_prompt"],
-            user_prompt=prompt,
-            max_tokens=512,
-        )
+        with llm_tags(node="score_move", persona=dm_persona["id"]):
+            response = await call_llm(
+                system_prompt=dm_persona["system_prompt"],
+                user_prompt=SCORING_PROMPT,
+                shared_prefix=move_context,
+                user_prefix=transcript_blocks,
+                validate=_scores_valid,
+            )
         scores = _parse_scores(response, dm_persona["id"])
         return dm_persona["id"], scores
 
@@ -87,6 +88,26 @@ def _strip_code_blocks(text: str) -> str:
     return text.strip()
 
 
+def _parse_json_scores(response: str) -> dict | None:
+    """Direct json.loads, then again with markdown code blocks stripped."""
+    for candidate in (response, _strip_code_blocks(response)):
+        try:
+            parsed = json.loads(candidate)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return None
+
+
+def _scores_valid(response: str) -> bool:
+    """call_llm validator: JSON with an integer for every metric (else escalate)."""
+    parsed = _parse_json_scores(response)
+    return parsed is not None and all(
+        isinstance(parsed.get(m), int) for m in SCORING_METRICS
+    )
+
+
 def _parse_scores(response: str, dm_id: str) -> dict:
     """
     Try multiple strategies to extract scores from the LLM response:
@@ -94,18 +115,10 @@ def _parse_scores(response: str, dm_id: str) -> dict:
     2. Strip markdown code blocks, then json.loads
     3. Regex fallback
     """
-    # Strategy 1: direct parse
-    try:
-        return json.loads(response)
-    except (json.JSONDecodeError, TypeError):
-        pass
-
-    # Strategy 2: strip code blocks then parse
-    stripped = _strip_code_blocks(response)
-    try:
-        return json.loads(stripped)
-    except (json.JSONDecodeError, TypeError):
-        pass
+    # Strategies 1 + 2: JSON, as-is or inside a code block
+    parsed = _parse_json_scores(response)
+    if parsed is not None:
+        return parsed
 
     # Strategy 3: regex fallback
     log.warning("[%s] Could not parse JSON scores, using regex fallback", dm_id)
@@ -0,0 +1,136 @@
+"""
+Near-duplicate move detection before the sandbox.
+
+Five analysts reading the same F1/F2 often propose the same move in
+different words ("Reprice enterprise tier" / "Raise enterprise pricing").
+Each duplicate would cost a full negotiation (critic, DMs, scoring), so
+moves are clustered by sparse TF-IDF cosine over their title and content:
+
+  - features     word unigrams and bigrams, stop words and Markdown
+                 headings dropped; title terms count twice
+  - idf          smoothed, over the F1/F2 paragraphs plus every move seen
+                 so far, so boilerplate every document shares (ticker,
+                 "revenue", section labels) carries little weight even
+                 for the first few moves of a streaming run
+  - clustering   leader-style: a move joins the most similar existing
+                 representative of the same risk level at or above
+                 SANDBOX_DEDUP_THRESHOLD, otherwise it becomes one
+
+Comparing against representatives only (not every member) keeps clusters
+from chaining, and works one move at a time for the streaming handoff.
+The orchestrator negotiates representatives and copies their scores to
+the members with duplicate_of / similarity provenance.
+
+See: docs/architecture/LLD_sandbox.md § 8
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+
+log = logging.getLogger("sandbox.similarity")
+
+_WORD = re.compile(r"[a-z][a-z0-9'&-]*")
+_STOP_WORDS = frozenset("""
+a about above after again against all also an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers him his how i if
+in into is it its itself just may might more most must no nor not now of off on
+once only or other our ours out over own same she should so some such than that
+the their theirs them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with
+would you your move moves risk low medium high
+""".split())
+TITLE_WEIGHT = 2
+
+
+def _terms(text: str) -> list[str]:
+    words = [w.strip("'-") for w in _WORD.findall(text.lower())]
+    words = [w for w in words if len(w) > 1 and w not in _STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def move_terms(move: dict) -> Counter:
+    """Term counts for a move: title (weighted) plus content without headings."""
+    body = "\n".join(line for line in move.get("content", "").split("\n")
+                     if not line.lstrip().startswith("#"))
+    counts = Counter(_terms(body))
+    for term in _terms(move.get("title", "")):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def background_documents(*documents: str) -> list[Counter]:
+    """Paragraph-level term counts of the analysts' inputs, for the idf."""
+    return [Counter(_terms(p)) for doc in documents
+            for p in re.split(r"\n\s*\n", doc or "") if p.strip()]
+
+
+class MoveIndex:
+    """Incremental near-duplicate index over move documents."""
+
+    def __init__(self, threshold: float, background: list[Counter] | None = None):
+        self.threshold = threshold
+        self._df: Counter = Counter()
+        self._docs = 0
+        for counts in background or []:
+            self._count(counts)
+        self._representatives: list[tuple[dict, Counter]] = []
+
+    def _count(self, counts: Counter) -> None:
+        self._df.update(counts.keys())
+        self._docs += 1
+
+    def _vector(self, counts: Counter) -> dict[str, float]:
+        vec = {t: (1 + math.log(c)) * (math.log((1 + self._docs) / (1 + self._df[t])) + 1)
+               for t, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    @staticmethod
+    def _cosine(a: dict[str, float], b: dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(v * b.get(t, 0.0) for t, v in a.items())
+
+    def add(self, move: dict) -> tuple[str, float] | None:
+        """
+        Indexes a move. Returns (representative move_id, similarity) when
+        it is a near-duplicate, else None and the move becomes a
+        representative.
+        """
+        counts = move_terms(move)
+        self._count(counts)
+        vec = self._vector(counts)
+        best, best_sim = None, 0.0
+        for rep, rep_counts in self._representatives:
+            if rep.get("risk_level") != move.get("risk_level"):
+                continue
+            sim = self._cosine(vec, self._vector(rep_counts))
+            if sim > best_sim:
+                best, best_sim = rep, sim
+        if best is not None and best_sim >= self.threshold:
+            log.info("%s ≈ %s (cosine %.2f): not negotiated separately",
+                     move["move_id"], best["move_id"], best_sim)
+            return best["move_id"], round(best_sim, 3)
+        self._representatives.append((move, counts))
+        return None
+
+
+def cluster_moves(
+    moves: list[dict], threshold: float, background: list[Counter] | None = None,
+) -> tuple[list[dict], dict[str, tuple[str, float]]]:
+    """
+    Splits moves into representatives (in input order) and near-duplicates
+    as {move_id: (representative move_id, similarity)}.
+    """
+    index = MoveIndex(threshold, background)
+    representatives, duplicates = [], {}
+    for move in moves:
+        match = index.add(move)
+        if match is None:
+            representatives.append(move)
+        else:
+            duplicates[move["move_id"]] = match
+    return representatives, duplicates
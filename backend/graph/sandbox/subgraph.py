@@ -2,19 +2,50 @@
 Sandbox subgraph — LangGraph subgraph for one policy negotiation.
 
 Flow (boardroom model, 1 Critic + 3 DMs in parallel per round):
-  START → critic_respond → all_dms_respond → round_check
-      → (if round < max_rounds) → critic_respond → all_dms_respond → (loop)
-      → (if round >= max_rounds) → score_move → END
+  START → critic_respond → all_dms_respond → check_convergence
+      → (if round < max_rounds and not converged) → critic_respond → … (loop)
+      → (if round >= max_rounds or converged) → score_move → END
+
+check_convergence (graph/sandbox/convergence.py) sets stop_reason when
+the critic concedes or a round mostly repeats earlier ones.
 
 See: docs/architecture/LLD_sandbox.md § 7
 """
 
+import logging
 from langgraph.graph import StateGraph, START, END
+from config.settings import settings
 from models.state import SandboxState
+from graph.sandbox.convergence import convergence_reason
 from graph.sandbox.critic import critic_respond
 from graph.sandbox.decision_maker import all_dms_respond
 from graph.sandbox.scoring import score_move
 
+log = logging.getLogger("sandbox.convergence")
+
+
+def check_convergence(state: SandboxState) -> dict:
+    """Sets stop_reason once the debate has converged or hit max_rounds."""
+    round_num = state["current_round"]
+    reason = ""
+    if (settings.sandbox_convergence_enabled
+            and settings.sandbox_convergence_min_rounds <= round_num < state["max_rounds"]):
+        reason = convergence_reason(state["conversation"], round_num)
+    if reason:
+        move_id = state["move_document"].get("move_id", "?")
+        log.info("[%s] Converged after round %d/%d (%s) — scoring now",
+                 move_id, round_num, state["max_rounds"], reason)
+        return {
+            "stop_reason": reason,
+            "status_updates": [
+                {"event": "sandbox_converged", "move": move_id,
+                 "round": round_num, "reason": reason}
+            ],
+        }
+    if round_num >= state["max_rounds"]:
+        return {"stop_reason": "max_rounds"}
+    return {"stop_reason": ""}
+
 
 def build_sandbox_subgraph():
     """Builds the sandbox subgraph for one policy negotiation."""
@@ -23,6 +54,7 @@ def build_sandbox_subgraph():
     # Nodes
     builder.add_node("critic_respond", critic_respond)
     builder.add_node("all_dms_respond", all_dms_respond)
+    builder.add_node("check_convergence", check_convergence)
     builder.add_node("score_move", score_move)
 
     # Entry: START → critic opening
@@ -31,13 +63,15 @@ def build_sandbox_subgraph():
     # Critic → all DMs respond in parallel
     builder.add_edge("critic_respond", "all_dms_respond")
 
-    # After all DMs respond: check round count
+    # After all DMs respond: check convergence and round count
+    builder.add_edge("all_dms_respond", "check_convergence")
+
     def should_continue(state: SandboxState) -> str:
-        if state["current_round"] >= state["max_rounds"]:
+        if state["stop_reason"]:
             return "score_move"
         return "critic_respond"
 
-    builder.add_conditional_edges("all_dms_respond", should_continue)
+    builder.add_conditional_edges("check_convergence", should_continue)
 
     # Score → END
     builder.add_edge("score_move", END)
@@ -32,7 +32,9 @@ class PipelineEvent(str, Enum):
     LAYER_COMPLETE = "layer_complete"
     AGENT_START = "agent_start"
     AGENT_COMPLETE = "agent_complete"
+    CHUNK_PROGRESS = "chunk_progress"
     SANDBOX_ROUND = "sandbox_round"
+    SANDBOX_DELTA = "sandbox_delta"
     SANDBOX_SCORED = "sandbox_scored"
     PIPELINE_COMPLETE = "pipeline_complete"
     PIPELINE_ERROR = "pipeline_error"
@@ -4,13 +4,26 @@ Pydantic models for FastAPI request/response schemas.
 See: docs/architecture/LLD_pipeline.md § 7
 """
 
-from pydantic import BaseModel
+import re
+from pydantic import BaseModel, field_validator
 from typing import Any, Optional
 
+# Exchange symbols: letters, digits, "." and "-" (e.g. BRK.B, RDS-A)
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,10}$")
+
 
 class AnalyzeRequest(BaseModel):
     """POST /api/analyze request body."""
     ticker: str  # e.g., "AAPL", "TSLA"
+    force_refresh: bool = False  # regenerate Layer 0 data even if cached
+
+    @field_validator("ticker")
+    @classmethod
+    def _check_ticker(cls, value: str) -> str:
+        ticker = value.strip().upper()
+        if not TICKER_PATTERN.match(ticker):
+            raise ValueError("ticker must be 1-10 letters, digits, '.' or '-'")
+        return ticker
 
 
 class AnalyzeResponse(BaseModel):
@@ -51,9 +64,25 @@ class AnalysisResult(BaseModel):
     news_data_raw: str = ""
 
 
+class CostSummary(BaseModel):
+    """LLM usage and estimated spend for one analysis (see agents/telemetry.py)."""
+    calls: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    hedges_cancelled: int = 0             # losing hedges, billed at an estimate
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cost_usd: float = 0.0
+    llm_seconds: float = 0.0              # summed call latency (calls overlap)
+    by_layer: dict[str, dict[str, Any]] = {}
+
+
 class AnalysisStatus(BaseModel):
     """GET /api/results/:id response body."""
     analysis_id: str
     ticker: str
     status: str                           # "running" | "complete" | "error"
     result: Optional[AnalysisResult] = None
+    cost_summary: Optional[CostSummary] = None
@@ -48,14 +48,18 @@ class PipelineState(TypedDict):
 
     # Input
     company_ticker: str
+    force_refresh: bool             # bypass the Layer 0 artifact cache
 
     # Layer 0 output
     financial_data_raw: str
     news_data_raw: str
+    prefetched_inferences: dict     # chunk_key → Layer 1 chunk inference (streamed)
 
     # Layer 1 output
     f1_financial_inference: str
     f2_trend_inference: str
+    f1_brief: str                   # compressed F1/F2 for Layer 2 (LAYER_1_COMPRESS_ENABLED)
+    f2_brief: str
 
     # Layer 2 output
     move_suggestions: Annotated[list[dict], add]
@@ -93,6 +97,7 @@ class SandboxState(TypedDict):
     # Round tracking
     current_round: int
     max_rounds: int
+    stop_reason: str                # "max_rounds", "critic_conceded", "repetition" ("" while running)
 
     # Scoring (populated after final round)
     scores: dict
@@ -0,0 +1,127 @@
+"""Message Batches collection against the local stand-in (agents/batch.py, batch_runner.py)."""
+
+import argparse
+import asyncio
+from types import SimpleNamespace
+import httpx
+import pytest
+from anthropic import APIStatusError
+import batch_runner
+from agents.base import _call_with_retries
+from agents.batch import BatchCollector, BatchRequestError, LocalBatchBackend, batch_mode
+from config.settings import settings
+
+WINDOW = 0.05
+
+
+def _request(prompt: str) -> dict:
+    return {"model": "claude-haiku-4-5", "max_tokens": 64,
+            "messages": [{"role": "user", "content": prompt}]}
+
+
+def _status_error(status: int) -> APIStatusError:
+    response = httpx.Response(status, request=httpx.Request("POST", "http://fake/v1/messages"))
+    return APIStatusError(f"status {status}", response=response, body=None)
+
+
+class _Client:
+    """messages.create() echoing the prompt; `failures` maps prompt -> statuses to raise first."""
+
+    def __init__(self, failures: dict[str, list[int]] | None = None):
+        self.failures = failures or {}
+        self.calls: list[str] = []
+        self.messages = self
+
+    async def create(self, **params):
+        prompt = params["messages"][0]["content"]
+        self.calls.append(prompt)
+        if self.failures.get(prompt):
+            raise _status_error(self.failures[prompt].pop(0))
+        usage = SimpleNamespace(input_tokens=5, output_tokens=3)
+        return SimpleNamespace(content=[SimpleNamespace(text=f"re: {prompt}")], usage=usage)
+
+
+class _Recording(LocalBatchBackend):
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    async def run(self, requests):
+        self.batches.append(list(requests))
+        return await super().run(requests)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = _Client()
+    monkeypatch.setattr("agents.batch.get_anthropic_client", lambda: fake)
+    monkeypatch.setattr(settings, "llm_retry_base_seconds", 0.0)
+    return fake
+
+
+async def test_requests_within_the_window_share_one_batch(client):
+    backend = _Recording()
+    collector = BatchCollector(backend, flush_window=WINDOW)
+    calls = [asyncio.ensure_future(collector.submit(_request(p))) for p in ("a", "b", "c")]
+    await asyncio.sleep(WINDOW / 2)
+    assert backend.batches == []  # still inside the quiet window
+    messages = await asyncio.gather(*calls)
+    assert backend.batches == [["req-1", "req-2", "req-3"]]
+    # each caller gets the result for its own custom_id
+    assert [m.content[0].text for m in messages] == ["re: a", "re: b", "re: c"]
+
+
+async def test_new_requests_restart_the_quiet_window(client):
+    backend = _Recording()
+    collector = BatchCollector(backend, flush_window=WINDOW)
+    first = asyncio.ensure_future(collector.submit(_request("a")))
+    await asyncio.sleep(WINDOW / 2)
+    second = asyncio.ensure_future(collector.submit(_request("b")))
+    await asyncio.sleep(WINDOW / 2)
+    assert backend.batches == []
+    await asyncio.gather(first, second)
+    later = await collector.submit(_request("c"))
+    assert backend.batches == [["req-1", "req-2"], ["req-3"]]
+    assert later.content[0].text == "re: c"
+    assert (collector.batches_submitted, collector.requests_submitted) == (2, 3)
+
+
+@pytest.mark.parametrize("status, retryable", [(529, True), (500, True), (429, True),
+                                               (400, False), (401, False)])
+async def test_local_backend_classifies_failures(client, status, retryable):
+    client.failures["a"] = [status]
+    results = await LocalBatchBackend().run({"req-1": _request("a"), "req-2": _request("b")})
+    assert isinstance(results["req-1"], BatchRequestError)
+    assert results["req-1"].retryable is retryable
+    assert results["req-2"].content[0].text == "re: b"
+
+
+async def test_transient_batch_results_are_resubmitted(client):
+    client.failures["a"] = [529, 500]
+    with batch_mode(BatchCollector(LocalBatchBackend(), flush_window=WINDOW)):
+        text = await _call_with_retries(client, _request("a"), None, 3, "a")
+    assert text == "re: a"
+    assert client.calls == ["a", "a", "a"]
+
+
+async def test_invalid_batch_results_are_not_retried(client):
+    client.failures["a"] = [400]
+    with batch_mode(BatchCollector(LocalBatchBackend(), flush_window=WINDOW)):
+        with pytest.raises(BatchRequestError):
+            await _call_with_retries(client, _request("a"), None, 3, "a")
+    assert client.calls == ["a"]
+
+
+async def test_runner_restores_sandbox_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "sandbox_concurrency", 6)
+    seen = []
+
+    async def _fail(args, tickers):
+        seen.append(settings.sandbox_concurrency)
+        raise RuntimeError("pipeline failed")
+
+    monkeypatch.setattr(batch_runner, "_run_batch", _fail)
+    args = argparse.Namespace(tickers=["acme"], tickers_file=None, sandbox_concurrency=1000)
+    with pytest.raises(RuntimeError):
+        await batch_runner.run(args)
+    assert seen == [1000]
+    assert settings.sandbox_concurrency == 6
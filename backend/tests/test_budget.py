@@ -0,0 +1,80 @@
+"""Round-budget allocation (graph/sandbox/budget.py)."""
+
+import pytest
+from graph.sandbox.budget import (
+    DISAGREEMENT_WEIGHT, MIN_PRIORITY, OBJECTION_WEIGHT, allocate_rounds, contention,
+    critic_objects, dm_disagreement, top_k_cutoff,
+)
+
+
+def _dm(total: int) -> dict:
+    """Per-metric scores summing to total (four metrics)."""
+    return {"impact": total - 30, "feasibility": 10, "risk_adjusted_return": 10,
+            "strategic_alignment": 10}
+
+
+def test_cutoff_is_midpoint_between_kth_and_next():
+    assert top_k_cutoff([60, 90, 70, 80], 3) == 65
+    assert top_k_cutoff([80, 90], 3) == 80  # fewer moves than k: the lowest
+    assert top_k_cutoff([], 3) == 0.0
+
+
+def test_dm_disagreement_is_spread_over_one_dm_maximum():
+    assert dm_disagreement({"D1": _dm(30), "D2": _dm(38)}) == pytest.approx(0.2)
+    assert dm_disagreement({"D1": _dm(30)}) == 0.0
+
+
+def test_contention_prefers_moves_near_the_cutoff():
+    near = contention(66, {}, cutoff=65, scale=5)
+    far = contention(85, {}, cutoff=65, scale=5)
+    assert near > far
+    assert contention(65, {}, cutoff=65, scale=5) == pytest.approx(1.0)
+
+
+def test_contention_adds_dm_disagreement_and_critic_objection():
+    base = contention(85, {}, cutoff=65, scale=5)
+    split = {"D1": _dm(20), "D2": _dm(40)}
+    assert contention(85, split, 65, 5) == pytest.approx(base + DISAGREEMENT_WEIGHT * 0.5)
+    assert contention(85, {}, 65, 5, objecting=True) == pytest.approx(base + OBJECTION_WEIGHT)
+
+
+def test_critic_objects_unless_it_conceded_last():
+    conceded = [{"role": "critic", "round": 1, "content": "Margins are at risk."},
+                {"role": "critic", "round": 2, "content": "I have no further objections."}]
+    assert not critic_objects(conceded)
+    assert critic_objects(conceded[:1])
+    assert critic_objects([*conceded, {"role": "critic", "round": 3, "content": "New risk: churn."}])
+    assert not critic_objects([])
+
+
+def test_rounds_split_by_largest_remainder():
+    grants = allocate_rounds({"a": 0.5, "b": 0.3, "c": 0.2}, {"a": 9, "b": 9, "c": 9}, 4)
+    # shares 2.0 / 1.2 / 0.8: floors 2 / 1 / 0, the spare round goes to c (0.8)
+    assert grants == {"a": 2, "b": 1, "c": 1}
+
+
+def test_headroom_caps_and_overflow_is_reassigned():
+    grants = allocate_rounds({"a": 1.0, "b": 1.0}, {"a": 1, "b": 10}, 6)
+    assert grants == {"a": 1, "b": 5}
+
+
+def test_low_priority_moves_get_nothing():
+    grants = allocate_rounds({"a": 1.0, "b": MIN_PRIORITY / 2}, {"a": 10, "b": 10}, 5)
+    assert grants == {"a": 5}
+
+
+def test_budget_is_never_exceeded():
+    priorities = {f"m{i}": 1.0 / (i + 1) for i in range(7)}
+    headroom = {mid: 4 for mid in priorities}
+    for rounds in range(0, 12):
+        assert sum(allocate_rounds(priorities, headroom, rounds).values()) == rounds
+
+
+def test_budget_beyond_total_headroom_stops_at_headroom():
+    grants = allocate_rounds({"a": 1.0, "b": 0.5}, {"a": 2, "b": 1}, 10)
+    assert grants == {"a": 2, "b": 1}
+
+
+def test_no_rounds_or_no_headroom_gives_no_grants():
+    assert allocate_rounds({"a": 1.0}, {"a": 3}, 0) == {}
+    assert allocate_rounds({"a": 1.0}, {"a": 0}, 5) == {}
@@ -0,0 +1,148 @@
+"""Shared chunk-inference engine (agents/chunk_engine.py)."""
+
+import asyncio
+import pytest
+from agents.chunk_engine import ChunkEngine, format_sections, parse_sections
+from agents.chunker import chunk_key
+
+CHUNKS = [f"## Section {i}\nBody {i}." for i in range(5)]
+
+
+class _Infer:
+    """Per-chunk inference with a staggered finish; records peak concurrency."""
+
+    def __init__(self, fail: set[int] = frozenset()):
+        self.fail = fail
+        self.calls: list[int] = []
+        self.active = self.peak = 0
+
+    async def __call__(self, ticker: str, chunk: str, index: int) -> str:
+        self.calls.append(index)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.001 * (len(CHUNKS) - index))  # later chunks finish first
+            if index in self.fail:
+                raise RuntimeError(f"chunk {index} failed")
+            return f"inference {index}"
+        finally:
+            self.active -= 1
+
+
+async def test_results_come_back_in_chunk_order_within_the_bound():
+    infer = _Infer()
+    results = await ChunkEngine(concurrency=2).run("trend", "ACME", CHUNKS, infer)
+    assert results == [f"inference {i}" for i in range(5)]
+    assert infer.peak == 2
+
+
+async def test_prefetched_chunks_are_reused_and_reported():
+    infer = _Infer()
+    prefetched = {chunk_key("trend", 1, CHUNKS[1]): "prefetched 1"}
+    seen = []
+    results = await ChunkEngine(concurrency=5).run(
+        "trend", "ACME", CHUNKS, infer, prefetched,
+        on_result=lambda index, chunk, inference: seen.append((index, inference)))
+    assert results[1] == "prefetched 1"
+    assert sorted(infer.calls) == [0, 2, 3, 4]
+    assert sorted(seen) == [(0, "inference 0"), (1, "prefetched 1"), (2, "inference 2"),
+                            (3, "inference 3"), (4, "inference 4")]
+
+
+async def test_failed_chunk_becomes_a_placeholder():
+    seen = []
+    results = await ChunkEngine(concurrency=5).run(
+        "trend", "ACME", CHUNKS, _Infer(fail={3}),
+        on_result=lambda index, chunk, inference: seen.append(index))
+    assert results[3] == "_Inference unavailable for section 4._"
+    assert results[4] == "inference 4"
+    assert 3 not in seen
+
+
+async def test_agent_fails_only_when_every_chunk_failed():
+    with pytest.raises(RuntimeError):
+        await ChunkEngine(concurrency=5).run("trend", "ACME", CHUNKS, _Infer(fail=set(range(5))))
+
+
+@pytest.mark.parametrize("answer", [
+    "=== SECTION 1 ===\nRevenue up.\n\n=== SECTION 2 ===\nMargins down.",
+    "## Section 1\nRevenue up.\n**Section 2:**\nMargins down.",
+    "> SECTION 2\nMargins down.\n> section 1\nRevenue up.",  # out of order
+    '{"section 1": "Revenue up.", "2": "Margins down."}',
+    '```json\n[{"section": 1, "inference": "Revenue up."}, '
+    '{"section": 2, "inference": "Margins down."}]\n```',
+    '["Revenue up.", "Margins down."]',
+])
+def test_parse_sections_accepts_markers_and_json(answer):
+    assert parse_sections(answer, [0, 1]) == {0: "Revenue up.", 1: "Margins down."}
+
+
+def test_parse_sections_keeps_only_requested_non_empty_sections():
+    answer = ("=== SECTION 3 ===\nOutlook stable.\n=== SECTION 4 ===\n\n"
+              "=== SECTION 9 ===\nStray.\n=== SECTION 3 ===\nDuplicate.")
+    assert parse_sections(answer, [2, 3]) == {2: "Outlook stable."}
+
+
+def test_parse_sections_rejects_a_json_list_of_the_wrong_length():
+    assert parse_sections('["only one"]', [0, 1]) == {}
+    assert parse_sections("no markers at all", [0, 1]) == {}
+
+
+def test_format_sections_round_trips():
+    items = [(4, "## Revenue\nUp."), (5, "## Margins\nDown.")]
+    assert parse_sections(format_sections(items), [4, 5]) == dict(items)
+
+
+class _InferMany:
+    """Answers each group with canned text (format_sections of selected items)."""
+
+    def __init__(self, answer_for):
+        self.answer_for = answer_for
+        self.groups: list[list[int]] = []
+
+    async def __call__(self, ticker: str, items: list[tuple[int, str]]) -> dict[int, str]:
+        self.groups.append([i for i, _ in items])
+        answer = self.answer_for(items)
+        return parse_sections(answer, [i for i, _ in items])
+
+
+def _answers(items, skip=()):
+    return format_sections([(i, f"grouped {i}") for i, _ in items if i not in skip])
+
+
+async def test_groups_are_sent_k_at_a_time():
+    infer, many = _Infer(), _InferMany(_answers)
+    results = await ChunkEngine(concurrency=5, chunks_per_call=2).run(
+        "trend", "ACME", CHUNKS, infer, infer_many=many)
+    assert results == [f"grouped {i}" for i in range(5)]
+    assert many.groups == [[0, 1], [2, 3], [4]]
+    assert infer.calls == []
+
+
+async def test_missing_sections_are_re_asked_one_at_a_time():
+    infer = _Infer()
+    many = _InferMany(lambda items: _answers(items, skip={1, 4}))
+    results = await ChunkEngine(concurrency=5, chunks_per_call=3).run(
+        "trend", "ACME", CHUNKS, infer, infer_many=many)
+    assert results == ["grouped 0", "inference 1", "grouped 2", "grouped 3", "inference 4"]
+    assert sorted(infer.calls) == [1, 4]
+
+
+async def test_failed_group_falls_back_to_single_calls():
+    async def broken(ticker, items):
+        raise RuntimeError("group call failed")
+
+    infer = _Infer()
+    results = await ChunkEngine(concurrency=5, chunks_per_call=5).run(
+        "trend", "ACME", CHUNKS, infer, infer_many=broken)
+    assert results == [f"inference {i}" for i in range(5)]
+    assert sorted(infer.calls) == list(range(5))
+
+
+async def test_prefetched_chunks_are_left_out_of_groups():
+    many = _InferMany(_answers)
+    prefetched = {chunk_key("trend", 0, CHUNKS[0]): "prefetched 0"}
+    results = await ChunkEngine(concurrency=5, chunks_per_call=2).run(
+        "trend", "ACME", CHUNKS, _Infer(), prefetched, infer_many=many)
+    assert results[0] == "prefetched 0"
+    assert many.groups == [[1, 2], [3, 4]]
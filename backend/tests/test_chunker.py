@@ -0,0 +1,50 @@
+"""Structure-aware chunking and its streaming variant (agents/chunker.py)."""
+
+import random
+import pytest
+from agents.chunker import IncrementalChunker, estimate_tokens, split_markdown
+from graph.layer_0.templates import FINANCIAL_DATA_TEMPLATE, NEWS_DATA_TEMPLATE
+
+DOCUMENTS = {"financial": FINANCIAL_DATA_TEMPLATE, "news": NEWS_DATA_TEMPLATE}
+
+
+def _stream(text: str, rng: random.Random, max_tokens: int) -> list[tuple[int, str]]:
+    chunker = IncrementalChunker(max_tokens)
+    emitted = []
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 80)
+        emitted += chunker.feed(text[pos:pos + step])
+        pos += step
+    return emitted + chunker.finish()
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+@pytest.mark.parametrize("max_tokens", [150, 700])
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_matches_split_markdown(name, max_tokens, seed):
+    text = DOCUMENTS[name]
+    emitted = _stream(text, random.Random(seed), max_tokens)
+    assert [i for i, _ in emitted] == list(range(len(emitted)))
+    assert [c for _, c in emitted] == split_markdown(text, max_tokens)
+
+
+def test_chunks_are_emitted_before_the_stream_ends():
+    chunker = IncrementalChunker(150)
+    early = chunker.feed(FINANCIAL_DATA_TEMPLATE)
+    assert early
+    assert len(early) + len(chunker.finish()) == len(split_markdown(FINANCIAL_DATA_TEMPLATE, 150))
+
+
+def test_tables_are_never_split():
+    for chunk in split_markdown(FINANCIAL_DATA_TEMPLATE, 50):
+        lines = chunk.split("\n")
+        if any(line.startswith("|") for line in lines):
+            table = [line for line in lines if line.startswith("|")]
+            assert len(table) >= 2  # header and separator stay with the rows
+
+
+def test_chunks_respect_the_budget_outside_tables():
+    for chunk in split_markdown(NEWS_DATA_TEMPLATE, 200):
+        if "|" not in chunk:
+            assert estimate_tokens(chunk) <= 200 * 1.5
@@ -0,0 +1,128 @@
+"""Shared circuit breaker state transitions (agents/circuit_breaker.py)."""
+
+import pytest
+from agents.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("agents.circuit_breaker.time.monotonic", lambda: now[0])
+    return now
+
+
+def _breaker(**overrides) -> CircuitBreaker:
+    return CircuitBreaker(**{"failure_threshold": 3, "recovery_seconds": 30, **overrides})
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+async def test_opens_after_consecutive_failures(clock):
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+
+
+async def test_success_resets_the_failure_count(clock):
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+async def test_open_circuit_fails_fast(clock):
+    breaker = _breaker()
+    _open(breaker)
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+    assert breaker.rejected == 1
+
+
+async def test_half_open_admits_limited_probes(clock):
+    breaker = _breaker(half_open_max_calls=1)
+    _open(breaker)
+    clock[0] += 30
+    probe = await breaker.before_call()
+    assert breaker.state == HALF_OPEN and probe is not None
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+
+
+async def test_probe_success_closes(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock[0] += 30
+    await breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert await breaker.before_call() is None
+
+
+async def test_probe_failure_reopens(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock[0] += 30
+    await breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+
+
+async def test_released_probe_frees_its_slot(clock):
+    breaker = _breaker(half_open_max_calls=1)
+    _open(breaker)
+    clock[0] += 30
+    probe = await breaker.before_call()
+    breaker.release_probe(probe)  # e.g. a 4xx: no verdict on the upstream
+    assert await breaker.before_call() == probe
+
+
+async def test_calls_admitted_while_closed_hold_no_probe_slot(clock):
+    breaker = _breaker(half_open_max_calls=1)
+    closed_call = await breaker.before_call()
+    _open(breaker)
+    clock[0] += 30
+    await breaker.before_call()
+    breaker.release_probe(closed_call)
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+
+
+async def test_probe_from_an_earlier_half_open_period_is_ignored(clock):
+    breaker = _breaker(half_open_max_calls=1)
+    _open(breaker)
+    clock[0] += 30
+    stale = await breaker.before_call()
+    breaker.record_failure()  # another probe failed: open again
+    clock[0] += 30
+    current = await breaker.before_call()
+    assert current != stale
+    breaker.release_probe(stale)
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+
+
+async def test_queue_behavior_waits_for_recovery(monkeypatch):
+    breaker = _breaker(recovery_seconds=0.05, open_behavior="queue", max_queue_wait=5)
+    _open(breaker)
+    assert await breaker.before_call() is not None
+    assert breaker.state == HALF_OPEN
+
+
+async def test_queue_behavior_gives_up_after_max_wait():
+    breaker = _breaker(recovery_seconds=60, open_behavior="queue", max_queue_wait=0.05)
+    _open(breaker)
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+    assert breaker.rejected == 1
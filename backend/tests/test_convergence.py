@@ -0,0 +1,108 @@
+"""Negotiation convergence detection (graph/sandbox/convergence.py, subgraph check)."""
+
+import pytest
+from config.settings import settings
+from graph.sandbox.convergence import convergence_reason, critic_conceded, round_novelty
+from graph.sandbox.subgraph import check_convergence
+
+ROUND_1 = [
+    {"role": "critic", "round": 1, "content":
+        "The pricing power argument ignores mid-market churn and the competitive "
+        "response from hyperscalers."},
+    {"role": "D1", "round": 1, "content":
+        "Enterprise churn is low and switching costs protect recurring revenue."},
+]
+
+
+def _round_2(critic: str, dm: str) -> list[dict]:
+    return ROUND_1 + [
+        {"role": "critic", "round": 2, "content": critic},
+        {"role": "D1", "round": 2, "content": dm},
+    ]
+
+
+NEW_DM_POINT = "Bundled premium support offsets the increase for most accounts."
+
+
+@pytest.mark.parametrize("text", [
+    "My concerns have been largely addressed; I have no further objections.",
+    "Given the churn data, I withdraw my remaining objections.",
+    "I see no remaining concerns with the rollout plan.",
+    "My remaining concerns are resolved by the phased rollout.",
+    "I am satisfied that the downside is contained.",
+    "On balance I concede the argument.",
+])
+def test_concession_phrases(text):
+    conversation = _round_2(f"The phased plan answers the margin question. {text}", NEW_DM_POINT)
+    assert critic_conceded(conversation, 2)
+    assert convergence_reason(conversation, 2) == "critic_conceded"
+
+
+@pytest.mark.parametrize("text", [
+    "I concede that enterprise churn is low, but margin risk remains.",
+    "I acknowledge the switching-cost point; the downside is still unpriced.",
+    "Do you have no further objections to the capex plan, or only to its timing?",
+    "I am not satisfied with the evidence on mid-market retention.",
+])
+def test_partial_concessions_do_not_count(text):
+    conversation = _round_2(f"{text} Integration costs are still unaccounted for.", NEW_DM_POINT)
+    assert not critic_conceded(conversation, 2)
+    assert convergence_reason(conversation, 2) == ""
+
+
+def test_only_the_critic_can_concede():
+    conversation = _round_2("Integration costs are still unaccounted for in the forecast.",
+                            "I have no further objections to the critic's view.")
+    assert not critic_conceded(conversation, 2)
+
+
+def test_repeated_round_is_detected():
+    conversation = _round_2(
+        "Again, the pricing power argument ignores mid-market churn and the competitive response.",
+        "As noted, enterprise churn is low and switching costs protect recurring revenue.",
+    )
+    assert round_novelty(conversation, 2) < settings.sandbox_convergence_min_novelty
+    assert convergence_reason(conversation, 2) == "repetition"
+
+
+def test_new_arguments_are_not_repetition():
+    conversation = _round_2(
+        "Integration costs for the bundled support tier are missing from the forecast.",
+        NEW_DM_POINT,
+    )
+    assert round_novelty(conversation, 2) > 0.8
+    assert convergence_reason(conversation, 2) == ""
+
+
+def test_first_round_is_never_repetition():
+    assert round_novelty(ROUND_1, 1) == 1.0
+    assert convergence_reason(ROUND_1, 1) == ""
+
+
+def _state(conversation: list[dict], current_round: int, max_rounds: int = 3) -> dict:
+    return {"move_document": {"move_id": "m1"}, "conversation": conversation,
+            "current_round": current_round, "max_rounds": max_rounds}
+
+
+REPEATED = _round_2("Again, the pricing power argument ignores mid-market churn and the competitive response.",
+                    "As noted, enterprise churn is low and switching costs protect recurring revenue.")
+
+
+def test_check_convergence_disabled_runs_to_max_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "sandbox_convergence_enabled", False)
+    assert check_convergence(_state(REPEATED, 2))["stop_reason"] == ""
+    assert check_convergence(_state(REPEATED, 3, max_rounds=3))["stop_reason"] == "max_rounds"
+
+
+def test_check_convergence_stops_early(monkeypatch):
+    monkeypatch.setattr(settings, "sandbox_convergence_enabled", True)
+    monkeypatch.setattr(settings, "sandbox_convergence_min_rounds", 2)
+    update = check_convergence(_state(REPEATED, 2))
+    assert update["stop_reason"] == "repetition"
+    assert update["status_updates"][0]["event"] == "sandbox_converged"
+
+
+def test_check_convergence_respects_min_rounds(monkeypatch):
+    monkeypatch.setattr(settings, "sandbox_convergence_enabled", True)
+    monkeypatch.setattr(settings, "sandbox_convergence_min_rounds", 3)
+    assert check_convergence(_state(REPEATED, 2, max_rounds=4))["stop_reason"] == ""
@@ -0,0 +1,131 @@
+"""LLM dispatcher: token buckets, FIFO admission and AIMD concurrency (agents/dispatcher.py)."""
+
+import asyncio
+import pytest
+from agents.dispatcher import DECREASE_COOLDOWN_SECONDS, LLMDispatcher, TokenBucket, estimate_request_tokens
+
+
+def _dispatcher(**overrides) -> LLMDispatcher:
+    options = dict(requests_per_minute=0, input_tokens_per_minute=0, output_tokens_per_minute=0,
+                   initial_concurrency=4, min_concurrency=1, max_concurrency=8)
+    return LLMDispatcher(**{**options, **overrides})
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(0)
+    bucket.consume(1_000_000)
+    assert bucket.delay_for(1_000_000) == 0.0
+
+
+def test_bucket_delay_matches_refill_rate():
+    bucket = TokenBucket(600)  # 10 tokens/s
+    bucket.consume(600)
+    assert bucket.delay_for(50) == pytest.approx(5.0, abs=0.05)
+
+
+def test_bucket_waits_for_at_most_a_full_bucket():
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+    assert bucket.delay_for(10_000) == pytest.approx(60.0, abs=0.05)
+
+
+def test_bucket_debt_delays_later_requests():
+    bucket = TokenBucket(600)
+    bucket.consume(900)  # actual usage above the admission estimate
+    assert bucket.delay_for(1) == pytest.approx(30.1, abs=0.05)
+
+
+def test_estimate_request_tokens_counts_system_and_messages():
+    request = {"system": [{"type": "text", "text": "s" * 400}],
+               "messages": [{"role": "user", "content": "u" * 800}]}
+    assert estimate_request_tokens(request) == 300
+
+
+async def test_slot_charges_input_and_output_buckets_separately():
+    dispatcher = _dispatcher(input_tokens_per_minute=10_000, output_tokens_per_minute=2_000)
+    async with dispatcher.slot(1_000, 500) as charge:
+        assert dispatcher.itpm.tokens == pytest.approx(9_000, abs=5)
+        assert dispatcher.otpm.tokens == pytest.approx(1_500, abs=5)
+        charge["input"] = 400   # cache reads are not charged
+        charge["output"] = 120  # max_tokens was reserved; 120 were written
+    assert dispatcher.itpm.tokens == pytest.approx(9_600, abs=5)
+    assert dispatcher.otpm.tokens == pytest.approx(1_880, abs=5)
+    assert dispatcher.in_flight == 0
+
+
+async def test_output_bucket_throttles_admission():
+    dispatcher = _dispatcher(output_tokens_per_minute=600)
+    await dispatcher.acquire(10, 600)
+    assert dispatcher._admission_delay(_queued(dispatcher), 10, 60) == pytest.approx(6.0, abs=0.05)
+
+
+def _queued(dispatcher: LLMDispatcher) -> object:
+    ticket = object()
+    dispatcher._waiters.append(ticket)
+    return ticket
+
+
+async def test_concurrency_limit_is_fifo():
+    dispatcher = _dispatcher(initial_concurrency=1, max_concurrency=1)
+    order = []
+
+    async def call(name: str):
+        async with dispatcher.slot(1):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[call(n) for n in "abcd"])
+    assert order == list("abcd")
+    assert dispatcher.max_queue_depth == 3
+    assert dispatcher.total_admitted == 4
+
+
+async def test_waiter_is_admitted_when_a_slot_frees():
+    dispatcher = _dispatcher(initial_concurrency=1, max_concurrency=1)
+    await dispatcher.acquire(1)
+    waiter = asyncio.ensure_future(dispatcher.acquire(1))
+    await asyncio.sleep(0.01)
+    assert not waiter.done() and dispatcher.queue_depth == 1
+    await dispatcher.release()
+    await asyncio.wait_for(waiter, 1)
+    assert dispatcher.in_flight == 1 and dispatcher.queue_depth == 0
+
+
+def test_additive_increase_adds_about_one_slot_per_window():
+    dispatcher = _dispatcher(initial_concurrency=4)
+    for _ in range(4):
+        dispatcher.on_success()
+    assert dispatcher.limit == pytest.approx(4.9, abs=0.05)
+    for _ in range(100):
+        dispatcher.on_success()
+    assert dispatcher.limit == 8  # max_concurrency
+
+
+def test_multiplicative_decrease_once_per_burst(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("agents.dispatcher.time.monotonic", lambda: now[0])
+    dispatcher = _dispatcher(initial_concurrency=8)
+    dispatcher.on_overload(None)
+    dispatcher.on_overload(None)  # same burst: ignored
+    assert dispatcher.limit == 4
+    now[0] += DECREASE_COOLDOWN_SECONDS
+    dispatcher.on_overload(None)
+    assert dispatcher.limit == 2
+    assert dispatcher.total_throttled == 3
+
+
+def test_decrease_stops_at_min_concurrency(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("agents.dispatcher.time.monotonic", lambda: now[0])
+    dispatcher = _dispatcher(initial_concurrency=4, min_concurrency=2)
+    for _ in range(5):
+        dispatcher.on_overload(None)
+        now[0] += DECREASE_COOLDOWN_SECONDS
+    assert dispatcher.limit == 2
+
+
+def test_retry_after_pauses_admission():
+    dispatcher = _dispatcher()
+    dispatcher.on_overload(3.0)
+    assert dispatcher._admission_delay(_queued(dispatcher), 1, 1) == pytest.approx(3.0, abs=0.05)
+    assert dispatcher.stats()["paused_for_seconds"] > 2.9
@@ -0,0 +1,122 @@
+"""Hedged requests: delay percentile, budget and cancellation (agents/hedging.py)."""
+
+import asyncio
+import pytest
+from agents.hedging import Hedger
+from agents.telemetry import LLMTelemetry, llm_tags
+from models.schemas import CostSummary
+
+KEY = ("critic", 1024)
+
+
+class _Dispatcher:
+    queue_depth = 0
+
+
+@pytest.fixture(autouse=True)
+def dispatcher(monkeypatch):
+    fake = _Dispatcher()
+    monkeypatch.setattr("agents.hedging.get_dispatcher", lambda: fake)
+    return fake
+
+
+def _hedger(budget: float = 1.0) -> Hedger:
+    hedger = Hedger(percentile=95, min_samples=5, budget=budget, min_delay=0.01)
+    for _ in range(40):
+        hedger._observe(KEY, 0.01)
+    return hedger
+
+
+def _attempts(*seconds: float):
+    """attempt() whose n-th call sleeps seconds[n] and returns n."""
+    calls = iter(enumerate(seconds))
+
+    async def attempt():
+        n, delay = next(calls)
+        await asyncio.sleep(delay)
+        return n
+    return attempt
+
+
+def test_no_delay_until_min_samples():
+    hedger = Hedger(percentile=95, min_samples=5, budget=1.0, min_delay=0.01)
+    for _ in range(4):
+        hedger._observe(KEY, 1.0)
+    assert hedger.delay_for(KEY) is None
+    hedger._observe(KEY, 1.0)
+    assert hedger.delay_for(KEY) == 1.0
+
+
+def test_delay_is_the_latency_percentile():
+    hedger = Hedger(percentile=90, min_samples=1, budget=1.0, min_delay=0.0)
+    for seconds in range(1, 11):
+        hedger._observe(KEY, float(seconds))
+    assert hedger.delay_for(KEY) == 10.0
+    assert hedger.delay_for(("critic", 2048)) is None
+
+
+async def test_fast_call_is_not_hedged():
+    hedger = _hedger()
+    assert await hedger.run(KEY, _attempts(0.0)) == 0
+    assert hedger.stats()["hedges_sent"] == 0
+
+
+async def test_slow_call_is_hedged_and_loser_reported():
+    hedger = _hedger()
+    cancelled = []
+    result = await hedger.run(KEY, _attempts(1.0, 0.01),
+                              lambda *args: cancelled.append(args))
+    assert result == 1
+    assert hedger.stats() == {"calls": 1, "hedges_sent": 1, "hedges_won": 1, "hedges_cancelled": 1}
+    (winner_result, loser_seconds, winner_seconds), = cancelled
+    assert winner_result == 1
+    assert loser_seconds > winner_seconds
+
+
+async def test_budget_caps_hedges():
+    hedger = _hedger(budget=0.5)
+    for _ in range(4):
+        await hedger.run(KEY, _attempts(0.2, 0.01))
+    # hedges_sent < budget × calls: calls 1 and 3 may hedge, 2 and 4 may not
+    assert hedger.stats()["calls"] == 4
+    assert hedger.stats()["hedges_sent"] == 2
+
+
+async def test_no_hedge_while_dispatcher_is_queueing(dispatcher):
+    dispatcher.queue_depth = 3
+    hedger = _hedger()
+    assert await hedger.run(KEY, _attempts(0.05)) == 0
+    assert hedger.stats()["hedges_sent"] == 0
+
+
+async def test_error_waits_for_the_other_attempt():
+    hedger = _hedger()
+    calls = iter([0.05, 0.1])
+
+    async def attempt():
+        delay = next(calls)
+        await asyncio.sleep(delay)
+        if delay == 0.05:
+            raise TimeoutError
+        return "hedge"
+    assert await hedger.run(KEY, attempt) == "hedge"
+
+
+async def test_error_propagates_when_every_attempt_fails():
+    hedger = _hedger()
+
+    async def attempt():
+        await asyncio.sleep(0.05)
+        raise TimeoutError
+    with pytest.raises(TimeoutError):
+        await hedger.run(KEY, attempt)
+
+
+def test_cancelled_hedges_reach_the_cost_summary():
+    sink = LLMTelemetry()
+    with llm_tags(analysis_id="a1", layer=3, node="critic"):
+        sink.record("claude-haiku-4-5", "ok", 1.0, input_tokens=1000, output_tokens=200)
+        sink.record("claude-haiku-4-5", "hedge_cancelled", 0.8, input_tokens=1000, output_tokens=150)
+    summary = CostSummary(**sink.analysis_summary("a1"))
+    assert (summary.calls, summary.hedges_cancelled) == (1, 1)
+    assert summary.output_tokens == 350
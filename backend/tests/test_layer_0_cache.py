@@ -0,0 +1,37 @@
+"""Per-ticker Layer 0 artifact cache (graph/layer_0/cache.py)."""
+
+import pytest
+from config.settings import settings
+from graph.layer_0 import cache as layer_0_cache
+from graph.layer_0.cache import invalidate_layer_0, load_layer_0, store_layer_0
+
+
+@pytest.fixture(autouse=True)
+def layer_0_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "layer_0_cache_enabled", True)
+    monkeypatch.setattr(settings, "layer_0_cache_path", str(tmp_path / "layer_0.sqlite3"))
+    monkeypatch.setattr(layer_0_cache, "_cache", None)
+
+
+async def test_round_trip_normalizes_the_ticker():
+    await store_layer_0(" amzn ", "# financial", "# news")
+    assert await load_layer_0("AMZN") == {"financial_data_raw": "# financial",
+                                          "news_data_raw": "# news"}
+    assert await load_layer_0("MSFT") is None
+
+
+async def test_invalidate_one_ticker_or_all():
+    for ticker in ("AMZN", "MSFT", "NVDA"):
+        await store_layer_0(ticker, "f", "n")
+    assert await invalidate_layer_0("amzn") == 1
+    assert await invalidate_layer_0("amzn") == 0
+    assert await load_layer_0("AMZN") is None
+    assert await invalidate_layer_0() == 2
+    assert await load_layer_0("MSFT") is None
+
+
+async def test_disabled_cache_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(settings, "layer_0_cache_enabled", False)
+    await store_layer_0("AMZN", "f", "n")
+    assert await load_layer_0("AMZN") is None
+    assert await invalidate_layer_0() == 0
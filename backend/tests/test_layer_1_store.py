@@ -0,0 +1,57 @@
+"""Layer 1 chunk-inference store (graph/layer_1/store.py)."""
+
+import pytest
+from agents.chunker import chunk_key
+from config.settings import settings
+from graph.layer_1 import store as layer_1_store
+from graph.layer_1.store import InferenceWriter, load_inferences
+
+CHUNKS = ["## Revenue\nGrew 12%.", "## Margins\nDown 1pp.", "## Outlook\nStable."]
+
+
+@pytest.fixture(autouse=True)
+def chunk_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "layer_1_store_enabled", True)
+    monkeypatch.setattr(settings, "layer_1_store_path", str(tmp_path / "layer_1.sqlite3"))
+    monkeypatch.setattr(settings, "llm_model_routes", {})
+    monkeypatch.setattr(layer_1_store, "_store", None)
+
+
+async def _write(stored: dict, results: dict[int, str]) -> InferenceWriter:
+    writer = InferenceWriter("trend", "persona", "ACME", stored)
+    for index, inference in results.items():
+        writer(index, CHUNKS[index], inference)
+    await writer.flush()
+    return writer
+
+
+async def test_written_inferences_are_reused_by_content():
+    await _write({}, {0: "revenue note", 1: "margin note"})
+    moved = [CHUNKS[2], CHUNKS[0]]  # positions changed, content did not
+    found = await load_inferences("trend", "persona", "acme", moved)
+    assert found == {chunk_key("trend", 1, CHUNKS[0]): "revenue note"}
+
+
+async def test_empty_and_unchanged_inferences_are_not_written(monkeypatch):
+    await _write({}, {0: "revenue note"})
+    stored = await load_inferences("trend", "persona", "ACME", CHUNKS)
+    writes = []
+    real_put_many = layer_1_store.get_chunk_store().put_many
+    monkeypatch.setattr(layer_1_store.get_chunk_store(), "put_many",
+                        lambda items: writes.append(dict(items)) or real_put_many(items))
+    await _write(stored, {0: "revenue note", 1: "", 2: "outlook note"})
+    assert len(writes) == 1
+    assert list(writes[0].values()) == ["outlook note"]
+
+
+async def test_persona_and_model_are_part_of_the_key(monkeypatch):
+    await _write({}, {0: "revenue note"})
+    assert await load_inferences("trend", "other persona", "ACME", CHUNKS) == {}
+    monkeypatch.setattr(settings, "llm_model_routes", {"trend_inference": "claude-sonnet-4-5"})
+    assert await load_inferences("trend", "persona", "ACME", CHUNKS) == {}
+
+
+async def test_disabled_store_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(settings, "layer_1_store_enabled", False)
+    await _write({}, {0: "revenue note"})
+    assert await load_inferences("trend", "persona", "ACME", CHUNKS) == {}
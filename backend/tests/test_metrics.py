@@ -0,0 +1,94 @@
+"""Pipe-table parsing and deterministic metrics (utils/documents.py, graph/layer_1/metrics.py)."""
+
+import math
+import warnings
+import numpy as np
+import pytest
+from graph.layer_0.templates import FINANCIAL_DATA_TEMPLATE
+from graph.layer_1.metrics import compute_metrics, is_table_only, render_metrics
+from utils.documents import parse_markdown_tables, parse_number
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("$1,205M", (1_205e6, "$")),
+    ("**$29M**", (29e6, "$")),
+    ("$4.2B", (4.2e9, "$")),
+    ("$84.20", (84.20, "$")),
+    ("+18.2%", (18.2, "%")),
+    ("-4.5%", (-4.5, "%")),
+    ("−4.5%", (-4.5, "%")),
+    ("(12)", (-12.0, "")),
+    ("($3M)", (-3e6, "$")),
+    ("34.2x", (34.2, "x")),
+    ("2.1M", (2.1e6, "")),
+    ("1,088", (1088.0, "")),
+])
+def test_parse_number(cell, expected):
+    value, unit = parse_number(cell)
+    assert value == pytest.approx(expected[0])
+    assert unit == expected[1]
+
+
+@pytest.mark.parametrize("cell", ["n/a", "Growing steadily", "", "Q1 2025"])
+def test_non_numeric_cells_are_nan(cell):
+    value, unit = parse_number(cell)
+    assert math.isnan(value) and unit == ""
+
+
+def _table(title: str):
+    return next(t for t in parse_markdown_tables(FINANCIAL_DATA_TEMPLATE) if t.title == title)
+
+
+def test_template_tables_are_found_with_titles():
+    titles = [t.title for t in parse_markdown_tables(FINANCIAL_DATA_TEMPLATE)]
+    assert titles[:4] == ["Quarterly Revenue", "Revenue by Segment", "Revenue by Geography",
+                          "Income Statement (Quarterly)"]
+
+
+def test_header_units_scale_plain_numbers():
+    revenue = _table("Quarterly Revenue")
+    assert revenue.row_labels == ["Q1 2025", "Q2 2025", "Q3 2025", "Q4 2025"]
+    assert revenue.units == ["$", "%", "%"]
+    np.testing.assert_allclose(revenue.column("Revenue ($M)"), [312e6, 298e6, 285e6, 310e6])
+    np.testing.assert_allclose(revenue.column("QoQ Change"), [3.1, -4.5, -4.4, 8.8])
+
+
+def test_text_columns_are_not_numeric():
+    segments = _table("Revenue by Segment")
+    assert "YoY Trend" in segments.columns
+    assert segments.columns.index("YoY Trend") not in segments.numeric_columns()
+    np.testing.assert_allclose(segments.column("FY 2025"), [812e6, 256e6, 137e6])
+
+
+def test_template_metrics():
+    metrics = compute_metrics(FINANCIAL_DATA_TEMPLATE)
+    assert ("Professional Services: $78M (Q1 2025) → $55M (Q4 2025), -29.5% overall; "
+            "per period -16.7%, -10.8%, -5.2%") in metrics["Revenue by Segment"]
+    assert ("YoY Change: 18.2% (Q1 2025) → 6.3% (Q4 2025), -11.9pp overall; "
+            "per period -5.8pp, -4.3pp, -1.8pp") in metrics["Quarterly Revenue"]
+    assert "North America share of total: 64.9%" in metrics["Revenue by Geography"]
+    assert "P/S Ratio: 3.48x vs 7.20x sector avg (-51.7%)" in metrics["Key Ratios"]
+    assert any(f.startswith("Anomaly — Cloud Platform moved +11.8% from Q3 2025 to Q4 2025")
+               for f in metrics["Revenue by Segment"])
+
+
+def test_margins_are_computed_against_revenue():
+    facts = compute_metrics(FINANCIAL_DATA_TEMPLATE)["Income Statement (Quarterly)"]
+    assert any(f.startswith("Gross Profit / Revenue: ") for f in facts)
+
+
+def test_series_without_measurable_moves_do_not_warn():
+    doc = ("## Quarterly Lines\n\n| Line | Q1 2025 | Q2 2025 | Q3 2025 |\n|---|---|---|---|\n"
+           "| A | n/a | n/a | n/a |\n| B | $0 | $0 | $5M |\n| C | $10M | $12M | $15M |\n")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        metrics = compute_metrics(doc)
+    assert [f.split(":")[0] for f in metrics["Quarterly Lines"]] == ["C"]
+
+
+def test_render_and_table_only_chunks():
+    assert render_metrics({}) == ""
+    section = render_metrics({"Revenue": ["a", "b"]})
+    assert section.startswith("## Computed Metrics") and "**Revenue**\n- a\n- b" in section
+    assert is_table_only("## Revenue\n\n| Q | $ |\n|---|---|\n| Q1 | 1 |")
+    assert not is_table_only("## Revenue\n\n| Q | $ |\n|---|---|\n| Q1 | 1 |\n\nGrew fast.")
@@ -0,0 +1,88 @@
+"""End-to-end pipeline run on the fake Messages API (LLM_BACKEND=fake, agents/fake_llm.py)."""
+
+import uuid
+import pytest
+from agents import llm
+from agents.telemetry import telemetry
+from api import routes
+from config.settings import settings
+from graph.pipeline import build_pipeline
+
+ROUNDS = 2
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    overrides = {
+        "llm_backend": "fake",
+        "anthropic_base_url": "",
+        "fake_llm_latency_ms": 2.0,
+        "fake_llm_latency_sigma": 0.1,
+        "fake_llm_ms_per_token": 0.0,
+        "llm_cache_enabled": False,
+        "layer_0_cache_enabled": False,
+        "layer_0_data_source": "llm",
+        "layer_1_store_enabled": False,
+        "sandbox_stream_deltas": False,
+        "num_negotiation_rounds": ROUNDS,
+    }
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(llm, "_client", None)
+
+
+async def _run(ticker: str = "ACME") -> tuple[dict, dict]:
+    analysis_id = str(uuid.uuid4())
+    routes.active_analyses[analysis_id] = {"status": "running", "ticker": ticker}
+    try:
+        await routes._run_pipeline(analysis_id, ticker)
+        return routes.active_analyses[analysis_id], telemetry.analysis_summary(analysis_id)
+    finally:
+        routes.active_analyses.pop(analysis_id, None)
+
+
+def _moves(result: dict) -> list[dict]:
+    return result["recommended_moves"] + result["other_moves"]
+
+
+@pytest.mark.parametrize("streaming_handoff", [True, False])
+async def test_pipeline_completes_on_fake_backend(fake_backend, monkeypatch, streaming_handoff):
+    monkeypatch.setattr(settings, "sandbox_streaming_handoff", streaming_handoff)
+    monkeypatch.setattr(routes, "pipeline", build_pipeline())  # the graph shape depends on it
+    analysis, summary = await _run()
+    assert analysis["status"] == "complete"
+    result = analysis["result"]
+
+    assert "ACME" in result["financial_data_raw"] and result["news_data_raw"]
+    assert result["f1"].startswith("# Financial Inference — ACME")
+    assert result["f2"].startswith("# Market Trend Inference — ACME")
+
+    moves = result["move_suggestions"]
+    assert len(moves) == 3 * settings.num_analyst_agents
+    assert len(result["recommended_moves"]) == 3
+    assert {m["move_id"] for m in _moves(result)} == {m["move_id"] for m in moves}
+    totals = [m["total_score"] for m in result["recommended_moves"]]
+    assert totals == sorted(totals, reverse=True)
+    assert min(totals) >= max(m["total_score"] for m in result["other_moves"])
+    assert all(m.get("rounds") == ROUNDS for m in _moves(result))
+    assert len(result["conversation_logs"]) == len(moves)
+
+    assert summary["errors"] == 0
+    assert set(summary["by_layer"]) == {"0", "1", "2", "3"}
+    assert summary["by_layer"]["3"]["calls"] > 0
+
+
+async def test_pipeline_is_deterministic_on_fake_backend(fake_backend):
+    first, _ = await _run()
+    second, _ = await _run()
+    scores = [{m["move_id"]: m["total_score"] for m in _moves(run["result"])} for run in (first, second)]
+    assert scores[0] == scores[1]
+
+
+async def test_tournament_spends_fewer_layer_3_calls(fake_backend, monkeypatch):
+    _, full = await _run()
+    monkeypatch.setattr(settings, "sandbox_tournament_enabled", True)
+    analysis, tournament = await _run()
+    assert analysis["status"] == "complete"
+    assert tournament["by_layer"]["3"]["calls"] < full["by_layer"]["3"]["calls"]
+    assert len(analysis["result"]["recommended_moves"]) == 3
@@ -0,0 +1,68 @@
+"""Layer 1 prefetch from the streamed Layer 0 documents (graph/layer_0/node.py)."""
+
+import asyncio
+import pytest
+from agents.chunker import split_markdown
+from config.settings import settings
+from graph.layer_0.node import _ChunkPrefetcher
+
+SECTIONS = ["## Revenue\n" + "Revenue grew twelve percent. " * 8,
+            "## Margins\n" + "Gross margin fell one point. " * 8,
+            "## Outlook\n" + "Guidance was left unchanged. " * 8]
+
+
+class _Engine:
+    """infer_one that records its chunks and waits until released."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    async def infer_one(self, infer, ticker, chunk, index):
+        self.started.append(chunk)
+        await self.release.wait()
+        return f"inference {index}"
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = _Engine()
+    monkeypatch.setattr(settings, "layer_1_chunk_tokens", 60)
+    monkeypatch.setattr("graph.layer_0.node.get_chunk_engine", lambda: fake)
+    return fake
+
+
+async def _stream(on_delta, text: str) -> None:
+    for line in text.splitlines(keepends=True):
+        await on_delta(line)
+
+
+async def test_streamed_chunks_are_prefetched(engine):
+    document = "\n\n".join(SECTIONS)
+    prefetcher = _ChunkPrefetcher("ACME")
+    await _stream(prefetcher.on_delta("trend", None), document)
+    engine.release.set()
+    prefetched = await prefetcher.collect({"trend": document})
+    assert len(prefetched) == len(split_markdown(document, 60))
+
+
+async def test_reset_restarts_the_chunker_and_cancels_the_failed_attempt(engine):
+    failed = "\n\n".join(SECTIONS[:2]) + "\n\n## Outl"
+    final = "\n\n".join([SECTIONS[0].replace("twelve", "ten"), *SECTIONS[1:]])
+    prefetcher = _ChunkPrefetcher("ACME")
+    on_delta = prefetcher.on_delta("trend", None)
+    await _stream(on_delta, failed)
+    stale = dict(prefetcher.tasks)
+    assert stale
+
+    await on_delta("", reset=True)
+    await asyncio.sleep(0)
+    assert prefetcher.tasks == {}
+    assert all(task.cancelled() for task in stale.values())
+
+    await _stream(on_delta, final)
+    engine.release.set()
+    prefetched = await prefetcher.collect({"trend": final})
+    # the restarted stream is chunked on its own, not appended to the failed one
+    assert len(prefetched) == len(split_markdown(final, 60))
+    assert not any("## Outl" in chunk and "## Outlook" not in chunk for chunk in engine.started)
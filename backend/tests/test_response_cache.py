@@ -0,0 +1,124 @@
+"""Persistent LRU/TTL response cache (agents/cache.py)."""
+
+import pytest
+from agents import cache as cache_module
+from agents.cache import TOUCH_FLUSH_EVERY, PersistentLRUCache, request_fingerprint
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def _cache(tmp_path, max_entries: int = 10, ttl_seconds: int = 0) -> PersistentLRUCache:
+    return PersistentLRUCache(str(tmp_path / "nested" / "cache.sqlite3"), max_entries, ttl_seconds)
+
+
+def _accessed_at(cache: PersistentLRUCache, key: str) -> float:
+    return cache._conn.execute("SELECT accessed_at FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_fingerprint_ignores_key_order_but_not_content():
+    a = {"model": "m", "max_tokens": 10, "messages": [{"role": "user", "content": "hi"}]}
+    b = {"messages": [{"content": "hi", "role": "user"}], "max_tokens": 10, "model": "m"}
+    assert request_fingerprint(a) == request_fingerprint(b)
+    assert request_fingerprint(a) != request_fingerprint({**a, "max_tokens": 11})
+    assert len(request_fingerprint(a)) == 64
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+    _cache(tmp_path).put("k", "value")
+    reopened = _cache(tmp_path)
+    assert reopened.get("k") == "value"
+    assert reopened.get("missing") is None
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+
+def test_expired_entries_are_deleted_and_not_re_touched(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.put("k", "value")
+    clock.now += 30
+    assert cache.get("k") == "value"
+    assert "k" in cache._touched
+    clock.now += 31
+    assert cache.get("k") is None
+    assert "k" not in cache._touched
+    assert cache.stats()["size"] == 0
+
+
+def test_zero_ttl_never_expires(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=0)
+    cache.put("k", "value")
+    clock.now += 10 ** 9
+    assert cache.get("k") == "value"
+
+
+def test_least_recently_accessed_entries_are_evicted(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=3)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.put(key, key)
+    clock.now += 1
+    assert cache.get("a") == "a"  # a is now more recent than b and c
+    clock.now += 1
+    cache.put("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 3
+
+
+def test_put_many_evicts_once_for_the_whole_batch(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=3)
+    cache.put("old", "old")
+    clock.now += 1
+    cache.put_many({f"k{i}": str(i) for i in range(3)})
+    assert cache.get("old") is None
+    assert cache.get_many(["k0", "k1", "k2", "old"]) == {"k0": "0", "k1": "1", "k2": "2"}
+    assert cache.evictions == 1
+
+
+def test_touches_are_buffered_until_the_threshold(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=1000)
+    keys = [f"k{i}" for i in range(TOUCH_FLUSH_EVERY)]
+    cache.put_many({key: key for key in keys})
+    clock.now += 5
+    for key in keys[:-1]:
+        cache.get(key)
+    assert _accessed_at(cache, keys[0]) == 1_000.0  # not written yet
+    assert len(cache._touched) == TOUCH_FLUSH_EVERY - 1
+    cache.get(keys[-1])
+    assert cache._touched == {}
+    assert _accessed_at(cache, keys[0]) == 1_005.0
+
+
+def test_pending_touches_are_flushed_before_eviction(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=2)
+    cache.put("a", "a")
+    clock.now += 1
+    cache.put("b", "b")
+    clock.now += 1
+    cache.get("a")  # buffered only
+    clock.now += 1
+    cache.put("c", "c")
+    assert cache.get("a") == "a"
+    assert cache.get("b") is None
+
+
+def test_delete_and_clear(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.put_many({"a": "1", "b": "2"})
+    cache.get("a")
+    assert cache.delete("a") and not cache.delete("a")
+    assert "a" not in cache._touched
+    cache.clear()
+    assert cache.stats()["size"] == 0
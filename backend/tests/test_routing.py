@@ -0,0 +1,126 @@
+"""Per-role model routing and escalation on invalid output (agents/routing.py, agents/base.py)."""
+
+import json
+from types import SimpleNamespace
+import pytest
+from agents import cache as response_cache
+from agents.base import call_llm
+from agents.routing import (
+    DEFAULT_MAX_TOKENS, ROLE_ROUTES, escalation_model, max_tokens_for, model_for,
+)
+from agents.telemetry import llm_tags
+from config.settings import settings
+
+FAST, DEFAULT, STRONG = "claude-haiku-4-5", "claude-sonnet-4-5", "claude-opus-4-1"
+
+
+class _Client:
+    """messages.create() answering from `answers` per model, recording each request."""
+
+    def __init__(self, answers: dict[str, str]):
+        self.answers = answers
+        self.requests: list[dict] = []
+        self.messages = self
+
+    async def create(self, **request):
+        self.requests.append(request)
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.answers[request["model"]])],
+                               usage=usage)
+
+    @property
+    def models(self) -> list[str]:
+        return [r["model"] for r in self.requests]
+
+
+@pytest.fixture(autouse=True)
+def tiers(monkeypatch, tmp_path):
+    overrides = {
+        "llm_fast_model": FAST, "llm_model": DEFAULT, "llm_escalation_model": STRONG,
+        "llm_model_routes": {}, "llm_hedging_enabled": False,
+        "llm_cache_enabled": True, "llm_cache_path": str(tmp_path / "responses.sqlite3"),
+    }
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+
+
+def _client(monkeypatch, answers: dict[str, str]) -> _Client:
+    client = _Client(answers)
+    monkeypatch.setattr("agents.base.get_anthropic_client", lambda: client)
+    return client
+
+
+def _is_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def test_roles_resolve_to_their_tier_model():
+    assert model_for("financial_inference") == FAST
+    assert model_for("score_move") == FAST
+    assert model_for("critic") == DEFAULT
+    assert model_for(None) == DEFAULT
+    assert model_for("unknown_role") == DEFAULT
+    assert all(model_for(role) in (FAST, DEFAULT) for role in ROLE_ROUTES)
+
+
+def test_route_overrides_and_unset_strong_tier(monkeypatch):
+    monkeypatch.setattr(settings, "llm_model_routes", {"critic": STRONG})
+    assert model_for("critic") == STRONG
+    assert model_for("decision_maker") == DEFAULT
+    monkeypatch.setattr(settings, "llm_escalation_model", "")
+    monkeypatch.setitem(ROLE_ROUTES, "judge", {"tier": "strong", "max_tokens": 100})
+    assert model_for("judge") == DEFAULT
+
+
+def test_max_tokens_per_role():
+    assert max_tokens_for("financial_inference") == ROLE_ROUTES["financial_inference"]["max_tokens"]
+    assert max_tokens_for("unknown_role") == DEFAULT_MAX_TOKENS
+
+
+def test_escalation_target(monkeypatch):
+    assert escalation_model(FAST) == STRONG
+    assert escalation_model(STRONG) is None
+    monkeypatch.setattr(settings, "llm_escalation_model", "")
+    assert escalation_model(FAST) is None
+
+
+async def test_call_uses_the_role_model_and_max_tokens(monkeypatch):
+    client = _client(monkeypatch, {FAST: '{"score": 1}'})
+    with llm_tags(node="score_move"):
+        await call_llm("system", "prompt")
+    assert client.models == [FAST]
+    assert client.requests[0]["max_tokens"] == ROLE_ROUTES["score_move"]["max_tokens"]
+
+
+async def test_invalid_output_escalates_and_caches_the_valid_answer(monkeypatch):
+    client = _client(monkeypatch, {FAST: "not json", STRONG: '{"score": 7}'})
+    with llm_tags(node="score_move"):
+        assert await call_llm("system", "prompt", validate=_is_json) == '{"score": 7}'
+        assert client.models == [FAST, STRONG]
+        # the escalated answer is cached under the original request
+        assert await call_llm("system", "prompt", validate=_is_json) == '{"score": 7}'
+    assert client.models == [FAST, STRONG]
+
+
+async def test_invalid_output_is_never_cached(monkeypatch):
+    client = _client(monkeypatch, {FAST: "not json", STRONG: "still not json"})
+    with llm_tags(node="score_move"):
+        assert await call_llm("system", "prompt", validate=_is_json) == "still not json"
+        await call_llm("system", "prompt", validate=_is_json)
+    assert client.models == [FAST, STRONG, FAST, STRONG]
+    assert response_cache.get_response_cache().stats()["size"] == 0
+
+
+async def test_invalid_output_without_an_escalation_model_is_returned_uncached(monkeypatch):
+    monkeypatch.setattr(settings, "llm_escalation_model", "")
+    client = _client(monkeypatch, {FAST: "not json"})
+    with llm_tags(node="score_move"):
+        assert await call_llm("system", "prompt", validate=_is_json) == "not json"
+        await call_llm("system", "prompt", validate=_is_json)
+    assert client.models == [FAST, FAST]
+    assert response_cache.get_response_cache().stats()["size"] == 0
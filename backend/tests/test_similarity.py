@@ -0,0 +1,85 @@
+"""Near-duplicate move clustering (graph/sandbox/similarity.py)."""
+
+from graph.sandbox.similarity import MoveIndex, cluster_moves
+
+
+def _move(move_id: str, title: str, content: str, risk: str = "medium") -> dict:
+    return {"move_id": move_id, "risk_level": risk, "title": title, "content": content}
+
+
+REPRICE = _move("m1", "Reprice the enterprise cloud tier", """
+Raise list prices on the enterprise cloud tier by 8% while bundling premium support.
+Enterprise customers show low churn (2.1%) and high switching costs, so pricing power is underused.
+Competitors raised prices 5-10% last year without share loss.
+Risks: mid-market customers may downgrade; sales cycles could lengthen.""")
+
+RAISE_PRICES = _move("m4", "Raise enterprise cloud pricing", """
+Increase enterprise cloud tier prices by roughly 8-10%, bundling premium support to soften the change.
+Churn among enterprise customers is low at 2.1% and switching costs are high, so there is unused pricing power.
+Peers raised prices 5-10% last year with no share loss.
+Downside: some mid-market accounts may downgrade and sales cycles may get longer.""")
+
+CUT_PRICES = _move("m7", "Cut mid-market cloud pricing to win share", """
+Lower cloud prices for mid-market customers by 10% to win share from competitors.
+Mid-market churn is high and competitors undercut on price; enterprise pricing stays unchanged.
+Risks: margin dilution of roughly 1pp and possible enterprise downgrades.""")
+
+LOGISTICS = _move("m10", "Expand logistics network in Southeast Asia", """
+Open three fulfilment centers in Southeast Asia to capture e-commerce growth of 18% a year.
+Regional delivery times lag competitors; local partners can cut build-out costs.
+Risks: capex of $2B and regulatory delays.""")
+
+
+def _similarity(a: dict, b: dict) -> float:
+    index = MoveIndex(threshold=0.0)
+    index.add(a)
+    match = index.add(b)
+    return match[1] if match else 0.0
+
+
+def test_paraphrase_clusters_at_threshold():
+    sim = _similarity(REPRICE, RAISE_PRICES)  # rounded to 3 places
+    reps, dups = cluster_moves([REPRICE, RAISE_PRICES], threshold=sim - 0.001)
+    assert [m["move_id"] for m in reps] == ["m1"]
+    assert dups == {"m4": ("m1", sim)}
+
+
+def test_paraphrase_kept_above_threshold():
+    sim = _similarity(REPRICE, RAISE_PRICES)
+    reps, dups = cluster_moves([REPRICE, RAISE_PRICES], threshold=sim + 0.01)
+    assert [m["move_id"] for m in reps] == ["m1", "m4"]
+    assert dups == {}
+
+
+def test_same_topic_different_move_scores_lower_than_paraphrase():
+    assert _similarity(REPRICE, CUT_PRICES) < _similarity(REPRICE, RAISE_PRICES)
+    assert _similarity(REPRICE, LOGISTICS) < 0.1
+
+
+def test_unrelated_moves_not_clustered():
+    reps, dups = cluster_moves([REPRICE, CUT_PRICES, LOGISTICS], threshold=0.45)
+    assert len(reps) == 3
+    assert dups == {}
+
+
+def test_different_risk_levels_never_cluster():
+    copy = {**REPRICE, "move_id": "m2", "risk_level": "high"}
+    reps, dups = cluster_moves([REPRICE, copy], threshold=0.1)
+    assert [m["move_id"] for m in reps] == ["m1", "m2"]
+    assert dups == {}
+
+
+def test_first_move_is_representative_and_order_is_kept():
+    moves = [LOGISTICS, REPRICE, {**REPRICE, "move_id": "m2"}, CUT_PRICES, {**REPRICE, "move_id": "m3"}]
+    reps, dups = cluster_moves(moves, threshold=0.9)
+    assert [m["move_id"] for m in reps] == ["m10", "m1", "m7"]
+    assert {mid: rep for mid, (rep, _) in dups.items()} == {"m2": "m1", "m3": "m1"}
+    assert all(sim >= 0.9 for _, sim in dups.values())
+
+
+def test_incremental_index_matches_batch():
+    moves = [REPRICE, RAISE_PRICES, CUT_PRICES, LOGISTICS]
+    index = MoveIndex(threshold=0.4)
+    incremental = {m["move_id"]: index.add(m) for m in moves}
+    _, dups = cluster_moves(moves, threshold=0.4)
+    assert {mid: match for mid, match in incremental.items() if match} == dups
@@ -0,0 +1,93 @@
+"""In-flight request coalescing (agents/base.py _singleflight)."""
+
+import asyncio
+import pytest
+from agents.base import _inflight, _singleflight
+
+
+class _Upstream:
+    """A call that blocks until released and counts how often it started."""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> str:
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "response"
+
+
+async def test_identical_requests_share_one_call():
+    upstream = _Upstream()
+    callers = [asyncio.ensure_future(_singleflight("k", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    assert await asyncio.gather(*callers) == ["response"] * 3
+    assert upstream.started == 1
+    assert "k" not in _inflight
+
+
+async def test_different_fingerprints_do_not_coalesce():
+    a, b = _Upstream(), _Upstream()
+    calls = [asyncio.ensure_future(_singleflight("a", a)), asyncio.ensure_future(_singleflight("b", b))]
+    await asyncio.sleep(0)
+    a.release.set()
+    b.release.set()
+    await asyncio.gather(*calls)
+    assert (a.started, b.started) == (1, 1)
+
+
+async def test_cancelled_waiter_detaches_without_cancelling_the_call():
+    upstream = _Upstream()
+    first = asyncio.ensure_future(_singleflight("k", upstream))
+    second = asyncio.ensure_future(_singleflight("k", upstream))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    assert not upstream.cancelled
+    upstream.release.set()
+    assert await second == "response"
+    assert first.cancelled()
+
+
+async def test_call_is_cancelled_when_every_waiter_leaves():
+    upstream = _Upstream()
+    callers = [asyncio.ensure_future(_singleflight("k", upstream)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert upstream.cancelled
+    assert "k" not in _inflight
+
+
+async def test_errors_reach_every_waiter():
+    async def failing() -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(*[_singleflight("k", failing) for _ in range(2)],
+                                   return_exceptions=True)
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+async def test_new_call_starts_after_the_previous_one_finished():
+    upstream = _Upstream()
+    upstream.release.set()
+    assert await _singleflight("k", upstream) == "response"
+    assert await _singleflight("k", upstream) == "response"
+    assert upstream.started == 2
+
+
+@pytest.fixture(autouse=True)
+def _empty_inflight():
+    _inflight.clear()
+    yield
+    _inflight.clear()
@@ -0,0 +1,59 @@
+"""Snapshot data source and Markdown rendering (graph/layer_0/scrapers/)."""
+
+import os
+import re
+import pytest
+from pydantic import ValidationError
+from agents.chunker import split_markdown
+from graph.layer_0.scrapers.snapshot import SnapshotDataSource
+from graph.layer_0.templates import FINANCIAL_DATA_TEMPLATE, NEWS_DATA_TEMPLATE
+from models.schemas import AnalyzeRequest
+
+# tests/fixtures/snapshots/NVTK is the few-shot example package, staged as a snapshot
+SNAPSHOTS = os.path.join(os.path.dirname(__file__), "fixtures", "snapshots")
+
+
+def _normalized(markdown: str) -> list[str]:
+    """Lines with table separator rows reduced to |---| (their widths differ)."""
+    return [re.sub(r"^\|[-|\s]+\|$", "|---|", line) for line in markdown.strip().split("\n")]
+
+
+@pytest.fixture
+def snapshot() -> dict:
+    data = SnapshotDataSource(SNAPSHOTS)._load_sync("nvtk")
+    assert data is not None
+    return data
+
+
+def test_financial_render_matches_the_synthesizer_template(snapshot):
+    assert _normalized(snapshot["financial_data_raw"]) == _normalized(FINANCIAL_DATA_TEMPLATE)
+
+
+def test_news_render_matches_the_synthesizer_template(snapshot):
+    assert _normalized(snapshot["news_data_raw"]) == _normalized(NEWS_DATA_TEMPLATE)
+
+
+def test_rendered_documents_chunk_like_the_templates(snapshot):
+    for rendered, template in ((snapshot["financial_data_raw"], FINANCIAL_DATA_TEMPLATE),
+                               (snapshot["news_data_raw"], NEWS_DATA_TEMPLATE)):
+        assert len(split_markdown(rendered, 300)) == len(split_markdown(template, 300))
+
+
+async def test_missing_ticker_returns_none():
+    assert await SnapshotDataSource(SNAPSHOTS).load("MSFT") is None
+
+
+@pytest.mark.parametrize("ticker", ["../NVTK", "/tmp/X", "..", ".", "NV/TK", "A" * 11, ""])
+def test_tickers_cannot_leave_the_snapshot_root(ticker):
+    assert SnapshotDataSource(os.path.join(SNAPSHOTS, "NVTK", "sub"))._load_sync(ticker) is None
+    assert SnapshotDataSource(SNAPSHOTS)._load_sync(ticker) is None
+
+
+@pytest.mark.parametrize("ticker", ["../X", "/TMP/X", "AAPL;rm", "TOOLONGTICKER", ""])
+def test_analyze_request_rejects_malformed_tickers(ticker):
+    with pytest.raises(ValidationError):
+        AnalyzeRequest(ticker=ticker)
+
+
+def test_analyze_request_normalizes_the_ticker():
+    assert AnalyzeRequest(ticker=" brk.b ").ticker == "BRK.B"
@@ -0,0 +1,75 @@
+"""Streamed calls restarted by a retry (agents/base.py _call_with_retries)."""
+
+from types import SimpleNamespace
+import pytest
+from agents.base import _call_with_retries
+from agents.circuit_breaker import get_circuit_breaker
+from config.settings import settings
+
+REQUEST = {"model": "claude-haiku-4-5", "max_tokens": 64,
+           "messages": [{"role": "user", "content": "hi"}]}
+
+
+class _Stream:
+    def __init__(self, pieces: list[str], fail: bool):
+        self.pieces, self.fail = pieces, fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for i, piece in enumerate(self.pieces):
+            if self.fail and i == 1:
+                raise TimeoutError("stream stalled")
+            yield piece
+
+    async def get_final_message(self):
+        usage = SimpleNamespace(input_tokens=3, output_tokens=2)
+        return SimpleNamespace(content=[SimpleNamespace(text="".join(self.pieces))], usage=usage)
+
+
+class _Client:
+    """Streams "Hello world"; the first `failures` attempts stall after one piece."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.messages = self
+
+    def stream(self, **request):
+        fail = self.failures > 0
+        self.failures -= 1
+        return _Stream(["Hello", " world"], fail)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "llm_retry_base_seconds", 0.0)
+    yield
+    get_circuit_breaker().record_success()
+
+
+def _recorder():
+    received = []
+
+    async def on_delta(text: str, *, reset: bool = False) -> None:
+        received.append("<reset>" if reset else text)
+    return received, on_delta
+
+
+async def test_retry_resets_the_stream_before_restreaming():
+    received, on_delta = _recorder()
+    text = await _call_with_retries(_Client(failures=1), REQUEST, on_delta, 3, "hi")
+    assert text == "Hello world"
+    assert received == ["Hello", "<reset>", "Hello", " world"]
+    # what a consumer keeps after honouring the reset is the final text
+    assert "".join(received[received.index("<reset>") + 1:]) == text
+
+
+async def test_first_attempt_sends_no_reset():
+    received, on_delta = _recorder()
+    await _call_with_retries(_Client(failures=0), REQUEST, on_delta, 3, "hi")
+    assert received == ["Hello", " world"]
@@ -0,0 +1,102 @@
+"""LLM telemetry: Prometheus exposition and per-analysis cost summary (agents/telemetry.py)."""
+
+import re
+from collections import defaultdict
+import pytest
+from agents.telemetry import LLMTelemetry, estimate_cost, llm_tags
+from api import routes
+
+HAIKU, SONNET = "claude-haiku-4-5", "claude-sonnet-4-5"
+SAMPLE = re.compile(r"^([a-zA-Z_:][\w:]*)(?:\{(.*)\})? (\S+)$")
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def _parse(text: str) -> list[tuple[str, dict, float]]:
+    """(name, labels, value) for every sample line; fails on a malformed one."""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"malformed sample line: {line!r}"
+        name, labels, value = match.groups()
+        parsed = {k: _unescape(v) for k, v in LABEL.findall(labels or "")}
+        if labels:
+            assert ",".join(f'{k}="{v}"' for k, v in LABEL.findall(labels)) == labels
+        samples.append((name, parsed, float(value)))
+    return samples
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    fresh = LLMTelemetry()
+    monkeypatch.setattr(routes, "telemetry", fresh)
+    return fresh
+
+
+def _record_analysis(sink: LLMTelemetry) -> None:
+    with llm_tags(analysis_id="a1", layer=1, node="financial_inference"):
+        sink.record(HAIKU, "ok", 0.4, input_tokens=1000, output_tokens=200)
+        sink.record(HAIKU, "cache_hit", 0.0)
+    with llm_tags(analysis_id="a1", layer=3, node="critic"):
+        sink.record(SONNET, "ok", 3.0, input_tokens=2000, output_tokens=500, cache_read=4000)
+        sink.record(SONNET, "ok", 1.5, input_tokens=1000, output_tokens=100, batch=True)
+        sink.record(SONNET, "hedge_cancelled", 0.8, input_tokens=1000, output_tokens=50)
+        sink.record(SONNET, "error", 30.0, attempts=3)
+
+
+async def test_metrics_endpoint_aggregates_cost_per_layer(sink):
+    _record_analysis(sink)
+    samples = _parse((await routes.metrics()).body.decode())
+
+    cost = defaultdict(float)
+    for name, labels, value in samples:
+        if name == "llm_cost_usd_total":
+            cost[labels["layer"]] += value
+    assert cost["1"] == pytest.approx(estimate_cost(HAIKU, 1000, 200), abs=1e-6)
+    assert cost["3"] == pytest.approx(
+        estimate_cost(SONNET, 2000, 500, cache_read=4000)
+        + estimate_cost(SONNET, 1000, 100, batch=True)
+        + estimate_cost(SONNET, 1000, 50), abs=1e-6)
+
+    requests = {(l["layer"], l["outcome"]): v for n, l, v in samples if n == "llm_requests_total"}
+    assert requests == {("1", "ok"): 1, ("1", "cache_hit"): 1, ("3", "ok"): 2,
+                        ("3", "hedge_cancelled"): 1, ("3", "error"): 1}
+
+
+async def test_latency_histogram_is_cumulative(sink):
+    _record_analysis(sink)
+    samples = _parse((await routes.metrics()).body.decode())
+    buckets = {l["le"]: v for n, l, v in samples
+               if n == "llm_request_duration_seconds_bucket" and l["node"] == "critic"}
+    assert buckets["1.0"] == 0 and buckets["2.0"] == 1 and buckets["5.0"] == 2
+    assert buckets["+Inf"] == 2  # only successful calls are timed
+    assert list(buckets.values()) == sorted(buckets.values())
+    gauges = {n for n, l, v in samples if not l}
+    assert {"llm_circuit_state", "llm_hedge_hedges_sent"} <= gauges
+
+
+async def test_label_values_are_escaped(sink):
+    node = 'persona "Bear"\nC:\\notes'
+    with llm_tags(layer=2, node=node):
+        sink.record(HAIKU, "ok", 0.1, input_tokens=10)
+    samples = _parse((await routes.metrics()).body.decode())
+    assert {labels["node"] for _, labels, _ in samples if "node" in labels} == {node}
+
+
+def test_analysis_summary_totals_and_layers(sink):
+    _record_analysis(sink)
+    summary = sink.analysis_summary("a1")
+    assert (summary["calls"], summary["cache_hits"], summary["errors"],
+            summary["hedges_cancelled"]) == (3, 1, 1, 1)
+    assert summary["input_tokens"] == 5000 and summary["cache_read_input_tokens"] == 4000
+    assert summary["llm_seconds"] == pytest.approx(4.9)
+    assert set(summary["by_layer"]) == {"1", "3"}
+    assert summary["by_layer"]["1"]["calls"] == 1
+    assert summary["cost_usd"] == pytest.approx(
+        sum(layer["cost_usd"] for layer in summary["by_layer"].values()), abs=1e-6)
+    assert sink.analysis_summary("unknown") is None
@@ -1,9 +1,122 @@
 """
 Markdown document generation and parsing utilities.
 
-Handles formatting for F1, F2, and mx.md documents.
+Handles formatting for F1, F2, and mx.md documents, and parses the pipe
+tables in Layer 0 data packages into typed columnar arrays
+(parse_markdown_tables) for the Layer 1 metrics engine
+(graph/layer_1/metrics.py).
 """
 
+import re
+import numpy as np
+
 # TODO: Implement markdown template formatting for F1/F2/mx output documents
 # See: docs/architecture/LLD_layer_1.md § 5 (F1/F2 templates)
 #      docs/architecture/LLD_layer_2.md § 6 (mx.md template)
+
+_SEPARATOR_ROW = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+_NUMBER = re.compile(
+    r"^(?P<sign>[+\-−–])?\(?(?P<currency>\$)?(?P<num>\d[\d,]*(?:\.\d+)?)"
+    r"(?P<suffix>[KMB%x])?\)?$"
+)
+_SCALE = {"K": 1e3, "M": 1e6, "B": 1e9}
+# Units stated in a column header, e.g. "Revenue ($M)" or "Volume (M shares)"
+_HEADER_SCALE = re.compile(r"\((\$)?([KMB])\b")
+
+
+def parse_number(cell: str) -> tuple[float, str]:
+    """
+    Parses a table cell like "$1,205M", "-4.5%", "**$29M**", "34.2x" or
+    "(12)" into (value, unit) with unit in "$", "%", "x", "". Currency is
+    scaled to dollars; percentages stay in percent. Non-numeric cells
+    give (nan, "").
+    """
+    text = cell.replace("*", "").replace(" ", "").strip()
+    m = _NUMBER.match(text)
+    if m is None:
+        return float("nan"), ""
+    value = float(m.group("num").replace(",", ""))
+    suffix = m.group("suffix") or ""
+    if m.group("currency"):
+        unit = "$"
+        value *= _SCALE.get(suffix, 1.0)
+    elif suffix in ("%", "x"):
+        unit = suffix
+    else:
+        unit = ""
+        value *= _SCALE.get(suffix, 1.0)
+    if m.group("sign") in ("-", "−", "–") or text.startswith("("):
+        value = -value
+    return value, unit
+
+
+class MarkdownTable:
+    """
+    One pipe table. ``values`` is a float matrix (rows × columns, NaN for
+    non-numeric cells) over the columns after the label column;
+    ``units[j]`` is the most common unit in column j.
+    """
+
+    def __init__(self, title: str, header: list[str], rows: list[list[str]]):
+        self.title = title
+        self.label = header[0]
+        self.columns = header[1:]
+        self.row_labels = [r[0].replace("*", "").strip() for r in rows]
+        self.cells = [r[1:] for r in rows]
+        width = len(self.columns)
+        parsed = [[parse_number(c) for c in (r + [""] * width)[:width]] for r in self.cells]
+        self.values = np.array([[v for v, _ in r] for r in parsed], dtype=float).reshape(len(rows), width)
+        self.cell_units = [[u for _, u in r] for r in parsed]
+        self.units = []
+        for j, name in enumerate(self.columns):
+            found = [self.cell_units[i][j] for i in range(len(rows)) if not np.isnan(self.values[i, j])]
+            unit = max(found, key=found.count) if found else ""
+            scale = _HEADER_SCALE.search(name)
+            if scale and unit == "":
+                self.values[:, j] *= _SCALE[scale.group(2)]
+                unit = "$" if scale.group(1) else ""
+                for r in self.cell_units:
+                    r[j] = r[j] or unit
+            self.units.append(unit)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.columns.index(name)]
+
+    def numeric_columns(self) -> list[int]:
+        """Columns where at least half the cells parsed as numbers."""
+        parsed = (~np.isnan(self.values)).sum(axis=0)
+        return [j for j in range(len(self.columns)) if parsed[j] * 2 >= max(1, len(self.row_labels))]
+
+
+def _split_row(line: str) -> list[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+def parse_markdown_tables(text: str) -> list[MarkdownTable]:
+    """
+    Extracts every pipe table (header row + separator row + body) from a
+    Markdown document, titled by the nearest preceding heading.
+    """
+    tables: list[MarkdownTable] = []
+    title = ""
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        heading = _HEADING.match(line)
+        if heading:
+            title = heading.group(1).strip()
+        elif (line.startswith("|") and i + 1 < len(lines)
+              and _SEPARATOR_ROW.match(lines[i + 1].strip())):
+            header = _split_row(line)
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                rows.append(_split_row(lines[i]))
+                i += 1
+            if rows:
+                tables.append(MarkdownTable(title, header, rows))
+            continue
+        i += 1
+    return tables
@@ -14,7 +14,7 @@ import { useState, useCallback } from "react";
 import { motion } from "framer-motion";
 import { X, Cpu, FileText, MessageSquare } from "lucide-react";
 import { type LayerState } from "@/hooks/useLayerStatus";
-import { type SSEEvent } from "@/hooks/useSSE";
+import { type DraftMessage, type SSEEvent } from "@/hooks/useSSE";
 import { AgentNode } from "./AgentNode";
 import { DocumentViewer } from "./DocumentViewer";
 import { SandboxChatView } from "./SandboxChatView";
@@ -25,9 +25,10 @@ interface LayerDetailProps {
   layer: LayerState;
   onClose: () => void;
   events?: SSEEvent[];
+  drafts?: Record<string, DraftMessage>;
 }
 
-export function LayerDetail({ layer, onClose, events }: LayerDetailProps) {
+export function LayerDetail({ layer, onClose, events, drafts }: LayerDetailProps) {
   const isSandbox = layer.id === "layer3";
 
   const [selectedMoveId, setSelectedMoveId] = useState<string | null>(null);
@@ -97,6 +98,7 @@ export function LayerDetail({ layer, onClose, events }: LayerDetailProps) {
             <div className="lg:col-span-8 xl:col-span-9 h-full overflow-hidden">
               <SandboxChatView
                 events={events}
+                drafts={drafts}
                 selectedMoveId={selectedMoveId}
                 onSelectMove={handleSelectMove}
               />
@@ -31,7 +31,7 @@ interface PipelineViewProps {
 }
 
 export function PipelineView({ analysisId, ticker }: PipelineViewProps) {
-  const { events, status } = useSSE(analysisId);
+  const { events, drafts, status } = useSSE(analysisId);
   const { zoomedLayer, setZoomedLayer, isZoomed } = usePipelineZoom();
   const layers = useLayerStatus(events);
   const [showResults, setShowResults] = useState(false);
@@ -423,6 +423,7 @@ export function PipelineView({ analysisId, ticker }: PipelineViewProps) {
               layer={enrichedLayers.find((l) => l.id === zoomedLayer)!}
               onClose={() => setZoomedLayer(null)}
               events={events}
+              drafts={drafts}
             />
           </>
         )}
@@ -4,7 +4,8 @@
  * Displays a single shared conversation: Critic vs Decision Makers.
  * Critic messages appear on the left, DM messages on the right.
  * All 3 DMs respond in parallel each round (boardroom model).
- * Auto-scrolls as new messages arrive via SSE.
+ * Auto-scrolls as new messages arrive via SSE; messages still being
+ * generated are shown live from sandbox_delta drafts.
  */
 
 "use client";
@@ -12,7 +13,7 @@
 import { useMemo, useRef, useEffect, useState } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import { MessageSquare, Bot, Shield } from "lucide-react";
-import { type SSEEvent } from "@/hooks/useSSE";
+import { type DraftMessage, type SSEEvent } from "@/hooks/useSSE";
 import { cn } from "@/lib/utils";
 import { MarkdownRenderer } from "@/components/ui/MarkdownRenderer";
 
@@ -20,6 +21,7 @@ interface ChatMessage {
   role: string;   // "critic" | "D1" | "D2" | "D3"
   content: string;
   round: number;
+  pending?: boolean;  // still streaming (from a draft)
 }
 
 const DM_COLORS: Record<string, { bg: string; border: string; text: string; badge: string }> = {
@@ -40,11 +42,12 @@ const DM_NAMES: Record<string, string> = {
 
 interface SandboxChatViewProps {
   events: SSEEvent[];
+  drafts?: Record<string, DraftMessage>;
   selectedMoveId?: string | null;
   onSelectMove?: (moveId: string) => void;
 }
 
-export function SandboxChatView({ events, selectedMoveId, onSelectMove }: SandboxChatViewProps) {
+export function SandboxChatView({ events, drafts, selectedMoveId, onSelectMove }: SandboxChatViewProps) {
   const scrollRef = useRef<HTMLDivElement>(null);
   const hasExternalControl = selectedMoveId !== undefined && onSelectMove !== undefined;
 
@@ -108,8 +111,18 @@ export function SandboxChatView({ events, selectedMoveId, onSelectMove }: Sandbo
         }
       }
     }
+    // In-progress messages: critic first, then DMs, after completed ones
+    const pending = Object.values(drafts ?? {})
+      .filter((d) => !activeMove || d.move === activeMove)
+      .sort((a, b) =>
+        a.round - b.round ||
+        (a.role === "critic" ? -1 : b.role === "critic" ? 1 : a.role.localeCompare(b.role))
+      );
+    for (const d of pending) {
+      msgs.push({ role: d.role, content: d.content, round: d.round, pending: true });
+    }
     return msgs;
-  }, [events, activeMove]);
+  }, [events, drafts, activeMove]);
 
   // Count scored moves
   const scoredMoves = useMemo(() => {
@@ -127,7 +140,7 @@ export function SandboxChatView({ events, selectedMoveId, onSelectMove }: Sandbo
     if (scrollRef.current) {
       scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
     }
-  }, [filteredMessages.length]);
+  }, [filteredMessages]);
 
   // Current round from filtered messages
   const currentRound = filteredMessages.length > 0
@@ -241,6 +254,7 @@ export function SandboxChatView({ events, selectedMoveId, onSelectMove }: Sandbo
                     <div
                       className={cn(
                         "max-w-[75%] rounded-2xl px-4 py-3 text-sm leading-relaxed",
+                        msg.pending && "opacity-70",
                         isCritic
                           ? "bg-white/[0.04] border border-white/[0.08] text-white/70 rounded-tl-md"
                           : `${dmColor!.bg} ${dmColor!.border} border ${dmColor!.text} rounded-tr-md`
@@ -126,9 +126,9 @@ export function SandboxLeaderboard({
           } else {
             map.set(moveId, {
               moveId,
-              title: moveId,
-              riskLevel: "unknown",
-              persona: "",
+              title: (event.title as string) || moveId,
+              riskLevel: (event.risk_level as string) || "unknown",
+              persona: (event.persona as string) || "",
               status: "skipped",
               currentRound: 0,
               maxRounds: 3,
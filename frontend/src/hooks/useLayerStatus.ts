@@ -1,8 +1,8 @@
 /**
  * useLayerStatus — Derives layer states from real SSE events.
  *
- * Maps backend events (layer_start, layer_complete, agent_complete)
- * to UI layer state for the pipeline visualization.
+ * Maps backend events (layer_start, layer_complete, agent_complete,
+ * chunk_progress) to UI layer state for the pipeline visualization.
  *
  * See: docs/architecture/LLD_frontend.md § 8
  */
@@ -88,6 +88,8 @@ export function useLayerStatus(events: SSEEvent[]): LayerState[] {
   return useMemo(() => {
     // Deep-copy initial state to avoid mutation across renders
     const layers: LayerState[] = JSON.parse(JSON.stringify(INITIAL_LAYERS));
+    // Per-agent chunk counts from chunk_progress events (Layer 1)
+    const chunkCounts: Record<string, { completed: number; total: number }> = {};
 
     for (const event of events) {
       const layerId = event.layer !== undefined ? layerIdFromNumber(event.layer) : null;
@@ -110,6 +112,28 @@ export function useLayerStatus(events: SSEEvent[]): LayerState[] {
           break;
         }
 
+        case "chunk_progress": {
+          if (layer) {
+            chunkCounts[event.agent_id || "unknown"] = {
+              completed: event.completed ?? 0,
+              total: event.total ?? 0,
+            };
+            // Fraction of chunks finished across the layer's agents; the
+            // last step is left for agent_complete / layer_complete.
+            const counts = Object.values(chunkCounts);
+            const completed = counts.reduce((n, c) => n + c.completed, 0);
+            const total = counts.reduce((n, c) => n + c.total, 0);
+            layer.status = "running";
+            if (total > 0) {
+              layer.progress = Math.max(
+                layer.progress,
+                Math.min(95, Math.round((completed / total) * 100))
+              );
+            }
+          }
+          break;
+        }
+
         case "agent_complete": {
           if (layer) {
             // Add agent to the completed list (avoid duplicates)
@@ -123,12 +147,15 @@ export function useLayerStatus(events: SSEEvent[]): LayerState[] {
             }
             // Update progress based on how many agents are done
             if (layer.agentCount > 0) {
-              layer.progress = Math.min(
-                100,
-                Math.round(
-                  (layer.agents.filter((a) => a.status === "done").length /
-                    layer.agentCount) *
-                    100
+              layer.progress = Math.max(
+                layer.progress,
+                Math.min(
+                  100,
+                  Math.round(
+                    (layer.agents.filter((a) => a.status === "done").length /
+                      layer.agentCount) *
+                      100
+                  )
                 )
               );
             }
@@ -11,8 +11,23 @@ export interface SSEEvent {
   [key: string]: any;
 }
 
+/** In-progress critic/DM message assembled from sandbox_delta events. */
+export interface DraftMessage {
+  move: string;
+  round: number;
+  role: string;
+  content: string;
+}
+
+export function draftKey(move: string, round: number, role: string) {
+  return `${move}:${round}:${role}`;
+}
+
 export function useSSE(analysisId: string) {
   const [events, setEvents] = useState<SSEEvent[]>([]);
+  // Token deltas are folded into drafts instead of the event log; a draft
+  // is dropped once its final message arrives in a sandbox_round event.
+  const [drafts, setDrafts] = useState<Record<string, DraftMessage>>({});
   const [status, setStatus] = useState<
     "connecting" | "connected" | "done" | "error"
   >("connecting");
@@ -30,6 +45,33 @@ export function useSSE(analysisId: string) {
 
     source.onmessage = (e) => {
       const event: SSEEvent = JSON.parse(e.data);
+
+      if (event.event === "sandbox_delta") {
+        // A retried LLM call re-streams from the start: reset drops the
+        // text received from the failed attempt.
+        const key = draftKey(event.move, event.round, event.role);
+        setDrafts((prev) => ({
+          ...prev,
+          [key]: {
+            move: event.move,
+            round: event.round,
+            role: event.role,
+            content: (event.reset ? "" : prev[key]?.content ?? "") + event.delta,
+          },
+        }));
+        return;
+      }
+
+      if (event.event === "sandbox_round" && event.messages) {
+        setDrafts((prev) => {
+          const next = { ...prev };
+          for (const msg of event.messages) {
+            delete next[draftKey(event.move, msg.round, msg.role)];
+          }
+          return next;
+        });
+      }
+
       setEvents((prev) => [...prev, event]);
 
       if (event.event === "pipeline_complete") {
@@ -53,5 +95,5 @@ export function useSSE(analysisId: string) {
     return () => source.close();
   }, [analysisId]);
 
-  return { events, status };
+  return { events, drafts, status };
 }